@@ -35,3 +35,21 @@ def load_materials(*, force_reload: bool = False) -> Dict[str, Any]:
     """Load materials library for thermal analysis."""
 
     return get_yaml_config("specs/materials.yaml", force_reload=force_reload)
+
+
+def load_bus_layout(name: str = "power/bus_layout_v0.yaml", *, force_reload: bool = False) -> Dict[str, Any]:
+    """Load a power bus layout (feeders, breakers, voltages) from configs/."""
+
+    return get_yaml_config(name, force_reload=force_reload)
+
+
+def load_crew_profile(name: str = "profile_min_crew.yaml", *, force_reload: bool = False) -> Dict[str, Any]:
+    """Load a crew profile (group counts, shift structure, room usage)."""
+
+    return get_yaml_config(name, force_reload=force_reload)
+
+
+def load_uncertainty(name: str = "uncertainty.yaml", *, force_reload: bool = False) -> Dict[str, Any]:
+    """Load declared spec-parameter distributions (Monte Carlo inputs) from configs/."""
+
+    return get_yaml_config(name, force_reload=force_reload)
@@ -33,6 +33,7 @@ from env.hvac.constants import (
     ACTIVITY_KEYS,
     VENTILATION_KEYS,
     EXHAUST_KEYS,
+    EXHAUST_AREA_KEYS,
     DEFAULT_ACTIVITY_LEVELS,
     DEFAULT_VENTILATION,
 )
@@ -112,10 +113,11 @@ def exhaust_rate(
         return 0.0
 
     total = 0.0
-    if "Ra_Lps_per_m2" in exhaust_info:
-        total = max(total, float(exhaust_info["Ra_Lps_per_m2"]) * area_m2)
+    for key in EXHAUST_AREA_KEYS:
+        if key in exhaust_info:
+            total = max(total, float(exhaust_info[key]) * area_m2)
 
-    per_fixture_keys = set(EXHAUST_KEYS) - {"Ra_Lps_per_m2"}
+    per_fixture_keys = set(EXHAUST_KEYS) - set(EXHAUST_AREA_KEYS)
     for key in per_fixture_keys:
         if key in exhaust_info:
             total = max(total, float(exhaust_info[key]) * fixtures)
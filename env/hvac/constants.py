@@ -15,12 +15,16 @@ VENTILATION_KEYS = [
 ]
 
 EXHAUST_KEYS = [
+    "Re_Lps_per_m2",
     "Ra_Lps_per_m2",
     "per_shower_Lps_continuous",
     "per_shower_Lps_intermittent",
     "per_fixture_Lps",
 ]
 
+# Area-based exhaust drivers (hvac_design.yaml uses Re_; Ra_ kept for old configs)
+EXHAUST_AREA_KEYS = ["Re_Lps_per_m2", "Ra_Lps_per_m2"]
+
 DEFAULT_ACTIVITY_LEVELS = {
     "rest": {"sensible_W_per_person": 80.0, "latent_W_per_person": 35.0},
     "light_work": {"sensible_W_per_person": 110.0, "latent_W_per_person": 60.0},
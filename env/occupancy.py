@@ -0,0 +1,231 @@
+"""
+occupancy.py
+-------------
+Time-of-day occupancy and activity multipliers from the crew profile.
+
+Model
+    • Crew groups (adults, adolescents, children) are in one of three states
+      at any time: sleep, leisure or work.
+    • Adults rotate through ``shift_structure`` in equal numbers: duty during
+      their own shift, sleep during the preceding one, leisure otherwise.
+      Rooms may serve one shift (``adults.alpha``) or all adults (flat
+      aggregate). Other groups follow the fixed ``schedules`` windows.
+    • ``room_usage`` gives, per room type, the groups it serves and the
+      fraction of its design occupants present when those groups are entirely
+      in a state. Occupancy multiplier = headcount-weighted sum over groups
+      and states; 1.0 means design occupancy.
+    • Activity multiplier = occupancy-weighted sensible gain per person
+      (sleep → rest, leisure → light_work, work → the room's design activity
+      in hvac_design.yaml) over the design activity's gain.
+
+Profiles are one period (one shift cycle, usually 24 h) of float32 values at
+``step_s``; consumers sample them by time, so year-long runs never expand to
+per-minute objects.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from data.loader import load_crew_profile, load_hvac_design
+from env.hvac.design import resolve_room_activity
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from ship.manifest import ShipManifest
+
+STATES: Tuple[str, ...] = ("sleep", "leisure", "work")
+STATE_ACTIVITY = {"sleep": "rest", "leisure": "light_work"}
+SHIFT_GROUP = "adults"
+HOUR_S = 3600.0
+
+
+@dataclass
+class RepeatingProfile:
+    """One period of values at ``step_s``; sampled cyclically by time."""
+
+    values: np.ndarray  # float32, shape (n_steps,)
+    step_s: float
+
+    @property
+    def period_s(self) -> float:
+        return self.values.size * self.step_s
+
+    def sample(self, t_s) -> np.ndarray:
+        idx = (np.floor_divide(np.asarray(t_s, dtype=float), self.step_s).astype(np.int64)) % self.values.size
+        return self.values[idx]
+
+    def as_profile(self, dt_s: float, scale: float = 1.0) -> Callable[[int, int], np.ndarray]:
+        """``profile(start_step, n)`` for ``power.timeseries`` with step ``dt_s``."""
+
+        def profile(start: int, n: int) -> np.ndarray:
+            return self.sample((start + np.arange(n)) * dt_s) * scale
+
+        return profile
+
+
+def _window_mask(hours: np.ndarray, window: Sequence[float]) -> np.ndarray:
+    start, end = float(window[0]), float(window[1])
+    if start <= end:
+        return (hours >= start) & (hours < end)
+    return (hours >= start) | (hours < end)
+
+
+def state_fractions(
+    crew: Optional[Mapping[str, Any]] = None, *, step_s: float = 900.0
+) -> Dict[str, np.ndarray]:
+    """
+    Per group: (len(STATES), n_steps) fraction of the group in each state.
+    Shift crews also appear per shift as ``"adults.<shift name>"``.
+    """
+
+    crew = crew if crew is not None else load_crew_profile()
+    shifts = crew.get("shift_structure") or [{"name": "day", "duration_hours": 24}]
+    durations = np.array([float(s.get("duration_hours", 0.0)) for s in shifts])
+    cycle_h = float(durations.sum())
+    n_steps = int(round(cycle_h * HOUR_S / step_s))
+    hours = (np.arange(n_steps) + 0.5) * step_s / HOUR_S
+    starts = np.r_[0.0, np.cumsum(durations)[:-1]]
+
+    out: Dict[str, np.ndarray] = {}
+    schedules = crew.get("schedules") or {}
+    for group in (crew.get("crew") or {}):
+        frac = np.zeros((len(STATES), n_steps), dtype=np.float32)
+        if group == SHIFT_GROUP:
+            block = np.searchsorted(starts, hours, side="right") - 1
+            for k, shift in enumerate(shifts):
+                sub = np.zeros_like(frac)
+                sub[STATES.index("work")] = block == k
+                sub[STATES.index("sleep")] = block == (k - 1) % len(shifts)
+                sub[STATES.index("leisure")] = 1.0 - sub.sum(axis=0)
+                out[f"{group}.{shift.get('name', k)}"] = sub
+                frac += sub / len(shifts)
+        else:
+            windows = schedules.get(group, {})
+            for state in ("sleep", "work"):
+                if state in windows:
+                    frac[STATES.index(state)] = _window_mask(hours % 24.0, windows[state])
+        frac[STATES.index("leisure")] = 1.0 - frac[STATES.index("sleep")] - frac[STATES.index("work")]
+        out[group] = frac
+    return out
+
+
+class OccupancyModel:
+    """
+    Occupancy / activity multipliers per room type from the crew profile.
+
+    Example:
+        model = OccupancyModel(step_s=900)
+        occ = model.occupancy("child_dorm_8").sample(t_s)
+        loads = model.room_loads_kW(manifest)   # thermal transient ``loads``
+    """
+
+    def __init__(
+        self,
+        crew: Optional[Mapping[str, Any]] = None,
+        hvac: Optional[Mapping[str, Any]] = None,
+        *,
+        step_s: float = 900.0,
+    ) -> None:
+        self.crew = crew if crew is not None else load_crew_profile()
+        hvac = hvac if hvac is not None else load_hvac_design()
+        self.step_s = float(step_s)
+        self.headcount = {g: float(n or 0) for g, n in (self.crew.get("crew") or {}).items()}
+        fractions = state_fractions(self.crew, step_s=self.step_s)
+        n_shifts = max(len(self.crew.get("shift_structure") or []), 1)
+        for name in fractions:
+            if "." in name:
+                self.headcount[name] = self.headcount.get(name.split(".")[0], 0.0) / n_shifts
+        self.n_steps = next(iter(fractions.values())).shape[1] if fractions else int(24 * HOUR_S / step_s)
+
+        usage = self.crew.get("room_usage") or {}
+        self.room_types: List[str] = list(usage)
+        self.design_sensible_W = np.zeros(len(usage))
+        occ = np.zeros((len(usage), self.n_steps), dtype=np.float32)
+        act = np.ones((len(usage), self.n_steps), dtype=np.float32)
+        for r, (type_id, cfg) in enumerate(usage.items()):
+            groups = [g for g in cfg.get("groups", []) if g in fractions]
+            people = np.array([self.headcount.get(g, 0.0) for g in groups])
+            if not groups or people.sum() <= 0:
+                continue
+            mix = np.tensordot(people / people.sum(), np.stack([fractions[g] for g in groups]), axes=1)
+
+            rates = resolve_room_activity(hvac, cfg.get("hvac_room", type_id))
+            design_W = float(rates["activity"].get("sensible_W_per_person", 0.0))
+            levels = (hvac.get("defaults") or {}).get("activity_levels", {})
+            state_W = np.array(
+                [
+                    float(levels.get(STATE_ACTIVITY[s], {}).get("sensible_W_per_person", design_W))
+                    if s in STATE_ACTIVITY
+                    else design_W
+                    for s in STATES
+                ]
+            )
+            weights = np.array([float((cfg.get("states") or {}).get(s, 0.0)) for s in STATES])
+            present = weights[:, None] * mix  # (states, steps)
+            occ[r] = present.sum(axis=0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                ratio = (state_W @ present) / (occ[r] * design_W)
+            act[r] = np.where(occ[r] > 0, ratio, 1.0)
+            self.design_sensible_W[r] = design_W
+        self._occupancy = occ
+        self._activity = act
+        self._row = {t: i for i, t in enumerate(self.room_types)}
+
+    # ------------------------------------------------------------------
+    def occupancy(self, type_id: str) -> RepeatingProfile:
+        return RepeatingProfile(self._occupancy[self._row[type_id]], self.step_s)
+
+    def activity(self, type_id: str) -> RepeatingProfile:
+        return RepeatingProfile(self._activity[self._row[type_id]], self.step_s)
+
+    def table(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(occupancy, activity) as (n_room_types, n_steps) float32 arrays."""
+
+        return self._occupancy, self._activity
+
+    def _rows_for(self, type_ids: np.ndarray) -> np.ndarray:
+        return np.array([self._row.get(t, -1) for t in np.asarray(type_ids).tolist()], dtype=np.int64)
+
+    def room_loads_kW(
+        self, manifest: "ShipManifest", *, n_nodes: Optional[int] = None
+    ) -> Callable[[float], np.ndarray]:
+        """
+        ``loads(t_s) -> kW`` per manifest room: occupants × occupancy ×
+        activity × design sensible gain. Rooms without usage data give 0.
+
+        With ``n_nodes`` the vector is zero-padded to that length, matching
+        ``thermal.builder`` networks (air nodes first, in manifest order) for
+        ``ImplicitStepper.run(loads=...)``.
+        """
+
+        rows = self._rows_for(manifest.type_id)
+        known = rows >= 0
+        safe = np.where(known, rows, 0)
+        design = np.where(known, manifest.occupants * self.design_sensible_W[safe] / 1000.0, 0.0)
+        gain = self._occupancy * self._activity
+        out = np.zeros(len(manifest) if n_nodes is None else int(n_nodes))
+
+        def loads(t_s: float) -> np.ndarray:
+            i = int(np.floor(t_s / self.step_s)) % self.n_steps
+            out[: design.size] = design * gain[safe, i]
+            return out.copy()
+
+        return loads
+
+    def people_present(self, manifest: "ShipManifest") -> RepeatingProfile:
+        """Headcount present in the manifest's rooms over one period."""
+
+        rows = self._rows_for(manifest.type_id)
+        known = rows >= 0
+        per_type = np.bincount(rows[known], weights=manifest.occupants[known], minlength=len(self.room_types))
+        return RepeatingProfile((per_type @ self._occupancy).astype(np.float32), self.step_s)
+
+    def power_profile(
+        self, kW_per_person: float, manifest: "ShipManifest", *, dt_s: float = 60.0
+    ) -> Callable[[int, int], np.ndarray]:
+        """Per-person sink demand (e.g. hvac_thermal) as a ``power.timeseries`` profile."""
+
+        return self.people_present(manifest).as_profile(dt_s, scale=kW_per_person)
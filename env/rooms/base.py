@@ -6,7 +6,7 @@ Defines data structures and the base interface every calculator must follow.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 
 # --- Data Structures ---------------------------------------------------------
@@ -152,6 +152,14 @@ class RoomCalculator:
     """Base interface class for any room calculator."""
 
     TYPE_ID: str = "base"
+    # hvac_design.yaml room key and activity used for rate lookups, and the
+    # RoomReport.hvac fields derived from those rates (compiled by ship.rates).
+    HVAC_ROOM: str = ""
+    ACTIVITY: Optional[str] = None
+    HVAC_OUTPUTS: Tuple[str, ...] = ()
+    # Rooms where the crew is housed; their occupants are the headcount used by
+    # per-person power sinks (shared rooms would count the same people again).
+    RESIDENTIAL: bool = False
 
     @staticmethod
     def defaults() -> RoomSpec:
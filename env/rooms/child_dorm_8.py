@@ -17,6 +17,10 @@ class ChildDorm8(RoomCalculator):
     """Skeleton implementation for the child dorm room calculator."""
 
     TYPE_ID = "child_dorm_8"
+    HVAC_ROOM = "dorm"
+    ACTIVITY = "rest"
+    HVAC_OUTPUTS = ("ventilation_Lps", "sensible_load_kW", "latent_load_kW")
+    RESIDENTIAL = True
 
     @staticmethod
     def defaults() -> RoomSpec:
@@ -30,7 +34,7 @@ class ChildDorm8(RoomCalculator):
 
     @staticmethod
     def compute(spec: RoomSpec) -> RoomReport:
-        rates = get_rates("dorm", activity="rest")
+        rates = get_rates(ChildDorm8.HVAC_ROOM, activity=ChildDorm8.ACTIVITY)
         ventilation_lps = calc_env.ventilation_rate(
             occupants=spec.occupants,
             Lps_per_person=rates["ventilation"]["Rp_Lps_per_person"],
@@ -17,6 +17,10 @@ class DormCommunal8(RoomCalculator):
     """Skeleton dormitory calculator using shared HVAC helpers."""
 
     TYPE_ID = "dorm_communal_8"
+    HVAC_ROOM = "dorm"
+    ACTIVITY = "rest"
+    HVAC_OUTPUTS = ("ventilation_Lps", "sensible_load_kW", "latent_load_kW")
+    RESIDENTIAL = True
 
     @staticmethod
     def defaults() -> RoomSpec:
@@ -30,7 +34,7 @@ class DormCommunal8(RoomCalculator):
 
     @staticmethod
     def compute(spec: RoomSpec) -> RoomReport:
-        rates = get_rates("dorm", activity="rest")
+        rates = get_rates(DormCommunal8.HVAC_ROOM, activity=DormCommunal8.ACTIVITY)
 
         ventilation_lps = calc_env.ventilation_rate(
             occupants=spec.occupants,
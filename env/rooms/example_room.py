@@ -33,6 +33,9 @@ class ExampleRoom(RoomCalculator):
 
     # TODO: Change this to match your new room identifier
     TYPE_ID = "example_room"
+    HVAC_ROOM = "example"
+    ACTIVITY = "rest"
+    HVAC_OUTPUTS = ("ventilation_Lps", "sensible_load_kW", "latent_load_kW")
 
     # ------------------------------------------------------------------
     # Default parameters
@@ -66,8 +69,8 @@ class ExampleRoom(RoomCalculator):
         """
 
         # --- 1) Lookup rates ---------------------------------------------------
-        # TODO: adjust the table key ("example") and activity
-        rates = get_rates("example", activity="rest")
+        # TODO: adjust HVAC_ROOM (hvac_design.yaml key) and ACTIVITY above
+        rates = get_rates(ExampleRoom.HVAC_ROOM, activity=ExampleRoom.ACTIVITY)
 
         # --- 2) Compute HVAC requirements -------------------------------------
         ventilation_lps = calc_env.ventilation_rate(
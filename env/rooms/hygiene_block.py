@@ -17,6 +17,9 @@ class HygieneBlock(RoomCalculator):
     """Placeholder implementation for hygiene blocks."""
 
     TYPE_ID = "hygiene_block"
+    HVAC_ROOM = "hygiene_block"
+    ACTIVITY = "moderate_work"
+    HVAC_OUTPUTS = ("ventilation_Lps", "exhaust_Lps")
 
     @staticmethod
     def defaults() -> RoomSpec:
@@ -30,7 +33,7 @@ class HygieneBlock(RoomCalculator):
 
     @staticmethod
     def compute(spec: RoomSpec) -> RoomReport:
-        rates = get_rates("HygieneBlock", activity="moderate_work")
+        rates = get_rates(HygieneBlock.HVAC_ROOM, activity=HygieneBlock.ACTIVITY)
 
         ventilation_lps = calc_env.ventilation_rate(
             occupants=spec.occupants,
@@ -17,6 +17,9 @@ class IntimacyPod(RoomCalculator):
     """Placeholder calculator for the intimacy pod module."""
 
     TYPE_ID = "intimacy_pod"
+    HVAC_ROOM = "intimacy_pod"
+    ACTIVITY = "moderate_work"
+    HVAC_OUTPUTS = ("ventilation_Lps",)
 
     @staticmethod
     def defaults() -> RoomSpec:
@@ -30,7 +33,7 @@ class IntimacyPod(RoomCalculator):
 
     @staticmethod
     def compute(spec: RoomSpec) -> RoomReport:
-        rates = get_rates("intimacy_pod", activity="moderate_work")
+        rates = get_rates(IntimacyPod.HVAC_ROOM, activity=IntimacyPod.ACTIVITY)
         ventilation_lps = calc_env.ventilation_rate(
             occupants=spec.occupants,
             Lps_per_person=rates["ventilation"]["Rp_Lps_per_person"],
@@ -31,6 +31,9 @@ class Warehouse(RoomCalculator):
 
     # TODO: Change this to match your new room identifier
     TYPE_ID = "warehouse"
+    HVAC_ROOM = "warehouse"
+    ACTIVITY = "moderate_work"
+    HVAC_OUTPUTS = ("ventilation_Lps", "sensible_load_kW", "latent_load_kW")
 
     # ------------------------------------------------------------------
     # Default parameters
@@ -62,8 +65,8 @@ class Warehouse(RoomCalculator):
         """
 
         # --- 1) Lookup rates ---------------------------------------------------
-        # TODO: adjust the table key ("warehouse") and activity
-        rates = get_rates("warehouse", activity="moderate_work")
+        # TODO: adjust HVAC_ROOM (hvac_design.yaml key) and ACTIVITY above
+        rates = get_rates(Warehouse.HVAC_ROOM, activity=Warehouse.ACTIVITY)
 
         # --- 2) Compute HVAC requirements -------------------------------------
         ventilation_lps = calc_env.ventilation_rate(
@@ -2,14 +2,30 @@
 bus.py
 -------
 Convenience helpers for the power distribution model.
+
+Sink demand resolves from whichever terms a sink defines (summed):
+    consumption_kW
+    + consumption_kW_per_m2     × floor area
+    + consumption_kW_per_person × occupants
+Area and occupants come from ``area_m2_estimate`` / ``occupants_estimate``
+unless a ShipManifest is supplied; then they are the manifest column sums
+over the rooms a sink serves (optional ``room_types`` / ``phases`` lists,
+default: every room). Occupants are summed over housing rooms only
+(calculators with ``RESIDENTIAL``): everyone sleeps in exactly one dorm,
+while the occupants of shared rooms are the same people again.
 """
 
 from __future__ import annotations
 
-from typing import Dict, Any, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from data.loader import load_power_design
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from ship.manifest import ShipManifest
+
 
 def get_power_design(*, force_reload: bool = False) -> Dict[str, Any]:
     """Load the canonical power_design.yaml document."""
@@ -17,21 +33,83 @@ def get_power_design(*, force_reload: bool = False) -> Dict[str, Any]:
     return load_power_design(force_reload=force_reload)
 
 
-def summarize_power(cfg: Dict[str, Any]) -> Tuple[Dict[str, float], Dict[str, float]]:
+def _sink_terms(sinks: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    def column(key: str) -> np.ndarray:
+        return np.array([float((cfg or {}).get(key) or 0.0) for cfg in sinks.values()], dtype=float)
+
+    return {
+        "fixed": column("consumption_kW"),
+        "per_m2": column("consumption_kW_per_m2"),
+        "per_person": column("consumption_kW_per_person"),
+        "area": column("area_m2_estimate"),
+        "occupants": column("occupants_estimate"),
+    }
+
+
+def served_rooms(sinks: Dict[str, Any], manifest: "ShipManifest") -> np.ndarray:
+    """Boolean (n_sinks, n_rooms) matrix of which rooms feed each sink."""
+
+    served = np.ones((len(sinks), len(manifest)), dtype=bool)
+    for row, cfg in enumerate(sinks.values()):
+        cfg = cfg or {}
+        if cfg.get("room_types"):
+            served[row] &= np.isin(manifest.type_id, list(cfg["room_types"]))
+        if cfg.get("phases"):
+            served[row] &= np.isin(manifest.phase, list(cfg["phases"]))
+    return served
+
+
+def residential_rooms(manifest: "ShipManifest") -> np.ndarray:
+    """Boolean mask of manifest rows whose room type houses crew."""
+
+    from ship.registry import REGISTRY
+
+    housing = [type_id for type_id, calc in REGISTRY.items() if calc.RESIDENTIAL]
+    return np.isin(manifest.type_id, housing)
+
+
+def served_totals(sinks: Dict[str, Any], manifest: "ShipManifest") -> Tuple[np.ndarray, np.ndarray]:
+    """Served floor area and housed occupants per sink (one matrix product each)."""
+
+    served = served_rooms(sinks, manifest).astype(float)
+    housed = np.where(residential_rooms(manifest), np.asarray(manifest.occupants, dtype=float), 0.0)
+    return served @ np.asarray(manifest.floor_area_m2, dtype=float), served @ housed
+
+
+def resolve_sink_consumption(
+    cfg: Dict[str, Any], manifest: Optional["ShipManifest"] = None
+) -> Dict[str, float]:
+    """
+    Demand [kW] per sink, including area- and occupancy-rated sinks.
+
+    With a manifest, area and occupants for every sink come from
+    ``served_totals`` over the room columns.
+    """
+
+    sinks = cfg.get("sinks", {}) or {}
+    if not sinks:
+        return {}
+    terms = _sink_terms(sinks)
+    area, occupants = terms["area"], terms["occupants"]
+    if manifest is not None and len(manifest):
+        area, occupants = served_totals(sinks, manifest)
+    total = terms["fixed"] + terms["per_m2"] * area + terms["per_person"] * occupants
+    return dict(zip(sinks, total.tolist()))
+
+
+def summarize_power(
+    cfg: Dict[str, Any], manifest: Optional["ShipManifest"] = None
+) -> Tuple[Dict[str, float], Dict[str, float]]:
     """
     Return total generation and consumption per source/sink.
     """
 
     sources_summary: Dict[str, float] = {}
-    sinks_summary: Dict[str, float] = {}
 
     for name, source in cfg.get("sources", {}).items():
         sources_summary[name] = float(source.get("generation_kW", 0.0))
 
-    for name, sink in cfg.get("sinks", {}).items():
-        sinks_summary[name] = float(sink.get("consumption_kW", 0.0))
-
-    return sources_summary, sinks_summary
+    return sources_summary, resolve_sink_consumption(cfg, manifest)
 
 
 def get_total_generation(cfg: Dict[str, Any]) -> float:
@@ -40,13 +118,24 @@ def get_total_generation(cfg: Dict[str, Any]) -> float:
     return sum(float(src.get("generation_kW", 0.0)) for src in cfg.get("sources", {}).values())
 
 
-def get_total_consumption(cfg: Dict[str, Any]) -> float:
-    """Sum all sink consumption_kW."""
+def get_total_consumption(cfg: Dict[str, Any], manifest: Optional["ShipManifest"] = None) -> float:
+    """Sum resolved demand of all sinks (fixed, per-m², per-person)."""
 
-    return sum(float(sink.get("consumption_kW", 0.0)) for sink in cfg.get("sinks", {}).values())
+    return float(sum(resolve_sink_consumption(cfg, manifest).values()))
 
 
-def power_balance(cfg: Dict[str, Any]) -> float:
+def power_balance(cfg: Dict[str, Any], manifest: Optional["ShipManifest"] = None) -> float:
     """Return net available power (generation - consumption)."""
 
-    return get_total_generation(cfg) - get_total_consumption(cfg)
+    return get_total_generation(cfg) - get_total_consumption(cfg, manifest)
+
+
+def feeder_loading(
+    layout: Optional[Dict[str, Any]] = None, cfg: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Build the bus graph, run a DC load flow and report breaker loading."""
+
+    from power.network import build_bus_network
+
+    net = build_bus_network(layout, cfg)
+    return net.feeder_report(net.solve_dc())
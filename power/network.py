@@ -0,0 +1,392 @@
+"""
+network.py
+-----------
+Bus graph and sparse DC load flow for the power distribution model.
+
+Model
+    • Buses carry a nominal voltage [kV], a load [kW] and a generation
+      capacity [kW]. Branches (cables, feeders, breakers) carry a series
+      reactance ``x_pu`` and a breaker rating [A].
+    • DC load flow: B·θ = P with B the reactance-weighted Laplacian. One
+      reference bus per energized island is removed and the reduced system
+      is factorized once (SuperLU); branch flows are (θᵢ - θⱼ)/x.
+    • Sources in an island share the island load in proportion to their
+      capacity (participation factors); shortfalls are reported, not hidden.
+      Islands without a source are de-energized and their load is unserved.
+    • Currents: I = |P| / (√3·V_LL), kW / kV = A, evaluated at the branch
+      voltage (default: the lower of its end voltages, i.e. breaker side).
+
+DC flow is exact for the radial feeders in the current layout; an AC
+(Newton) solver can reuse the same bus/branch arrays later.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from data.loader import load_bus_layout, load_power_design
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from ship.manifest import ShipManifest
+
+try:
+    from scipy import sparse  # type: ignore
+    from scipy.sparse.csgraph import connected_components  # type: ignore
+    from scipy.sparse.linalg import splu  # type: ignore
+except ImportError:  # pragma: no cover - defensive guard
+    sparse = None  # type: ignore
+    connected_components = splu = None  # type: ignore
+
+
+SQRT3 = np.sqrt(3.0)
+DEFAULT_X_PU = 0.01
+
+
+def _require_scipy() -> None:
+    if sparse is None:
+        raise ImportError("SciPy is required for power load flow. Please install it.")
+
+
+def redundancy_paths(redundancy: Any) -> int:
+    """Parallel paths for a redundancy tag: 'n' → 1, 'n+1' → 2, 'n+2' → 3."""
+
+    if redundancy is None:
+        return 1
+    match = re.fullmatch(r"\s*n\s*(?:\+\s*(\d+))?\s*", str(redundancy).lower())
+    if not match:
+        raise ValueError(f"Unrecognized redundancy '{redundancy}'. Use 'n' or 'n+k'.")
+    return 1 + int(match.group(1) or 0)
+
+
+@dataclass
+class LoadFlowResult:
+    """DC load-flow solution (index order of buses / branches)."""
+
+    theta: np.ndarray
+    flow_kW: np.ndarray  # + means from → to
+    current_A: np.ndarray
+    loading: np.ndarray  # current / rating (0 where unrated)
+    overloaded: np.ndarray  # bool per branch
+    energized: np.ndarray  # bool per bus
+    generation_kW: np.ndarray  # dispatched generation per bus
+    injection_kW: np.ndarray  # generation - served load per bus
+    unserved_kW: float  # load on de-energized buses
+    shortfall_kW: float  # island load above island capacity
+    island: np.ndarray  # component label per bus
+
+
+class PowerNetwork:
+    """Array-backed bus/branch graph with DC load flow."""
+
+    def __init__(self) -> None:
+        self.bus_ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._voltage: List[float] = []
+        self._load: List[float] = []
+        self._capacity: List[float] = []
+
+        self.branch_names: List[str] = []
+        self._from: List[int] = []
+        self._to: List[int] = []
+        self._x: List[float] = []
+        self._rating: List[float] = []
+        self._branch_voltage: List[float] = []
+        self.branch_kind: List[str] = []
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @property
+    def n_buses(self) -> int:
+        return len(self.bus_ids)
+
+    @property
+    def n_branches(self) -> int:
+        return len(self._from)
+
+    def index_of(self, bus) -> int:
+        if isinstance(bus, (int, np.integer)):
+            return int(bus)
+        try:
+            return self._index[bus]
+        except KeyError:
+            raise KeyError(f"Bus '{bus}' is not in the network.") from None
+
+    def add_bus(
+        self, bus_id: str, voltage_kV: float, *, load_kW: float = 0.0, capacity_kW: float = 0.0
+    ) -> int:
+        if bus_id in self._index:
+            raise ValueError(f"Bus '{bus_id}' already exists.")
+        self._index[bus_id] = len(self.bus_ids)
+        self.bus_ids.append(bus_id)
+        self._voltage.append(float(voltage_kV))
+        self._load.append(float(load_kW))
+        self._capacity.append(float(capacity_kW))
+        return self._index[bus_id]
+
+    def add_buses(self, bus_ids: Sequence[str], voltage_kV, *, load_kW=0.0, capacity_kW=0.0) -> np.ndarray:
+        n = len(bus_ids)
+        start = self.n_buses
+        for bus_id, v, p, c in zip(
+            bus_ids,
+            np.broadcast_to(voltage_kV, (n,)),
+            np.broadcast_to(load_kW, (n,)),
+            np.broadcast_to(capacity_kW, (n,)),
+        ):
+            self.add_bus(bus_id, float(v), load_kW=float(p), capacity_kW=float(c))
+        return np.arange(start, start + n)
+
+    def add_branch(
+        self,
+        from_bus,
+        to_bus,
+        *,
+        x_pu: float = DEFAULT_X_PU,
+        rating_A: float = np.inf,
+        name: Optional[str] = None,
+        kind: str = "cable",
+        voltage_kV: Optional[float] = None,
+    ) -> int:
+        i, j = self.index_of(from_bus), self.index_of(to_bus)
+        if x_pu <= 0:
+            raise ValueError("Branch reactance x_pu must be positive.")
+        self._from.append(i)
+        self._to.append(j)
+        self._x.append(float(x_pu))
+        self._rating.append(float(rating_A))
+        self._branch_voltage.append(
+            float(voltage_kV) if voltage_kV is not None else min(self._voltage[i], self._voltage[j])
+        )
+        self.branch_names.append(name or f"{self.bus_ids[i]}->{self.bus_ids[j]}")
+        self.branch_kind.append(kind)
+        return self.n_branches - 1
+
+    def add_branches(self, from_buses, to_buses, *, x_pu=DEFAULT_X_PU, rating_A=np.inf, kind="cable") -> np.ndarray:
+        n = len(from_buses)
+        start = self.n_branches
+        for f, t, x, r in zip(
+            from_buses, to_buses, np.broadcast_to(x_pu, (n,)), np.broadcast_to(rating_A, (n,))
+        ):
+            self.add_branch(f, t, x_pu=float(x), rating_A=float(r), kind=kind)
+        return np.arange(start, start + n)
+
+    def set_loads(self, load_kW) -> None:
+        self._load = list(np.broadcast_to(np.asarray(load_kW, dtype=float), (self.n_buses,)))
+
+    # ------------------------------------------------------------------
+    # Array views
+    # ------------------------------------------------------------------
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "voltage_kV": np.asarray(self._voltage, dtype=float),
+            "load_kW": np.asarray(self._load, dtype=float),
+            "capacity_kW": np.asarray(self._capacity, dtype=float),
+            "from": np.asarray(self._from, dtype=np.int64),
+            "to": np.asarray(self._to, dtype=np.int64),
+            "x_pu": np.asarray(self._x, dtype=float),
+            "rating_A": np.asarray(self._rating, dtype=float),
+            "branch_voltage_kV": np.asarray(self._branch_voltage, dtype=float),
+        }
+
+    def susceptance_matrix(self, in_service: Optional[np.ndarray] = None):
+        """Reactance-weighted Laplacian B (CSR) over in-service branches."""
+
+        _require_scipy()
+        a = self.arrays()
+        b = 1.0 / a["x_pu"]
+        if in_service is not None:
+            b = np.where(in_service, b, 0.0)
+        n = self.n_buses
+        rows = np.concatenate([a["from"], a["to"], a["from"], a["to"]])
+        cols = np.concatenate([a["to"], a["from"], a["from"], a["to"]])
+        vals = np.concatenate([-b, -b, b, b])
+        return sparse.csr_matrix((vals, (rows, cols)), shape=(n, n))
+
+    # ------------------------------------------------------------------
+    # Load flow
+    # ------------------------------------------------------------------
+    def islands(self, in_service: Optional[np.ndarray] = None) -> Tuple[int, np.ndarray]:
+        _require_scipy()
+        a = self.arrays()
+        keep = np.ones(self.n_branches, dtype=bool) if in_service is None else np.asarray(in_service)
+        graph = sparse.csr_matrix(
+            (np.ones(int(keep.sum())), (a["from"][keep], a["to"][keep])),
+            shape=(self.n_buses, self.n_buses),
+        )
+        return connected_components(graph, directed=False)
+
+    def dispatch(self, island: np.ndarray, n_islands: int) -> Tuple[np.ndarray, np.ndarray, float]:
+        """Capacity-proportional generation per island → (injection, energized, shortfall)."""
+
+        a = self.arrays()
+        load, cap = a["load_kW"], a["capacity_kW"]
+        island_load = np.bincount(island, weights=load, minlength=n_islands)
+        island_cap = np.bincount(island, weights=cap, minlength=n_islands)
+        live = island_cap > 0.0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            share = np.where(live, np.minimum(island_load, island_cap) / island_cap, 0.0)
+        generation = cap * share[island]
+        energized = live[island]
+        # Shortfall: load is scaled down uniformly inside short islands.
+        shortfall = float(np.maximum(island_load - island_cap, 0.0)[live].sum())
+        return generation, energized, shortfall
+
+    def factorize(self, island: np.ndarray, in_service: Optional[np.ndarray] = None):
+        """LU of B with one reference bus (lowest index) per island removed → (lu, free)."""
+
+        _require_scipy()
+        ref = np.unique(island, return_index=True)[1]
+        free = np.setdiff1d(np.arange(self.n_buses), ref)
+        if not free.size:
+            return None, free
+        B = self.susceptance_matrix(in_service)
+        return splu(B[free][:, free].tocsc()), free
+
+    def solve_dc(self, in_service: Optional[np.ndarray] = None) -> LoadFlowResult:
+        """Solve the DC load flow with optional branch outages (bool mask)."""
+
+        _require_scipy()
+        a = self.arrays()
+        n = self.n_buses
+        keep = np.ones(self.n_branches, dtype=bool) if in_service is None else np.asarray(in_service, dtype=bool)
+        n_islands, island = self.islands(keep)
+        generation, energized, shortfall = self.dispatch(island, n_islands)
+
+        load = a["load_kW"].copy()
+        island_load = np.bincount(island, weights=load, minlength=n_islands)
+        island_cap = np.bincount(island, weights=a["capacity_kW"], minlength=n_islands)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            served = np.where(island_load > island_cap, island_cap / island_load, 1.0)
+        load = np.where(energized, load * served[island], 0.0)
+        injection = generation - load
+
+        theta = np.zeros(n)
+        lu, free = self.factorize(island, keep)
+        if lu is not None:
+            theta[free] = lu.solve(injection[free])
+
+        flow = np.where(keep, (theta[a["from"]] - theta[a["to"]]) / a["x_pu"], 0.0)
+        current = np.abs(flow) / (SQRT3 * a["branch_voltage_kV"])
+        rating = a["rating_A"]
+        loading = np.where(np.isfinite(rating), current / rating, 0.0)
+        unserved = float(a["load_kW"][~energized].sum())
+        return LoadFlowResult(
+            theta=theta,
+            flow_kW=flow,
+            current_A=current,
+            loading=loading,
+            overloaded=loading > 1.0 + 1e-9,
+            energized=energized,
+            generation_kW=generation,
+            injection_kW=injection,
+            unserved_kW=unserved,
+            shortfall_kW=shortfall,
+            island=island,
+        )
+
+    def feeder_report(self, result: LoadFlowResult) -> List[Dict[str, Any]]:
+        """Per-branch current vs. breaker rating for rated branches."""
+
+        a = self.arrays()
+        rows = []
+        for k in np.flatnonzero(np.isfinite(a["rating_A"])):
+            rows.append(
+                {
+                    "branch": self.branch_names[k],
+                    "kind": self.branch_kind[k],
+                    "flow_kW": float(result.flow_kW[k]),
+                    "current_A": float(result.current_A[k]),
+                    "rating_A": float(a["rating_A"][k]),
+                    "loading": float(result.loading[k]),
+                    "overloaded": bool(result.overloaded[k]),
+                }
+            )
+        return rows
+
+
+# ---------------------------------------------------------------------------
+# Builders from configuration
+# ---------------------------------------------------------------------------
+def sink_demand_kW(sink_cfg: Dict[str, Any]) -> float:
+    """Sink demand from power_design.yaml (fixed, per-m² and per-person terms)."""
+
+    from power.bus import resolve_sink_consumption
+
+    return resolve_sink_consumption({"sinks": {"sink": sink_cfg}})["sink"]
+
+
+def source_capacity_kW(source_cfg: Dict[str, Any]) -> float:
+    """Generation capacity; storage contributes its discharge rate."""
+
+    if "generation_kW" in source_cfg:
+        return float(source_cfg.get("generation_kW") or 0.0)
+    return float(source_cfg.get("discharge_rate_kW") or 0.0)
+
+
+def _add_feeder(
+    net: PowerNetwork,
+    upstream: str,
+    name: str,
+    cfg: Dict[str, Any],
+    voltage_kV: float,
+    demand_kW: Dict[str, float],
+    prefix: str,
+) -> None:
+    bus = f"{prefix}:{name}"
+    net.add_bus(bus, voltage_kV)
+    rating = float(cfg.get("breaker_rating_A", np.inf))
+    paths = redundancy_paths(cfg.get("redundancy"))
+    for k in range(paths):
+        net.add_branch(
+            upstream,
+            bus,
+            x_pu=float(cfg.get("x_pu", DEFAULT_X_PU)),
+            rating_A=rating,
+            name=f"{bus}#{k}" if paths > 1 else bus,
+            kind="breaker",
+            voltage_kV=voltage_kV,
+        )
+    for sink in cfg.get("sinks", []) or []:
+        sink_bus = f"sink:{sink}"
+        net.add_bus(sink_bus, voltage_kV, load_kW=demand_kW.get(sink, 0.0))
+        net.add_branch(bus, sink_bus, name=sink_bus, kind="sink")
+    for panel, panel_cfg in (cfg.get("panels") or {}).items():
+        _add_feeder(net, bus, panel, panel_cfg or {}, voltage_kV, demand_kW, "panel")
+
+
+def build_bus_network(
+    layout: Optional[Dict[str, Any]] = None,
+    design: Optional[Dict[str, Any]] = None,
+    manifest: Optional["ShipManifest"] = None,
+) -> PowerNetwork:
+    """
+    Build the ship bus graph from bus_layout (topology) and power_design (kW).
+
+    Sources and storage attach to the backbone; every feeder gets one
+    breaker branch per redundant path; sinks hang off their feeder/panel
+    with demand from ``resolve_sink_consumption`` (manifest-based if given).
+    """
+
+    layout = layout if layout is not None else load_bus_layout()
+    design = design if design is not None else load_power_design()
+    backbone_kV = float(layout.get("backbone_voltage_kV", 11.0))
+    secondary_kV = float(layout.get("secondary_voltage_kV", backbone_kV))
+
+    net = PowerNetwork()
+    net.add_bus("backbone", backbone_kV)
+    for group in ("sources", "storage"):
+        for name, cfg in (design.get(group) or {}).items():
+            bus = f"source:{name}"
+            net.add_bus(bus, backbone_kV, capacity_kW=source_capacity_kW(cfg or {}))
+            net.add_branch(bus, "backbone", name=bus, kind="source")
+
+    from power.bus import resolve_sink_consumption
+
+    demand = resolve_sink_consumption(design, manifest)
+    for name, cfg in (layout.get("feeders") or {}).items():
+        _add_feeder(net, "backbone", name, cfg or {}, secondary_kV, demand, "feeder")
+    return net
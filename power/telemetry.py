@@ -0,0 +1,441 @@
+"""
+telemetry.py
+-------------
+Streaming ingestion of feeder/sink meter logs with constant-memory rolling
+aggregates.
+
+Input
+    CSV (header row) or JSONL, one reading per row: time, meter, kW. Times
+    are epoch seconds or ISO-8601 strings (``Z`` or ``±hh:mm`` offsets are
+    converted to UTC). Files are read ``chunk_rows`` lines at a time; each
+    chunk becomes three NumPy columns and is folded into the aggregates with
+    bincount / ufunc.at — no per-row Python state.
+    Empty or malformed values, ragged CSV rows and broken JSON lines become
+    NaN and are counted in ``bad_rows`` instead of aborting the stream; only
+    chunks that contain one pay for the per-value fallback parse.
+
+Aggregates per sink (memory fixed at construction)
+    • Ring of ``n_windows`` tumbling windows of ``window_s``: sum, count,
+      peak and a log-binned histogram per window. Rolling statistics are the
+      ring totals; a newer window evicts the oldest one.
+    • All-time count / sum / peak / histogram.
+    • Histograms have relative accuracy α: bin i covers (γ^(i-1), γ^i] with
+      γ = (1+α)/(1-α), so any quantile is within ±α of a true reading.
+
+Meters map to sinks through ``meter_map`` (default: meter name = sink name);
+sinks map to feeders through the bus layout ``sinks`` lists. Readings above
+the sink's design demand (``resolve_sink_consumption``) are flagged.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import warnings
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple, Union
+
+import numpy as np
+
+from data.loader import load_bus_layout, load_power_design
+from power.bus import resolve_sink_consumption
+
+
+class LogHistogram:
+    """Bin layout shared by all sketches (values ≤ min_value share bin 0)."""
+
+    def __init__(self, relative_accuracy: float = 0.02, min_value: float = 1e-3, max_value: float = 1e5) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1).")
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self.gamma)
+        self.min_value = float(min_value)
+        self._offset = int(np.floor(np.log(self.min_value) / self._log_gamma))
+        self.n_bins = int(np.ceil(np.log(max_value) / self._log_gamma)) - self._offset + 1
+
+    def index(self, values: np.ndarray) -> np.ndarray:
+        v = np.maximum(np.asarray(values, dtype=float), self.min_value)
+        idx = np.ceil(np.log(v) / self._log_gamma).astype(np.int64) - self._offset
+        return np.clip(idx, 0, self.n_bins - 1)
+
+    def quantile(self, counts: np.ndarray, q: float) -> float:
+        total = counts.sum()
+        if total == 0:
+            return float("nan")
+        i = int(np.searchsorted(np.cumsum(counts), q * total, side="left"))
+        if i == 0:
+            return 0.0
+        upper = self.gamma ** (i + self._offset)
+        return float(2.0 * upper / (self.gamma + 1.0))
+
+
+@dataclass
+class SinkStats:
+    count: int
+    mean_kW: float
+    peak_kW: float
+    p50_kW: float
+    p95_kW: float
+    p99_kW: float
+    design_kW: float
+    exceed_count: int
+    first_exceed_s: float
+    last_exceed_s: float
+
+    @property
+    def exceeds_design(self) -> bool:
+        return self.exceed_count > 0
+
+
+class TelemetryIngestor:
+    """
+    Chunked meter-log ingestor with rolling per-sink aggregates.
+
+    Example:
+        ingest = TelemetryIngestor(window_s=900, n_windows=96)
+        ingest.ingest("logs/feeders-2031-04.csv")
+        ingest.rolling("life_support")["p95_kW"]
+    """
+
+    def __init__(
+        self,
+        design: Optional[Dict[str, Any]] = None,
+        layout: Optional[Dict[str, Any]] = None,
+        *,
+        meter_map: Optional[Mapping[str, str]] = None,
+        window_s: float = 900.0,
+        n_windows: int = 96,
+        relative_accuracy: float = 0.02,
+        max_kW: float = 1e5,
+        exceed_tolerance: float = 0.0,
+    ) -> None:
+        design = design if design is not None else load_power_design()
+        layout = layout if layout is not None else load_bus_layout()
+        self.design_kW = resolve_sink_consumption(design)
+        self.sinks: List[str] = list(self.design_kW)
+        self._sink_index = {name: i for i, name in enumerate(self.sinks)}
+        self.meter_map: Dict[str, str] = dict(meter_map or {})
+        self.feeders: Dict[str, List[str]] = {
+            name: [s for s in (cfg or {}).get("sinks", []) or [] if s in self._sink_index]
+            for name, cfg in (layout.get("feeders") or {}).items()
+        }
+
+        self.window_s = float(window_s)
+        self.n_windows = int(n_windows)
+        self.hist = LogHistogram(relative_accuracy, max_value=max_kW)
+        self.tolerance = float(exceed_tolerance)
+        limits = np.array([self.design_kW[s] for s in self.sinks], dtype=float)
+        self._limit = np.where(limits > 0, limits * (1.0 + self.tolerance), np.inf)
+
+        n, w, b = len(self.sinks), self.n_windows, self.hist.n_bins
+        self._win_sum = np.zeros((n, w))
+        self._win_count = np.zeros((n, w), dtype=np.int64)
+        self._win_peak = np.full((n, w), -np.inf)
+        self._win_hist = np.zeros((n, w, b), dtype=np.uint32)
+        self._slot_window = np.full(w, -1, dtype=np.int64)  # window number held by each slot
+        self._latest = -1
+
+        self._count = np.zeros(n, dtype=np.int64)
+        self._sum = np.zeros(n)
+        self._peak = np.full(n, -np.inf)
+        self._hist = np.zeros((n, b), dtype=np.int64)
+        self._exceed = np.zeros(n, dtype=np.int64)
+        self._first_exceed = np.full(n, np.inf)
+        self._last_exceed = np.full(n, -np.inf)
+
+        self.rows = 0
+        self.unmapped_rows = 0
+        self.bad_rows = 0  # missing meter, or a missing/unparsable time or value
+        self.late_rows = 0
+
+    # ------------------------------------------------------------------
+    # Vectorized core
+    # ------------------------------------------------------------------
+    def _sink_ids(self, meters: np.ndarray) -> np.ndarray:
+        uniq, inverse = np.unique(meters, return_inverse=True)
+        lookup = np.array(
+            [self._sink_index.get(self.meter_map.get(m, m), -1) for m in uniq.tolist()], dtype=np.int64
+        )
+        return lookup[inverse.reshape(-1)] if uniq.size else np.zeros(0, dtype=np.int64)
+
+    def _advance(self, newest: int) -> None:
+        """Move the ring forward to window ``newest``, evicting old slots."""
+
+        if newest <= self._latest:
+            return
+        start = max(self._latest + 1, newest - self.n_windows + 1)
+        slots = np.arange(start, newest + 1) % self.n_windows
+        self._win_sum[:, slots] = 0.0
+        self._win_count[:, slots] = 0
+        self._win_peak[:, slots] = -np.inf
+        self._win_hist[:, slots] = 0
+        self._slot_window[slots] = np.arange(start, newest + 1)
+        self._latest = newest
+
+    def ingest_arrays(self, t_s: np.ndarray, meters: Sequence[str], kW: np.ndarray) -> None:
+        """Fold one chunk of readings (equal-length columns) into the aggregates."""
+
+        t_s = np.asarray(t_s, dtype=float)
+        kW = np.asarray(kW, dtype=float)
+        self.rows += t_s.size
+        meters = np.asarray(meters, dtype=str)
+        sink = self._sink_ids(meters)
+        valid = np.isfinite(kW) & np.isfinite(t_s)
+        ok = (sink >= 0) & valid
+        # A row without a meter is malformed, not an unknown meter.
+        bad = ~ok & ((sink >= 0) | (meters == ""))
+        self.unmapped_rows += int(np.count_nonzero(~ok & ~bad))
+        self.bad_rows += int(np.count_nonzero(bad))
+        t_s, kW, sink = t_s[ok], kW[ok], sink[ok]
+        if not t_s.size:
+            return
+        n, w, b = len(self.sinks), self.n_windows, self.hist.n_bins
+        bins = self.hist.index(kW)
+
+        # All-time aggregates.
+        self._count += np.bincount(sink, minlength=n)
+        self._sum += np.bincount(sink, weights=kW, minlength=n)
+        np.maximum.at(self._peak, sink, kW)
+        self._hist += np.bincount(sink * b + bins, minlength=n * b).reshape(n, b)
+        over = kW > self._limit[sink]
+        if over.any():
+            self._exceed += np.bincount(sink[over], minlength=n)
+            np.minimum.at(self._first_exceed, sink[over], t_s[over])
+            np.maximum.at(self._last_exceed, sink[over], t_s[over])
+
+        # Rolling ring.
+        window = np.floor(t_s / self.window_s).astype(np.int64)
+        self._advance(int(window.max()))
+        live = window > self._latest - w
+        self.late_rows += int(np.count_nonzero(~live))
+        slot = window[live] % w
+        s, v, bi = sink[live], kW[live], bins[live]
+        cell = s * w + slot
+        self._win_sum += np.bincount(cell, weights=v, minlength=n * w).reshape(n, w)
+        self._win_count += np.bincount(cell, minlength=n * w).reshape(n, w)
+        np.maximum.at(self._win_peak.reshape(-1), cell, v)
+        self._win_hist += np.bincount(cell * b + bi, minlength=n * w * b).reshape(n, w, b).astype(np.uint32)
+
+    # ------------------------------------------------------------------
+    # File readers
+    # ------------------------------------------------------------------
+    def ingest(
+        self,
+        source: Union[str, Path, TextIO],
+        *,
+        fmt: Optional[str] = None,
+        chunk_rows: int = 100_000,
+        time_col: str = "timestamp",
+        meter_col: str = "meter",
+        value_col: str = "kW",
+    ) -> int:
+        """Stream a CSV/JSONL file (or open text handle); returns rows read."""
+
+        if isinstance(source, (str, Path)):
+            path = Path(source)
+            fmt = fmt or ("jsonl" if path.suffix.lower() in (".jsonl", ".ndjson") else "csv")
+            with path.open("r", encoding="utf-8") as handle:
+                return self.ingest(
+                    handle,
+                    fmt=fmt,
+                    chunk_rows=chunk_rows,
+                    time_col=time_col,
+                    meter_col=meter_col,
+                    value_col=value_col,
+                )
+        if fmt not in ("csv", "jsonl"):
+            raise ValueError("fmt must be 'csv' or 'jsonl' for open handles.")
+        before = self.rows
+        reader = _csv_chunks if fmt == "csv" else _jsonl_chunks
+        for t, meters, values in reader(source, chunk_rows, time_col, meter_col, value_col):
+            self.ingest_arrays(t, meters, values)
+        return self.rows - before
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _stats(self, count: int, total: float, peak: float, hist: np.ndarray) -> Dict[str, float]:
+        return {
+            "count": int(count),
+            "mean_kW": total / count if count else float("nan"),
+            "peak_kW": float(peak) if count else float("nan"),
+            "p50_kW": self.hist.quantile(hist, 0.50),
+            "p95_kW": self.hist.quantile(hist, 0.95),
+            "p99_kW": self.hist.quantile(hist, 0.99),
+        }
+
+    def rolling(self, sink: str) -> Dict[str, float]:
+        """Statistics over the last ``n_windows`` windows for one sink."""
+
+        i = self._sink_index[sink]
+        return self._stats(
+            self._win_count[i].sum(),
+            self._win_sum[i].sum(),
+            self._win_peak[i].max(),
+            self._win_hist[i].sum(axis=0),
+        )
+
+    def window_means(self) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """(window start times [s], {sink: mean kW per window}) oldest first."""
+
+        order = np.argsort(self._slot_window)
+        order = order[self._slot_window[order] >= 0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = self._win_sum[:, order] / self._win_count[:, order]
+        return self._slot_window[order] * self.window_s, dict(zip(self.sinks, means))
+
+    def feeder_window_means(self) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Per-feeder sum of sink window means (sinks without data count 0)."""
+
+        starts, means = self.window_means()
+        return starts, {
+            feeder: np.sum([np.nan_to_num(means[s]) for s in sinks], axis=0) if sinks else np.zeros(starts.size)
+            for feeder, sinks in self.feeders.items()
+        }
+
+    def summary(self) -> Dict[str, SinkStats]:
+        """All-time statistics per sink."""
+
+        out = {}
+        for i, name in enumerate(self.sinks):
+            base = self._stats(self._count[i], self._sum[i], self._peak[i], self._hist[i])
+            out[name] = SinkStats(
+                **base,
+                design_kW=self.design_kW[name],
+                exceed_count=int(self._exceed[i]),
+                first_exceed_s=float(self._first_exceed[i]),
+                last_exceed_s=float(self._last_exceed[i]),
+            )
+        return out
+
+    def exceedances(self) -> Dict[str, SinkStats]:
+        """Sinks with at least one reading above design consumption."""
+
+        return {name: stats for name, stats in self.summary().items() if stats.exceeds_design}
+
+
+# ---------------------------------------------------------------------------
+# Chunk readers
+# ---------------------------------------------------------------------------
+_ISO_OFFSET = re.compile(r"[T ]\d{2}(?::?\d{2}){0,2}(?:\.\d+)?(Z|([+-])(\d{2}):?(\d{2}))$")
+
+
+def to_float(values: Sequence[Any]) -> np.ndarray:
+    """Floats from strings/numbers; empty or unparsable entries become NaN."""
+
+    arr = np.asarray(values)
+    try:
+        return arr.astype(float)
+    except (TypeError, ValueError):
+        pass
+    out = np.full(arr.shape, np.nan)
+    for k, v in enumerate(arr.tolist()):
+        try:
+            out[k] = float(v)
+        except (TypeError, ValueError):
+            pass
+    return out
+
+
+def _iso_seconds(text: str) -> float:
+    match = _ISO_OFFSET.search(text)
+    offset_s = 0.0
+    if match is not None:
+        text = text[: match.start(1)]
+        if match.group(2):
+            sign = 1.0 if match.group(2) == "+" else -1.0
+            offset_s = sign * (int(match.group(3)) * 3600 + int(match.group(4)) * 60)
+    try:
+        stamp = np.datetime64(text, "ms")
+    except ValueError:
+        return float("nan")
+    if np.isnat(stamp):
+        return float("nan")
+    return stamp.astype(np.int64) / 1000.0 - offset_s
+
+
+def parse_times(values: Sequence[Any]) -> np.ndarray:
+    """Epoch seconds from numeric or ISO-8601 strings; unparsable → NaN."""
+
+    arr = np.asarray(values)
+    try:
+        return arr.astype(float)
+    except (TypeError, ValueError):
+        pass
+    text = arr.astype(str)
+    try:
+        # Fast path: offset-free stamps parse in one C call (numpy warns on
+        # offsets, which the per-value path converts to UTC).
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            stamps = np.array(np.char.rstrip(text, "Z"), dtype="datetime64[ms]")
+        return np.where(np.isnat(stamps), np.nan, stamps.astype(np.int64) / 1000.0)
+    except (ValueError, Warning):
+        pass
+    out = to_float(text)
+    for k in np.flatnonzero(np.isnan(out)).tolist():
+        out[k] = _iso_seconds(text[k])
+    return out
+
+
+def _csv_chunks(
+    handle: TextIO, chunk_rows: int, time_col: str, meter_col: str, value_col: str
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    header = handle.readline().strip().split(",")
+    try:
+        cols = [header.index(c) for c in (time_col, meter_col, value_col)]
+    except ValueError:
+        raise ValueError(f"CSV header {header} lacks one of {time_col!r}, {meter_col!r}, {value_col!r}.") from None
+    width = len(header)
+    while True:
+        lines = list(islice(handle, chunk_rows))
+        if not lines:
+            return
+        # One C-level split for the whole chunk; per-line only if ragged.
+        text = "".join(lines).replace("\r", "").strip("\n")
+        if not text:
+            continue
+        tokens = text.replace("\n", ",").split(",")
+        if len(tokens) != width * (text.count("\n") + 1):
+            tokens = []
+            for line in lines:
+                row = line.rstrip("\r\n").split(",")
+                if len(row) == width:
+                    tokens.extend(row)
+                elif line.strip():
+                    # Ragged: keep time and meter, drop the value (→ bad row).
+                    row = (row + [""] * width)[:width]
+                    row[cols[2]] = ""
+                    tokens.extend(row)
+        yield (
+            parse_times(tokens[cols[0] :: width]),
+            np.asarray(tokens[cols[1] :: width], dtype=str),
+            to_float(tokens[cols[2] :: width]),
+        )
+
+
+def _jsonl_chunks(
+    handle: TextIO, chunk_rows: int, time_col: str, meter_col: str, value_col: str
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    while True:
+        lines = list(islice(handle, chunk_rows))
+        if not lines:
+            return
+        records = [_json_record(line) for line in lines if line.strip()]
+        if not records:
+            continue
+        yield (
+            parse_times([str(r.get(time_col, "")) for r in records]),
+            np.asarray([r.get(meter_col, "") for r in records], dtype=str),
+            to_float([r.get(value_col) for r in records]),
+        )
+
+
+def _json_record(line: str) -> Dict[str, Any]:
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return {}
+    return record if isinstance(record, dict) else {}
@@ -0,0 +1,299 @@
+"""
+timeseries.py
+--------------
+Chunked time-series power balance with battery storage and backup supply.
+
+Dispatch rule (per step, in order)
+    1. Generation serves demand.
+    2. Surplus charges the battery (charge rate, η_charge); the rest spills.
+    3. Deficit discharges the battery (discharge rate, η_discharge), then
+       the dispatchable backup (e.g. fuel cell) up to ``backup_kW``; the
+       rest is unserved.
+
+State of charge without a Python loop
+    s_t = clip(s_{t-1} + x_t, lo_t, hi_t) is a composition of clamp maps,
+    and clamp maps are closed under composition:
+        (a₂,l₂,h₂)∘(a₁,l₁,h₁) = (a₁+a₂, clip(l₁+a₂,l₂,h₂), clip(h₁+a₂,l₂,h₂))
+    so the whole trajectory is a parallel prefix scan (log₂ n array passes).
+
+Profiles are floats (constant kW) or callables ``profile(start_step, n) ->
+kW array`` so year-long runs never materialize more than one chunk.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Union
+
+import numpy as np
+
+from data.loader import load_power_design
+
+Profile = Union[float, Callable[[int, int], np.ndarray]]
+
+MINUTE_S = 60.0
+
+
+def clamp_scan(x: np.ndarray, s0: float, lo, hi) -> np.ndarray:
+    """Return s with s_t = clip(s_{t-1} + x_t, lo_t, hi_t), s_{-1} = s0."""
+
+    a = np.asarray(x, dtype=float).copy()
+    n = a.size
+    l = np.broadcast_to(np.asarray(lo, dtype=float), (n,)).copy()
+    h = np.broadcast_to(np.asarray(hi, dtype=float), (n,)).copy()
+    d = 1
+    while d < n:
+        # prefix[t] = step[t] ∘ prefix[t - d]
+        a1, l1, h1 = a[:-d], l[:-d], h[:-d]
+        a2, l2, h2 = a[d:], l[d:], h[d:]
+        new_l = np.clip(l1 + a2, l2, h2)
+        new_h = np.clip(h1 + a2, l2, h2)
+        a[d:] = a1 + a2
+        l[d:] = new_l
+        h[d:] = new_h
+        d *= 2
+    return np.clip(s0 + a, l, h)
+
+
+def repeating(values_kW, *, scale: float = 1.0) -> Callable[[int, int], np.ndarray]:
+    """Profile that tiles ``values_kW`` (one value per step) forever."""
+
+    base = np.asarray(values_kW, dtype=float) * scale
+    period = base.size
+
+    def profile(start: int, n: int) -> np.ndarray:
+        return base[(start + np.arange(n)) % period]
+
+    return profile
+
+
+def evaluate_profile(profile: Profile, start: int, n: int) -> np.ndarray:
+    """Steps ``[start, start + n)`` of a constant or callable profile as an (n,) array."""
+
+    if callable(profile):
+        out = np.asarray(profile(start, n), dtype=float)
+        if out.shape != (n,):
+            raise ValueError(f"Profile returned shape {out.shape}, expected ({n},).")
+        return out
+    return np.full(n, float(profile))
+
+
+def _fraction(cfg: Mapping[str, Any], key: str) -> float:
+    """Percent → fraction; missing or 0 (placeholder) means lossless."""
+
+    value = float(cfg.get(key) or 0.0)
+    return value / 100.0 if value > 0 else 1.0
+
+
+@dataclass
+class BatterySpec:
+    capacity_kWh: float
+    charge_rate_kW: float
+    discharge_rate_kW: float
+    eta_charge: float = 1.0
+    eta_discharge: float = 1.0
+    soc_min_frac: float = 0.0
+    initial_frac: float = 1.0
+
+    @classmethod
+    def from_config(cls, cfg: Mapping[str, Any], **overrides: Any) -> "BatterySpec":
+        """Build from a power_design.yaml storage entry."""
+
+        rate = float(cfg.get("discharge_rate_kW") or 0.0)
+        spec = cls(
+            capacity_kWh=float(cfg.get("storage_kWh") or 0.0),
+            charge_rate_kW=float(cfg.get("charge_rate_kW") or rate),
+            discharge_rate_kW=rate,
+            eta_charge=_fraction(cfg, "charge_efficiency_percent"),
+            eta_discharge=_fraction(cfg, "discharge_efficiency_percent"),
+        )
+        for key, value in overrides.items():
+            setattr(spec, key, value)
+        return spec
+
+
+@dataclass
+class BalanceChunk:
+    """One block of streamed output (all power in kW, energy in kWh)."""
+
+    start_step: int
+    times_s: np.ndarray
+    generation_kW: np.ndarray
+    demand_kW: np.ndarray
+    battery_kW: np.ndarray  # + discharging to the bus, - charging
+    soc_kWh: np.ndarray  # end of step
+    backup_kW: np.ndarray
+    unserved_kW: np.ndarray
+    spilled_kW: np.ndarray
+
+
+@dataclass
+class BalanceSummary:
+    """Running totals over all chunks seen by ``update``."""
+
+    dt_s: float
+    capacity_kWh: float = 0.0
+    steps: int = 0
+    generation_kWh: float = 0.0
+    demand_kWh: float = 0.0
+    unserved_kWh: float = 0.0
+    spilled_kWh: float = 0.0
+    backup_kWh: float = 0.0
+    discharge_kWh: float = 0.0
+    charge_kWh: float = 0.0
+    max_unserved_kW: float = 0.0
+    unserved_hours: float = 0.0
+    min_soc_kWh: float = float("inf")
+    final_soc_kWh: float = float("nan")
+    notes: list = field(default_factory=list)
+
+    def update(self, chunk: BalanceChunk) -> None:
+        h = self.dt_s / 3600.0
+        self.steps += chunk.times_s.size
+        self.generation_kWh += float(chunk.generation_kW.sum() * h)
+        self.demand_kWh += float(chunk.demand_kW.sum() * h)
+        self.unserved_kWh += float(chunk.unserved_kW.sum() * h)
+        self.spilled_kWh += float(chunk.spilled_kW.sum() * h)
+        self.backup_kWh += float(chunk.backup_kW.sum() * h)
+        self.discharge_kWh += float(np.maximum(chunk.battery_kW, 0.0).sum() * h)
+        self.charge_kWh += float(np.maximum(-chunk.battery_kW, 0.0).sum() * h)
+        if chunk.unserved_kW.size:
+            self.max_unserved_kW = max(self.max_unserved_kW, float(chunk.unserved_kW.max()))
+            self.unserved_hours += float(np.count_nonzero(chunk.unserved_kW > 1e-9) * h)
+            self.min_soc_kWh = min(self.min_soc_kWh, float(chunk.soc_kWh.min()))
+            self.final_soc_kWh = float(chunk.soc_kWh[-1])
+
+    @property
+    def min_soc_frac(self) -> float:
+        return self.min_soc_kWh / self.capacity_kWh if self.capacity_kWh > 0 else float("nan")
+
+    @property
+    def equivalent_cycles(self) -> float:
+        return self.discharge_kWh / self.capacity_kWh if self.capacity_kWh > 0 else 0.0
+
+
+class PowerTimeSeries:
+    """
+    Step generation, demand and battery state over long horizons.
+
+    Example:
+        sim = PowerTimeSeries.from_design(dt_s=60)
+        summary = sim.simulate(365 * 24 * 60)
+    """
+
+    def __init__(
+        self,
+        sources: Mapping[str, Profile],
+        sinks: Mapping[str, Profile],
+        battery: Optional[BatterySpec] = None,
+        *,
+        backup_kW: Profile = 0.0,
+        dt_s: float = MINUTE_S,
+    ) -> None:
+        if dt_s <= 0:
+            raise ValueError("dt_s must be positive.")
+        self.sources = dict(sources)
+        self.sinks = dict(sinks)
+        self.battery = battery
+        self.backup_kW = backup_kW
+        self.dt_s = float(dt_s)
+        self.soc_kWh = battery.capacity_kWh * battery.initial_frac if battery else 0.0
+
+    @classmethod
+    def from_design(
+        cls,
+        cfg: Optional[Dict[str, Any]] = None,
+        *,
+        source_profiles: Optional[Mapping[str, Profile]] = None,
+        sink_profiles: Optional[Mapping[str, Profile]] = None,
+        dt_s: float = MINUTE_S,
+        **battery_overrides: Any,
+    ) -> "PowerTimeSeries":
+        """
+        Constant profiles from power_design.yaml, overridable per name.
+
+        The first storage entry with ``storage_kWh`` is the battery; storage
+        entries with ``generation_kW`` (fuel cells) form the backup supply.
+        """
+
+        from power.network import sink_demand_kW
+
+        cfg = cfg if cfg is not None else load_power_design()
+        sources: Dict[str, Profile] = {
+            name: float((src or {}).get("generation_kW") or 0.0) for name, src in (cfg.get("sources") or {}).items()
+        }
+        sinks: Dict[str, Profile] = {name: sink_demand_kW(snk or {}) for name, snk in (cfg.get("sinks") or {}).items()}
+        sources.update(source_profiles or {})
+        sinks.update(sink_profiles or {})
+
+        battery = None
+        backup = 0.0
+        for store in (cfg.get("storage") or {}).values():
+            store = store or {}
+            if "storage_kWh" in store and battery is None:
+                battery = BatterySpec.from_config(store, **battery_overrides)
+            elif "generation_kW" in store:
+                backup += float(store.get("generation_kW") or 0.0)
+        return cls(sources, sinks, battery, backup_kW=backup, dt_s=dt_s)
+
+    # ------------------------------------------------------------------
+    def _chunk(self, start: int, n: int) -> BalanceChunk:
+        h = self.dt_s / 3600.0
+        gen = np.zeros(n)
+        for profile in self.sources.values():
+            gen += evaluate_profile(profile, start, n)
+        demand = np.zeros(n)
+        for profile in self.sinks.values():
+            demand += evaluate_profile(profile, start, n)
+        net = gen - demand
+
+        soc = np.full(n, self.soc_kWh)
+        battery = np.zeros(n)
+        bat = self.battery
+        if bat is not None and bat.capacity_kWh > 0:
+            want = np.where(
+                net > 0,
+                np.minimum(net, bat.charge_rate_kW) * bat.eta_charge,
+                -np.minimum(-net, bat.discharge_rate_kW) / bat.eta_discharge,
+            ) * h
+            soc = clamp_scan(want, self.soc_kWh, bat.capacity_kWh * bat.soc_min_frac, bat.capacity_kWh)
+            d_soc = np.diff(soc, prepend=self.soc_kWh)
+            battery = np.where(d_soc < 0, -d_soc * bat.eta_discharge, -d_soc / bat.eta_charge) / h
+            self.soc_kWh = float(soc[-1])
+
+        residual = net + battery
+        residual[np.abs(residual) < 1e-9] = 0.0  # round-off from the SOC difference
+        backup = np.minimum(np.maximum(-residual, 0.0), np.maximum(evaluate_profile(self.backup_kW, start, n), 0.0))
+        return BalanceChunk(
+            start_step=start,
+            times_s=(start + 1 + np.arange(n)) * self.dt_s,
+            generation_kW=gen,
+            demand_kW=demand,
+            battery_kW=battery,
+            soc_kWh=soc,
+            backup_kW=backup,
+            unserved_kW=np.maximum(-residual - backup, 0.0),
+            spilled_kW=np.maximum(residual, 0.0),
+        )
+
+    def run(self, n_steps: int, *, chunk_steps: int = 7 * 24 * 60, start_step: int = 0) -> Iterator[BalanceChunk]:
+        """Yield ``n_steps`` steps in chunks; the battery state carries over."""
+
+        if chunk_steps <= 0:
+            raise ValueError("chunk_steps must be positive.")
+        step = start_step
+        end = start_step + int(n_steps)
+        while step < end:
+            n = min(chunk_steps, end - step)
+            yield self._chunk(step, n)
+            step += n
+
+    def simulate(self, n_steps: int, **kwargs: Any) -> BalanceSummary:
+        """Run and keep only the summary statistics."""
+
+        summary = BalanceSummary(dt_s=self.dt_s, capacity_kWh=self.battery.capacity_kWh if self.battery else 0.0)
+        for chunk in self.run(n_steps, **kwargs):
+            summary.update(chunk)
+        if summary.unserved_kWh > 0:
+            summary.notes.append(f"Unserved energy {summary.unserved_kWh:.1f} kWh over {summary.unserved_hours:.1f} h.")
+        return summary
@@ -0,0 +1,82 @@
+"""
+bench_thermal_parallel.py
+--------------------------
+Scaling benchmark for domain-decomposed thermal stepping.
+
+Builds a square panel grid (hull-like mesh), then times implicit steps with
+a single sparse LU and with Schur-complement solves over 2, 4, ... worker
+processes. Reports per-step time, speedup and parallel efficiency
+(speedup / workers) against the single-LU baseline.
+
+Usage:
+    python scripts/bench_thermal_parallel.py --side 600 --steps 50 --workers 1 2 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from thermal.network import ThermalNetwork  # noqa: E402
+from thermal.transient import clear_factorizations  # noqa: E402
+
+
+def build_grid(side: int) -> ThermalNetwork:
+    net = ThermalNetwork()
+    n = side * side
+    idx = net.add_nodes(
+        [f"panel_{i}" for i in range(n)], capacity_kj_per_k=50.0, temperature_c=20.0
+    ).reshape(side, side)
+    net.add_edges(idx[:, :-1].ravel(), idx[:, 1:].ravel(), 0.2)
+    net.add_edges(idx[:-1, :].ravel(), idx[1:, :].ravel(), 0.2)
+    sink = net.add_nodes(["space"], temperature_c=-270.0, fixed=True)
+    net.add_edges(idx[0, :], np.full(side, sink[0]), 0.05)
+    return net
+
+
+def time_steps(net: ThermalNetwork, steps: int, **kwargs) -> tuple[float, float]:
+    stepper = net.transient(dt_s=600.0, **kwargs)
+    t0 = time.perf_counter()
+    _ = stepper.factorization
+    setup = time.perf_counter() - t0
+    T, q = net.temperature_vector(), net.load_vector()
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        T = stepper.step(T, q)
+    per_step = (time.perf_counter() - t0) / steps
+    clear_factorizations(net)
+    return setup, per_step
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--side", type=int, default=400)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    args = parser.parse_args()
+
+    net = build_grid(args.side)
+    print(f"[bench] {net.n_nodes} nodes, {net.n_edges} edges, {os.cpu_count()} CPUs")
+
+    base_setup, base_step = time_steps(net, args.steps)
+    print(f"  single LU      setup {base_setup:7.2f} s  step {base_step * 1e3:8.2f} ms")
+
+    for workers in args.workers:
+        parts = net.partition(workers)
+        setup, step = time_steps(net, args.steps, parts=parts, workers=workers)
+        speedup = base_step / step
+        print(
+            f"  {workers:2d} workers     setup {setup:7.2f} s  step {step * 1e3:8.2f} ms"
+            f"  speedup {speedup:5.2f}x  efficiency {speedup / workers:6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
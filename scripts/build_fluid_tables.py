@@ -0,0 +1,39 @@
+"""
+build_fluid_tables.py
+----------------------
+Pre-build the working-fluid property tables used by thermal.heat_recovery.
+
+Tables are otherwise generated lazily on first use; running this once (e.g.
+in CI or an image build) keeps the first cycle calculation fast.
+
+Usage:
+    python scripts/build_fluid_tables.py [--fluids CO2 NH3] [--cache-dir DIR]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from thermal.fluids import DEFAULT_CACHE_DIR, FLUIDS, get_fluid_tables  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fluids", nargs="+", default=sorted(FLUIDS))
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args()
+
+    for name in args.fluids:
+        t0 = time.perf_counter()
+        tables = get_fluid_tables(name, cache_dir=args.cache_dir, rebuild=True)
+        size = sum(a.nbytes for a in tables.arrays.values()) / 1e6
+        print(f"[fluids] {name:4s} {size:6.1f} MB in {time.perf_counter() - t0:5.2f} s")
+
+
+if __name__ == "__main__":
+    main()
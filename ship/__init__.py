@@ -5,5 +5,8 @@ Package namespace for top-level registry utilities.
 """
 
 from ship.registry import compute
+from ship.manifest import ShipManifest
+from ship.population import Population
+from ship.scenario import Scenario
 
-__all__ = ["compute"]
\ No newline at end of file
+__all__ = ["compute", "ShipManifest", "Population", "Scenario"]
@@ -0,0 +1,275 @@
+"""
+checkpoint.py
+--------------
+Atomic, incremental checkpoints of a running ``Scenario``.
+
+Layout (a directory):
+    blobs/<hash>.npy            one file per distinct array, named by the
+                                BLAKE2b digest of dtype, shape and bytes
+    ckpt-<step>.json            scenario clock, shared values, subsystem
+                                states (arrays replaced by blob references),
+                                output row counts
+    LATEST                      name of the newest complete checkpoint
+
+What is saved
+    • ``ScenarioState``: step, shared values, manifest columns.
+    • Every subsystem's ``get_state()``: population columns and RNG state,
+      battery state of charge, thermal node temperatures, ...
+    • Row counts of the ``OutputWriter`` columns, so a resumed run truncates
+      outputs written after the checkpoint and appends from there.
+
+Writes are atomic (temporary file + ``os.replace``, blobs first, then the
+JSON, then ``LATEST``), so a crash at any point leaves the previous
+checkpoint usable. Arrays that did not change since an earlier checkpoint
+(ids, sexes, manifest geometry, ...) are not written again. Restoring into a
+freshly built scenario and running to the same end step reproduces the
+uninterrupted run exactly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import fields
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Set, Union
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from ship.scenario import OutputWriter, Scenario
+
+FORMAT_VERSION = 1
+LATEST = "LATEST"
+BLOBS = "blobs"
+_BLOB_KEY = "__blob__"
+
+
+def _digest(arr: np.ndarray) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{arr.dtype.str}{arr.shape}".encode())
+    h.update(arr.reshape(-1).view(np.uint8).data)
+    return h.hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes, *, fsync: bool) -> None:
+    tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    with open(tmp, "wb") as handle:
+        handle.write(data)
+        if fsync:
+            handle.flush()
+            os.fsync(handle.fileno())
+    os.replace(tmp, path)
+
+
+class _BlobStore:
+    def __init__(self, root: Path, *, fsync: bool) -> None:
+        self.root = root / BLOBS
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self.written = 0
+
+    def put(self, arr: np.ndarray) -> str:
+        arr = np.ascontiguousarray(arr)
+        key = _digest(arr)
+        path = self.root / f"{key}.npy"
+        if not path.exists():
+            tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+            with open(tmp, "wb") as handle:
+                np.save(handle, arr, allow_pickle=False)
+                if self.fsync:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+            os.replace(tmp, path)
+            self.written += 1
+        return key
+
+    def get(self, key: str) -> np.ndarray:
+        return np.load(self.root / f"{key}.npy", allow_pickle=False)
+
+
+def _pack(obj: Any, store: _BlobStore) -> Any:
+    """JSON-ready copy of ``obj`` with arrays moved into the blob store."""
+
+    if isinstance(obj, np.ndarray):
+        return {_BLOB_KEY: store.put(obj)}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, dict):
+        return {str(k): _pack(v, store) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_pack(v, store) for v in obj]
+    return obj
+
+
+def _unpack(obj: Any, store: _BlobStore) -> Any:
+    if isinstance(obj, dict):
+        if set(obj) == {_BLOB_KEY}:
+            return store.get(obj[_BLOB_KEY])
+        return {k: _unpack(v, store) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_unpack(v, store) for v in obj]
+    return obj
+
+
+def _blob_refs(obj: Any, refs: Set[str]) -> Set[str]:
+    if isinstance(obj, dict):
+        if set(obj) == {_BLOB_KEY}:
+            refs.add(obj[_BLOB_KEY])
+        else:
+            for v in obj.values():
+                _blob_refs(v, refs)
+    elif isinstance(obj, list):
+        for v in obj:
+            _blob_refs(v, refs)
+    return refs
+
+
+def save_checkpoint(
+    scenario: "Scenario",
+    path: Union[str, Path],
+    *,
+    writer: Optional["OutputWriter"] = None,
+    keep: Optional[int] = 2,
+    fsync: bool = True,
+) -> Path:
+    """
+    Snapshot ``scenario`` (and ``writer`` row counts) into directory ``path``;
+    returns the checkpoint file. Older checkpoints beyond ``keep`` and blobs
+    only they referenced are removed.
+    """
+
+    root = Path(path)
+    store = _BlobStore(root, fsync=fsync)
+    state = scenario.state
+    if writer is not None:
+        writer.flush()
+    manifest = None
+    if state.manifest is not None:
+        manifest = {f.name: getattr(state.manifest, f.name) for f in fields(state.manifest)}
+    doc = {
+        "format": FORMAT_VERSION,
+        "step": state.step,
+        "dt_s": state.dt_s,
+        "values": _pack(state.values, store),
+        "manifest": _pack(manifest, store),
+        "subsystems": {sub.name: _pack(sub.get_state(), store) for sub in scenario.subsystems},
+        "outputs": json.loads(json.dumps(writer.columns)) if writer is not None else None,
+    }
+    name = f"ckpt-{state.step:012d}.json"
+    _write_atomic(root / name, json.dumps(doc).encode(), fsync=fsync)
+    _write_atomic(root / LATEST, name.encode(), fsync=fsync)
+    if keep is not None:
+        _prune(root, keep)
+    return root / name
+
+
+def _prune(root: Path, keep: int) -> None:
+    checkpoints = sorted(root.glob("ckpt-*.json"))
+    for old in checkpoints[: max(len(checkpoints) - max(keep, 1), 0)]:
+        old.unlink()
+    live: Set[str] = set()
+    for ckpt in root.glob("ckpt-*.json"):
+        _blob_refs(json.loads(ckpt.read_text()), live)
+    for blob in (root / BLOBS).glob("*.npy"):
+        if blob.stem not in live:
+            blob.unlink()
+
+
+def latest_checkpoint(path: Union[str, Path]) -> Optional[Path]:
+    """The newest complete checkpoint in ``path``, or None."""
+
+    pointer = Path(path) / LATEST
+    if not pointer.exists():
+        return None
+    return Path(path) / pointer.read_text().strip()
+
+
+def restore_checkpoint(
+    scenario: "Scenario",
+    checkpoint: Union[str, Path],
+    *,
+    out: Union[None, str, Path, "OutputWriter"] = None,
+) -> int:
+    """
+    Load a checkpoint (file, or directory → latest) into ``scenario``, which
+    must be built the same way as the one saved. With ``out`` the output
+    index is rolled back to the checkpoint's row counts. Returns the step.
+    """
+
+    from ship.manifest import ShipManifest
+    from ship.scenario import OutputWriter
+
+    checkpoint = Path(checkpoint)
+    if checkpoint.is_dir():
+        found = latest_checkpoint(checkpoint)
+        if found is None:
+            raise FileNotFoundError(f"No checkpoint in {checkpoint}.")
+        checkpoint = found
+    doc = json.loads(checkpoint.read_text())
+    if doc.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint format {doc.get('format')!r}.")
+    if abs(float(doc["dt_s"]) - scenario.state.dt_s) > 1e-9:
+        raise ValueError(f"Checkpoint dt_s {doc['dt_s']} != scenario dt_s {scenario.state.dt_s}.")
+    store = _BlobStore(checkpoint.parent, fsync=False)
+
+    scenario._bind()
+    names = {sub.name for sub in scenario.subsystems}
+    missing = names ^ set(doc["subsystems"])
+    if missing:
+        raise ValueError(f"Checkpoint subsystems do not match the scenario: {sorted(missing)}")
+    for sub in scenario.subsystems:
+        sub.set_state(_unpack(doc["subsystems"][sub.name], store))
+
+    state = scenario.state
+    state.step = int(doc["step"])
+    state.values = _unpack(doc["values"], store)
+    manifest = _unpack(doc["manifest"], store)
+    state.manifest = ShipManifest(**manifest) if manifest is not None else None
+
+    if out is not None:
+        if doc["outputs"] is None:
+            raise ValueError("Checkpoint was saved without an output writer.")
+        writer = out if isinstance(out, OutputWriter) else OutputWriter(out)
+        writer.close()
+        writer.columns = doc["outputs"]
+        writer.flush()
+    return state.step
+
+
+class Checkpointer:
+    """
+    Periodic checkpoints for ``Scenario.run(checkpoint=...)``.
+
+    Example:
+        ckpt = Checkpointer("runs/century/ckpt", every_steps=30 * 24)
+        if latest_checkpoint(ckpt.path):
+            restore_checkpoint(scenario, ckpt.path, out="runs/century")
+        scenario.simulate(end_step - scenario.state.step, out="runs/century", checkpoint=ckpt)
+    """
+
+    def __init__(
+        self, path: Union[str, Path], *, every_steps: int, keep: Optional[int] = 2, fsync: bool = True
+    ) -> None:
+        if every_steps <= 0:
+            raise ValueError("every_steps must be positive.")
+        self.path = Path(path)
+        self.every_steps = int(every_steps)
+        self.keep = keep
+        self.fsync = fsync
+        self._mark = 0
+
+    def reset(self, step: int) -> None:
+        """Count the interval from ``step`` (called at the start of each run)."""
+
+        self._mark = int(step)
+
+    def maybe_save(self, scenario: "Scenario", writer: Optional["OutputWriter"] = None) -> Optional[Path]:
+        """Save at the first block boundary past each multiple of ``every_steps``."""
+
+        step = scenario.state.step
+        if step // self.every_steps <= self._mark // self.every_steps:
+            return None
+        self._mark = step
+        return save_checkpoint(scenario, self.path, writer=writer, keep=self.keep, fsync=self.fsync)
@@ -0,0 +1,82 @@
+"""
+manifest.py
+------------
+Columnar ship manifest: one row per room instance, one NumPy array per field.
+
+Subsystem builders (thermal network, power roll-ups) consume these columns
+directly instead of walking thousands of RoomReport objects.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Iterable
+
+import numpy as np
+
+from env.rooms.base import RoomReport
+
+
+@dataclass
+class ShipManifest:
+    """Column store of computed room geometry (SI units)."""
+
+    type_id: np.ndarray  # str
+    name: np.ndarray  # str
+    phase: np.ndarray  # str
+    floor_area_m2: np.ndarray
+    height_m: np.ndarray
+    volume_m3: np.ndarray
+    occupants: np.ndarray
+
+    def __post_init__(self) -> None:
+        lengths = {f.name: len(getattr(self, f.name)) for f in fields(self)}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"Manifest columns have mismatched lengths: {lengths}")
+
+    def __len__(self) -> int:
+        return len(self.type_id)
+
+    @classmethod
+    def from_reports(cls, reports: Iterable[RoomReport]) -> "ShipManifest":
+        """Collect geometry columns from computed RoomReports."""
+
+        rows = list(reports)
+        area = np.array([r.geometry.get("floor_area_m2", 0.0) for r in rows], dtype=float)
+        height = np.array([r.geometry.get("height_m", 0.0) for r in rows], dtype=float)
+        volume = np.array(
+            [r.geometry.get("volume_m3", np.nan) for r in rows], dtype=float
+        )
+        missing = np.isnan(volume)
+        volume[missing] = area[missing] * height[missing]
+        occupants = np.array([r.metadata.get("occupants", 0) for r in rows], dtype=float)
+
+        return cls(
+            type_id=np.array([r.type_id for r in rows], dtype=str),
+            name=np.array([r.name for r in rows], dtype=str),
+            phase=np.array([r.metadata.get("phase", "") for r in rows], dtype=str),
+            floor_area_m2=area,
+            height_m=height,
+            volume_m3=volume,
+            occupants=occupants,
+        )
+
+    @classmethod
+    def from_columns(
+        cls, *, type_id, floor_area_m2, height_m, name=None, phase=None, occupants=0.0
+    ) -> "ShipManifest":
+        """Build a manifest straight from arrays (e.g. generated layouts)."""
+
+        area = np.asarray(floor_area_m2, dtype=float)
+        n = area.size
+        type_col = np.broadcast_to(np.asarray(type_id, dtype=str), (n,)).copy()
+        height = np.broadcast_to(np.asarray(height_m, dtype=float), (n,)).copy()
+        return cls(
+            type_id=type_col,
+            name=type_col.copy() if name is None else np.asarray(name, dtype=str),
+            phase=np.full(n, "", dtype=str) if phase is None else np.broadcast_to(np.asarray(phase, dtype=str), (n,)).copy(),
+            floor_area_m2=area,
+            height_m=height,
+            volume_m3=area * height,
+            occupants=np.broadcast_to(np.asarray(occupants, dtype=float), (n,)).copy(),
+        )
@@ -0,0 +1,384 @@
+"""
+rates.py
+---------
+Ship-level totals compiled from the spec files into array kernels.
+
+Every numeric leaf of hvac_design.yaml, power_design.yaml and materials.yaml
+becomes one entry of a parameter vector, named by its dotted path
+(``hvac.rooms.dorm.ventilation.Rp_Lps_per_person``). ``compile_rates``
+resolves, once, which leaf each room calculator would read (room override →
+defaults → built-in constant, as ``resolve_room_activity`` does) and folds the
+manifest into per-room-type sums. ``RateModel.evaluate`` then maps a
+(batch, n_params) matrix of parameter vectors to ship totals with a handful
+of gathers and products — no YAML parsing or per-room Python per sample.
+
+Terms (each reads only the parameters it lists)
+    • ``room:<type_id>`` — ventilation (Rp·occupants + Ra·area), exhaust
+      (largest area-based driver × area), sensible and latent gains, for the
+      ``HVAC_OUTPUTS`` the type's calculator reports.
+    • ``power`` — generation and sink demand (fixed + per-m² + per-person;
+      served area and housed occupants from the manifest as in
+      ``power.bus.served_totals``, or the sinks' estimates without one).
+    • ``envelope`` — mass and heat capacity of the structural envelope of
+      every room (as in thermal.builder, wall thickness ``wall_thickness_m``).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from data.loader import load_hvac_design, load_materials, load_power_design
+from env.hvac.constants import DEFAULT_ACTIVITY_LEVELS, DEFAULT_VENTILATION, EXHAUST_AREA_KEYS
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from ship.manifest import ShipManifest
+
+SKIP_KEYS = ("version", "notes")
+OUTPUTS: Tuple[str, ...] = (
+    "ventilation_Lps",
+    "exhaust_Lps",
+    "sensible_load_kW",
+    "latent_load_kW",
+    "generation_kW",
+    "demand_kW",
+    "balance_kW",
+    "envelope_mass_kg",
+    "envelope_capacity_MJ_per_K",
+)
+
+
+def flatten_numeric(doc: Mapping[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Dotted path → value for every numeric leaf (booleans and notes skipped)."""
+
+    out: Dict[str, float] = {}
+    for key, value in (doc or {}).items():
+        if key in SKIP_KEYS:
+            continue
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, Mapping):
+            out.update(flatten_numeric(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            out[path] = float(value)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Terms
+# ---------------------------------------------------------------------------
+@dataclass
+class _Term:
+    name: str
+    params: np.ndarray  # parameter indices read by ``evaluate``
+
+    def evaluate(self, V: np.ndarray) -> Dict[str, np.ndarray]:
+        raise NotImplementedError
+
+
+@dataclass
+class _RoomTerm(_Term):
+    outputs: Tuple[str, ...]
+    occupants: float
+    area_m2: float
+    rp: int
+    ra: int
+    sensible: int
+    latent: int
+    exhaust: np.ndarray
+
+    def evaluate(self, V: np.ndarray) -> Dict[str, np.ndarray]:
+        out: Dict[str, np.ndarray] = {}
+        if "ventilation_Lps" in self.outputs:
+            out["ventilation_Lps"] = V[:, self.rp] * self.occupants + V[:, self.ra] * self.area_m2
+        if "exhaust_Lps" in self.outputs and self.exhaust.size:
+            out["exhaust_Lps"] = np.maximum(V[:, self.exhaust].max(axis=1), 0.0) * self.area_m2
+        if "sensible_load_kW" in self.outputs:
+            out["sensible_load_kW"] = V[:, self.sensible] * self.occupants / 1000.0
+        if "latent_load_kW" in self.outputs:
+            out["latent_load_kW"] = V[:, self.latent] * self.occupants / 1000.0
+        return out
+
+
+@dataclass
+class _PowerTerm(_Term):
+    generation: np.ndarray
+    fixed: np.ndarray
+    per_m2: np.ndarray
+    per_person: np.ndarray
+    area_m2: np.ndarray  # served area per sink (manifest) ...
+    occupants: np.ndarray
+    area_param: Optional[np.ndarray] = None  # ... or the sinks' estimate parameters
+    occupants_param: Optional[np.ndarray] = None
+
+    def evaluate(self, V: np.ndarray) -> Dict[str, np.ndarray]:
+        area = V[:, self.area_param] if self.area_param is not None else self.area_m2
+        occupants = V[:, self.occupants_param] if self.occupants_param is not None else self.occupants
+        demand = (
+            V[:, self.fixed].sum(axis=1)
+            + (V[:, self.per_m2] * area).sum(axis=1)
+            + (V[:, self.per_person] * occupants).sum(axis=1)
+        )
+        return {"generation_kW": V[:, self.generation].sum(axis=1), "demand_kW": demand}
+
+
+@dataclass
+class _EnvelopeTerm(_Term):
+    density: int
+    specific_heat: int
+    volume_m3: float
+
+    def evaluate(self, V: np.ndarray) -> Dict[str, np.ndarray]:
+        mass = V[:, self.density] * self.volume_m3
+        return {"envelope_mass_kg": mass, "envelope_capacity_MJ_per_K": mass * V[:, self.specific_heat] / 1e6}
+
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+@dataclass
+class RateModel:
+    """
+    Compiled spec parameters and ship-total terms.
+
+    Example:
+        model = compile_rates(manifest)
+        V = model.batch(1000)                       # copies of the base vector
+        V[:, model.index_of("hvac.rooms.dorm.ventilation.Rp_Lps_per_person")] *= 1.1
+        totals = model.evaluate(V)                  # {output: (1000,) array}
+    """
+
+    names: Tuple[str, ...]
+    base: np.ndarray
+    terms: List[_Term]
+    index: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def index_of(self, name: str) -> int:
+        try:
+            return self.index[name]
+        except KeyError:
+            raise KeyError(f"Unknown spec parameter '{name}'.") from None
+
+    def vector(self, overrides: Optional[Mapping[str, float]] = None) -> np.ndarray:
+        """Base parameter vector with ``{path: value}`` overrides applied."""
+
+        v = self.base.copy()
+        for name, value in (overrides or {}).items():
+            v[self.index_of(name)] = float(value)
+        return v
+
+    def batch(self, n: int) -> np.ndarray:
+        return np.tile(self.base, (int(n), 1))
+
+    def used(self) -> np.ndarray:
+        """Indices of parameters that any term reads."""
+
+        return np.unique(np.concatenate([t.params for t in self.terms])) if self.terms else np.empty(0, np.int64)
+
+    def contributions(self, values=None, *, terms: Optional[Sequence[int]] = None) -> List[Dict[str, np.ndarray]]:
+        """Per-term outputs (in ``self.terms`` order, or only ``terms``)."""
+
+        V = np.atleast_2d(np.asarray(self.base if values is None else values))
+        if not np.iscomplexobj(V):
+            V = V.astype(float)  # complex inputs pass through for complex-step derivatives
+        picked = range(len(self.terms)) if terms is None else terms
+        return [self.terms[i].evaluate(V) for i in picked]
+
+    def evaluate(self, values=None) -> Dict[str, np.ndarray]:
+        """Ship totals for one parameter vector or a (batch, n_params) matrix."""
+
+        V = np.asarray(self.base if values is None else values)
+        batch = V.shape[:-1]
+        return {k: v.reshape(batch) for k, v in self.combine(self.contributions(V.reshape(-1, V.shape[-1]))).items()}
+
+    @staticmethod
+    def combine(parts: Sequence[Mapping[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """Sum term outputs into ship totals (plus ``balance_kW``)."""
+
+        n = next((v.shape[0] for p in parts for v in p.values()), 1)
+        totals = {name: np.zeros(n) for name in OUTPUTS}
+        for part in parts:
+            for name, value in part.items():
+                totals[name] = totals[name] + value
+        totals["balance_kW"] = totals["generation_kW"] - totals["demand_kW"]
+        return totals
+
+
+class _Params:
+    """Growing name → index registry seeded with the spec leaves."""
+
+    def __init__(self, leaves: Mapping[str, float]) -> None:
+        self.names: List[str] = list(leaves)
+        self.values: List[float] = list(leaves.values())
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+    def get(self, path: str) -> Optional[int]:
+        return self.index.get(path)
+
+    def first(self, paths: Sequence[str], default: float) -> int:
+        """Index of the first existing path, else register the last with ``default``."""
+
+        for path in paths:
+            if path in self.index:
+                return self.index[path]
+        path = paths[-1]
+        self.index[path] = len(self.names)
+        self.names.append(path)
+        self.values.append(float(default))
+        return self.index[path]
+
+
+def default_manifest() -> "ShipManifest":
+    """One room per registered type at its calculator defaults."""
+
+    from ship.manifest import ShipManifest
+    from ship.registry import REGISTRY
+
+    specs = [(type_id, calc.defaults()) for type_id, calc in sorted(REGISTRY.items())]
+    return ShipManifest.from_columns(
+        type_id=[t for t, _ in specs],
+        name=[s.name for _, s in specs],
+        phase=[s.phase for _, s in specs],
+        floor_area_m2=[s.floor_area_m2 for _, s in specs],
+        height_m=[s.height_m for _, s in specs],
+        occupants=[s.occupants for _, s in specs],
+    )
+
+
+def compile_rates(
+    manifest: Optional["ShipManifest"] = None,
+    *,
+    hvac: Optional[Mapping[str, Any]] = None,
+    power: Optional[Mapping[str, Any]] = None,
+    materials: Optional[Mapping[str, Any]] = None,
+    wall_thickness_m: float = 0.05,
+    use_manifest_for_power: bool = True,
+) -> RateModel:
+    """
+    Compile the spec documents (default: canonical files) against
+    ``manifest`` (default: one room per registered type).
+    """
+
+    from power.bus import served_totals
+    from ship.registry import REGISTRY
+
+    hvac = hvac if hvac is not None else load_hvac_design()
+    power = power if power is not None else load_power_design()
+    materials = materials if materials is not None else load_materials()
+    manifest = manifest if manifest is not None else default_manifest()
+
+    params = _Params(
+        {**flatten_numeric(hvac, "hvac"), **flatten_numeric(power, "power"), **flatten_numeric(materials, "materials")}
+    )
+    terms: List[_Term] = []
+
+    # --- rooms -------------------------------------------------------------
+    type_ids = np.asarray(manifest.type_id)
+    occupants = np.asarray(manifest.occupants, dtype=float)
+    area = np.asarray(manifest.floor_area_m2, dtype=float)
+    rooms = hvac.get("rooms", {}) or {}
+    defaults = hvac.get("defaults", {}) or {}
+    for type_id in np.unique(type_ids).tolist():
+        calc = REGISTRY.get(type_id)
+        if calc is None or not calc.HVAC_OUTPUTS:
+            continue
+        room = calc.HVAC_ROOM
+        if room not in rooms:
+            raise KeyError(f"Room type '{room}' is not defined in hvac_design.yaml.")
+        activity = calc.ACTIVITY or next(
+            iter(rooms[room].get("activity_map") or defaults.get("activity_levels") or DEFAULT_ACTIVITY_LEVELS)
+        )
+        levels = DEFAULT_ACTIVITY_LEVELS.get(activity, {})
+
+        def leaf(section: str, key: str, default_section: str, fallback: float) -> int:
+            return params.first(
+                [f"hvac.rooms.{room}.{section}.{key}", f"hvac.defaults.{default_section}.{key}"], fallback
+            )
+
+        rp = leaf("ventilation", "Rp_Lps_per_person", "ventilation", DEFAULT_VENTILATION["Rp_Lps_per_person"])
+        ra = leaf("ventilation", "Ra_Lps_per_m2", "ventilation", DEFAULT_VENTILATION["Ra_Lps_per_m2"])
+        sensible = leaf(
+            f"activity_map.{activity}", "sensible_W_per_person", f"activity_levels.{activity}",
+            levels.get("sensible_W_per_person", 0.0),
+        )
+        latent = leaf(
+            f"activity_map.{activity}", "latent_W_per_person", f"activity_levels.{activity}",
+            levels.get("latent_W_per_person", 0.0),
+        )
+        exhaust = np.array(
+            [i for i in (params.get(f"hvac.rooms.{room}.exhaust.{k}") for k in EXHAUST_AREA_KEYS) if i is not None],
+            dtype=np.int64,
+        )
+        rows = type_ids == type_id
+        outputs = tuple(calc.HVAC_OUTPUTS)
+        read = [rp, ra] if "ventilation_Lps" in outputs else []
+        read += [sensible] if "sensible_load_kW" in outputs else []
+        read += [latent] if "latent_load_kW" in outputs else []
+        read += exhaust.tolist() if "exhaust_Lps" in outputs else []
+        terms.append(
+            _RoomTerm(
+                name=f"room:{type_id}",
+                params=np.unique(np.array(read, dtype=np.int64)),
+                outputs=outputs,
+                occupants=float(occupants[rows].sum()),
+                area_m2=float(area[rows].sum()),
+                rp=rp,
+                ra=ra,
+                sensible=sensible,
+                latent=latent,
+                exhaust=exhaust,
+            )
+        )
+
+    # --- power -------------------------------------------------------------
+    sinks = power.get("sinks", {}) or {}
+
+    def column(section: str, names: Sequence[str], key: str) -> np.ndarray:
+        return np.array([params.first([f"power.{section}.{n}.{key}"], 0.0) for n in names], dtype=np.int64)
+
+    sink_names = list(sinks)
+    generation = column("sources", list(power.get("sources", {}) or {}), "generation_kW")
+    fixed = column("sinks", sink_names, "consumption_kW")
+    per_m2 = column("sinks", sink_names, "consumption_kW_per_m2")
+    per_person = column("sinks", sink_names, "consumption_kW_per_person")
+    read = [generation, fixed, per_m2, per_person]
+    if use_manifest_for_power and len(manifest) and sinks:
+        served_area, housed = served_totals(sinks, manifest)
+        power_term = _PowerTerm(
+            "power", np.empty(0, np.int64), generation, fixed, per_m2, per_person,
+            area_m2=served_area, occupants=housed,
+        )
+    else:
+        area_param = column("sinks", sink_names, "area_m2_estimate")
+        occupants_param = column("sinks", sink_names, "occupants_estimate")
+        read += [area_param, occupants_param]
+        power_term = _PowerTerm(
+            "power", np.empty(0, np.int64), generation, fixed, per_m2, per_person,
+            area_m2=np.zeros(len(sink_names)), occupants=np.zeros(len(sink_names)),
+            area_param=area_param, occupants_param=occupants_param,
+        )
+    power_term.params = np.unique(np.concatenate(read))
+    terms.append(power_term)
+
+    # --- envelope ----------------------------------------------------------
+    structural = ((materials.get("categories") or {}).get("structural") or {}).get("default_material")
+    if structural is not None:
+        height = np.asarray(manifest.height_m, dtype=float)
+        envelope_m2 = 4.0 * np.sqrt(area) * height + 2.0 * area
+        density = params.first([f"materials.materials.{structural}.density_kg_per_m3"], 0.0)
+        cp = params.first([f"materials.materials.{structural}.specific_heat_J_per_kgK"], 0.0)
+        terms.append(
+            _EnvelopeTerm(
+                "envelope", np.array(sorted({density, cp}), dtype=np.int64), density, cp,
+                float((envelope_m2 * wall_thickness_m).sum()),
+            )
+        )
+
+    return RateModel(names=tuple(params.names), base=np.array(params.values, dtype=float), terms=terms)
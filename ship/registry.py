@@ -59,4 +59,7 @@ def compute(type_id: str, **overrides) -> RoomReport:
             setattr(spec, key, value)
         # else: silently ignore; see TODO above
 
-    return calc_cls.compute(spec)
+    report = calc_cls.compute(spec)
+    # Occupancy drives per-person power and HVAC roll-ups downstream.
+    report.metadata.setdefault("occupants", spec.occupants)
+    return report
@@ -0,0 +1,493 @@
+"""
+scenario.py
+------------
+Time-stepped scenario engine: advances population, power and thermal state
+over multi-decade voyages and streams outputs to disk.
+
+Model
+    • A base step ``dt_s`` (default one hour). The engine advances in blocks
+      of up to ``block_steps`` steps; each subsystem advances the whole block
+      with one call to its vectorized kernel (PowerTimeSeries chunks,
+      ImplicitStepper runs, Population column updates).
+    • Subsystems run in list order and exchange data through the shared
+      ``ScenarioState`` (manifest, headcount, SOC, ...): later subsystems see
+      this block's updates, earlier ones see them from the next block.
+    • Blocks end early at subsystem events (``next_event``), e.g. the daily
+      population tick, so coupled state changes land on step boundaries and
+      block length adapts to the slowest-changing coupling.
+
+Plug-ins are ``Subsystem`` subclasses or plain functions
+``fn(state, start_step, n_steps) -> {name: array}``. Outputs are appended to
+one raw column file per key (see ``OutputWriter``) and reopened with
+``load_outputs`` as memory maps, so century-long hourly runs never hold their
+history in memory.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from power.timeseries import PowerTimeSeries
+    from ship.manifest import ShipManifest
+    from ship.population import Population
+    from thermal.transient import ImplicitStepper
+
+HOUR_S = 3600.0
+DAY_S = 86_400.0
+INDEX = "outputs.json"
+
+StepFunction = Callable[["ScenarioState", int, int], Optional[Mapping[str, np.ndarray]]]
+
+
+@dataclass
+class ScenarioState:
+    """Shared state at the current block boundary."""
+
+    dt_s: float
+    step: int = 0
+    manifest: Optional["ShipManifest"] = None
+    values: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def time_s(self) -> float:
+        return self.step * self.dt_s
+
+
+@dataclass
+class ScenarioBlock:
+    """Outputs of one block, keyed ``"<subsystem>.<output>"``."""
+
+    start_step: int
+    n_steps: int
+    outputs: Dict[str, np.ndarray]
+
+
+def _steps(every_s: float, dt_s: float, what: str) -> int:
+    ratio = every_s / dt_s
+    steps = int(round(ratio))
+    if steps < 1 or abs(ratio - steps) > 1e-9:
+        raise ValueError(f"{what} ({every_s} s) must be a whole multiple of dt_s ({dt_s} s).")
+    return steps
+
+
+class Subsystem:
+    """
+    Base class for pluggable subsystems.
+
+    ``advance`` moves the subsystem over ``n_steps`` base steps starting at
+    ``start_step`` and returns per-block outputs (first axis = records).
+    """
+
+    name = "subsystem"
+
+    def bind(self, state: ScenarioState) -> None:
+        """Called once before the first block (validate ``dt_s``, seed state)."""
+
+    def next_event(self, state: ScenarioState) -> Optional[int]:
+        """Steps until this subsystem needs a block boundary (None: any)."""
+
+        return None
+
+    def advance(self, state: ScenarioState, start_step: int, n_steps: int) -> Optional[Mapping[str, np.ndarray]]:
+        raise NotImplementedError
+
+    def get_state(self) -> Dict[str, Any]:
+        """Everything ``set_state`` needs to continue bit-for-bit (see ship.checkpoint)."""
+
+        return {}
+
+    def set_state(self, saved: Mapping[str, Any]) -> None:
+        """Restore what ``get_state`` returned."""
+
+
+class FunctionSubsystem(Subsystem):
+    """Wrap ``fn(state, start_step, n_steps) -> outputs`` as a subsystem."""
+
+    def __init__(self, name: str, fn: StepFunction) -> None:
+        self.name = name
+        self.fn = fn
+
+    def advance(self, state: ScenarioState, start_step: int, n_steps: int):
+        return self.fn(state, start_step, n_steps)
+
+
+class PopulationSubsystem(Subsystem):
+    """
+    Steps a ``Population`` every ``every_s`` (default daily). Publishes
+    ``headcount``/``census`` and, if the population is housed, a manifest
+    with current room occupants.
+    """
+
+    name = "population"
+
+    def __init__(self, population: "Population", *, every_s: float = DAY_S) -> None:
+        self.population = population
+        self.every_s = float(every_s)
+        self.every_steps = 1
+
+    def bind(self, state: ScenarioState) -> None:
+        if self.every_s < DAY_S or abs(self.every_s / DAY_S - round(self.every_s / DAY_S)) > 1e-9:
+            raise ValueError("Population steps must be whole days.")
+        self.every_steps = _steps(self.every_s, state.dt_s, "Population step")
+        self._publish(state)
+
+    def _publish(self, state: ScenarioState) -> None:
+        pop = self.population
+        state.values["headcount"] = len(pop)
+        state.values["census"] = pop.census()
+        if pop.manifest is not None:
+            state.manifest = pop.to_manifest()
+
+    def next_event(self, state: ScenarioState) -> int:
+        return self.every_steps - state.step % self.every_steps
+
+    def advance(self, state: ScenarioState, start_step: int, n_steps: int):
+        end = start_step + n_steps
+        ticks = end // self.every_steps - start_step // self.every_steps
+        if ticks <= 0:
+            return None
+        days = int(round(self.every_s / DAY_S))
+        events = [self.population.step(days) for _ in range(ticks)]
+        self._publish(state)
+        census = state.values["census"]
+        out: Dict[str, np.ndarray] = {
+            "time_s": np.array([end * state.dt_s]),
+            "headcount": np.array([len(self.population)]),
+            "births": np.array([sum(e.births for e in events)]),
+            "deaths": np.array([sum(e.deaths for e in events)]),
+            "unhoused": np.array([events[-1].unhoused]),
+        }
+        out.update({phase: np.array([n]) for phase, n in census.items()})
+        return out
+
+    def get_state(self) -> Dict[str, Any]:
+        return self.population.get_state()
+
+    def set_state(self, saved: Mapping[str, Any]) -> None:
+        self.population.set_state(saved)
+
+
+class PowerSubsystem(Subsystem):
+    """
+    Streams a ``PowerTimeSeries``. When the shared manifest changes, constant
+    sink demands are re-resolved from ``cfg`` (per-m² / per-person terms);
+    callable sink profiles are left alone.
+    """
+
+    name = "power"
+
+    def __init__(self, sim: "PowerTimeSeries", cfg: Optional[Dict[str, Any]] = None) -> None:
+        self.sim = sim
+        self.cfg = cfg
+        self._manifest = None
+
+    def bind(self, state: ScenarioState) -> None:
+        if abs(self.sim.dt_s - state.dt_s) > 1e-9:
+            raise ValueError(f"PowerTimeSeries dt_s {self.sim.dt_s} != scenario dt_s {state.dt_s}.")
+
+    def advance(self, state: ScenarioState, start_step: int, n_steps: int):
+        from power.bus import resolve_sink_consumption
+
+        if self.cfg is not None and state.manifest is not None and state.manifest is not self._manifest:
+            demand = resolve_sink_consumption(self.cfg, state.manifest)
+            for sink, kW in demand.items():
+                if not callable(self.sim.sinks.get(sink)):
+                    self.sim.sinks[sink] = kW
+            self._manifest = state.manifest
+        chunk = next(self.sim.run(n_steps, chunk_steps=n_steps, start_step=start_step))
+        state.values["soc_kWh"] = self.sim.soc_kWh
+        return {
+            "time_s": chunk.times_s,
+            "generation_kW": chunk.generation_kW,
+            "demand_kW": chunk.demand_kW,
+            "battery_kW": chunk.battery_kW,
+            "soc_kWh": chunk.soc_kWh,
+            "backup_kW": chunk.backup_kW,
+            "unserved_kW": chunk.unserved_kW,
+            "spilled_kW": chunk.spilled_kW,
+        }
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"soc_kWh": self.sim.soc_kWh}
+
+    def set_state(self, saved: Mapping[str, Any]) -> None:
+        self.sim.soc_kWh = float(saved["soc_kWh"])
+        self._manifest = None  # re-resolve sinks from the restored manifest
+
+
+class ThermalSubsystem(Subsystem):
+    """
+    Steps an ``ImplicitStepper`` and reports mean / max temperature of
+    ``summary_nodes`` (default: every free node); ``record`` adds full
+    temperature rows for selected node IDs.
+
+    Heat loads come from ``loads(t_s)``, or from ``occupancy``
+    (``OccupancyModel.room_loads_kW``) rebuilt whenever the shared manifest
+    changes; otherwise the nodes' static loads apply.
+    """
+
+    name = "thermal"
+
+    def __init__(
+        self,
+        stepper: "ImplicitStepper",
+        *,
+        loads: Optional[Callable[[float], np.ndarray]] = None,
+        occupancy=None,
+        summary_nodes: Optional[Sequence[str]] = None,
+        record: Optional[Sequence[str]] = None,
+    ) -> None:
+        self.stepper = stepper
+        self.loads = loads
+        self.occupancy = occupancy
+        self.record = list(record or [])
+        net = stepper.network
+        ids = net.node_ids()
+        if summary_nodes is None:
+            free = np.flatnonzero(~net.fixed_mask())
+            summary_nodes = [ids[i] for i in free]
+        self.summary_nodes = list(summary_nodes)
+        self._n_summary = len(self.summary_nodes)
+        self._manifest = None
+
+    def bind(self, state: ScenarioState) -> None:
+        if abs(self.stepper.dt_s - state.dt_s) > 1e-9:
+            raise ValueError(f"ImplicitStepper dt_s {self.stepper.dt_s} != scenario dt_s {state.dt_s}.")
+
+    def advance(self, state: ScenarioState, start_step: int, n_steps: int):
+        if self.occupancy is not None and state.manifest is not None and state.manifest is not self._manifest:
+            self.loads = self.occupancy.room_loads_kW(state.manifest, n_nodes=self.stepper.network.n_nodes)
+            self._manifest = state.manifest
+        self.stepper.time_s = start_step * state.dt_s
+        chunk = next(
+            self.stepper.run(
+                n_steps, chunk_steps=n_steps, record=self.summary_nodes + self.record, loads=self.loads
+            )
+        )
+        summary = chunk.temperatures_c[:, : self._n_summary]
+        out = {"time_s": chunk.times_s, "mean_c": summary.mean(axis=1), "max_c": summary.max(axis=1)}
+        if self.record:
+            out["temperature_c"] = chunk.temperatures_c[:, self._n_summary :]
+        return out
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"temperature_c": self.stepper.network.temperature_vector()}
+
+    def set_state(self, saved: Mapping[str, Any]) -> None:
+        self.stepper.network.set_temperatures(saved["temperature_c"])
+        self._manifest = None
+
+
+class OutputWriter:
+    """
+    Append-only column files: ``<key>.bin`` (raw rows) plus an
+    ``outputs.json`` index of dtype, row shape and committed row count.
+
+    The index is replaced atomically on ``flush``; bytes past the indexed
+    row count (an interrupted run) are ignored by ``load_outputs``.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.columns: Dict[str, Dict[str, Any]] = {}
+        self._files: Dict[str, Any] = {}
+        index = self.path / INDEX
+        if index.exists():
+            self.columns = json.loads(index.read_text())["columns"]
+
+    def append(self, key: str, values) -> None:
+        arr = np.ascontiguousarray(values)
+        if arr.ndim == 0:
+            arr = arr.reshape(1)
+        meta = self.columns.get(key)
+        if meta is None:
+            meta = self.columns[key] = {"dtype": arr.dtype.str, "shape": list(arr.shape[1:]), "rows": 0}
+        elif list(arr.shape[1:]) != meta["shape"]:
+            raise ValueError(f"Output '{key}' changed row shape {meta['shape']} -> {list(arr.shape[1:])}.")
+        handle = self._files.get(key)
+        if handle is None:
+            handle = self._files[key] = open(self.path / f"{key}.bin", "ab")
+            row_bytes = np.dtype(meta["dtype"]).itemsize * int(np.prod(meta["shape"], dtype=np.int64))
+            handle.truncate(meta["rows"] * row_bytes)  # drop rows written after the last flush
+            handle.seek(0, os.SEEK_END)
+        handle.write(arr.astype(meta["dtype"], copy=False).tobytes())
+        meta["rows"] += arr.shape[0]
+
+    def flush(self) -> None:
+        for handle in self._files.values():
+            handle.flush()
+        tmp = self.path / f"{INDEX}.tmp-{os.getpid()}"
+        tmp.write_text(json.dumps({"columns": self.columns}, indent=2))
+        os.replace(tmp, self.path / INDEX)
+
+    def close(self) -> None:
+        self.flush()
+        for handle in self._files.values():
+            handle.close()
+        self._files.clear()
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_outputs(path: Union[str, Path]) -> Dict[str, np.ndarray]:
+    """Open every column written by ``OutputWriter`` as a read-only memory map."""
+
+    path = Path(path)
+    columns = json.loads((path / INDEX).read_text())["columns"]
+    out: Dict[str, np.ndarray] = {}
+    for key, meta in columns.items():
+        shape = (meta["rows"], *meta["shape"])
+        if meta["rows"] == 0:
+            out[key] = np.empty(shape, dtype=meta["dtype"])
+        else:
+            out[key] = np.memmap(path / f"{key}.bin", dtype=meta["dtype"], mode="r", shape=shape)
+    return out
+
+
+class Scenario:
+    """
+    Block-stepped simulation over a list of subsystems.
+
+    Example:
+        scenario = Scenario.from_design(manifest, dt_s=3600, seed=7)
+        state = scenario.simulate(100 * 8766, out="runs/century")
+        power = load_outputs("runs/century")["power.unserved_kW"]
+    """
+
+    def __init__(
+        self,
+        subsystems: Sequence[Union[Subsystem, StepFunction]],
+        *,
+        dt_s: float = HOUR_S,
+        block_steps: int = 7 * 24,
+        manifest: Optional["ShipManifest"] = None,
+    ) -> None:
+        if dt_s <= 0:
+            raise ValueError("dt_s must be positive.")
+        if block_steps <= 0:
+            raise ValueError("block_steps must be positive.")
+        self.subsystems: List[Subsystem] = [
+            s if isinstance(s, Subsystem) else FunctionSubsystem(getattr(s, "__name__", f"fn{i}"), s)
+            for i, s in enumerate(subsystems)
+        ]
+        names = [s.name for s in self.subsystems]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Subsystem names must be unique: {names}")
+        self.block_steps = int(block_steps)
+        self.state = ScenarioState(dt_s=float(dt_s), manifest=manifest)
+        self._bound = False
+
+    @classmethod
+    def from_design(
+        cls,
+        manifest: "ShipManifest",
+        *,
+        dt_s: float = HOUR_S,
+        seed=None,
+        scale: float = 1.0,
+        thermal: bool = True,
+        boundary_temperature_c: float = 20.0,
+        **kwargs: Any,
+    ) -> "Scenario":
+        """
+        Population housed in ``manifest``, power from power_design.yaml with
+        occupant-driven sinks, and (optionally) the room thermal network with
+        occupancy heat loads against a fixed ``boundary_temperature_c``.
+        """
+
+        from data.loader import load_power_design
+        from env.occupancy import OccupancyModel
+        from power.timeseries import PowerTimeSeries
+        from ship.population import Population
+        from thermal.builder import build_room_network
+
+        population = Population.from_crew(manifest=manifest, scale=scale, seed=seed)
+        cfg = load_power_design()
+        subsystems: List[Subsystem] = [
+            PopulationSubsystem(population),
+            PowerSubsystem(PowerTimeSeries.from_design(cfg, dt_s=dt_s), cfg),
+        ]
+        if thermal:
+            network = build_room_network(manifest, boundary_temperature_c=boundary_temperature_c)
+            air = network.node_ids()[: len(manifest)]
+            subsystems.append(
+                ThermalSubsystem(network.transient(dt_s), occupancy=OccupancyModel(), summary_nodes=air)
+            )
+        return cls(subsystems, dt_s=dt_s, manifest=manifest, **kwargs)
+
+    # ------------------------------------------------------------------
+    def _bind(self) -> None:
+        if not self._bound:
+            for sub in self.subsystems:
+                sub.bind(self.state)
+            self._bound = True
+
+    def run(
+        self,
+        n_steps: int,
+        *,
+        out: Union[None, str, Path, OutputWriter] = None,
+        flush_every: int = 64,
+        checkpoint=None,
+    ) -> Iterator[ScenarioBlock]:
+        """
+        Advance ``n_steps`` base steps, yielding each block's outputs. With
+        ``out`` every output is also appended to disk (index flushed every
+        ``flush_every`` blocks and at the end). ``checkpoint`` is a
+        ``ship.checkpoint.Checkpointer`` consulted after every block.
+        """
+
+        self._bind()
+        state = self.state
+        writer = out if isinstance(out, OutputWriter) or out is None else OutputWriter(out)
+        end = state.step + int(n_steps)
+        blocks = 0
+        if checkpoint is not None:
+            checkpoint.reset(state.step)
+        try:
+            while state.step < end:
+                n = min(self.block_steps, end - state.step)
+                for sub in self.subsystems:
+                    event = sub.next_event(state)
+                    if event is not None:
+                        n = min(n, max(int(event), 1))
+                start = state.step
+                outputs: Dict[str, np.ndarray] = {}
+                for sub in self.subsystems:
+                    result = sub.advance(state, start, n)
+                    for key, values in (result or {}).items():
+                        outputs[f"{sub.name}.{key}"] = np.asarray(values)
+                state.step = start + n
+                if writer is not None:
+                    for key, values in outputs.items():
+                        writer.append(key, values)
+                    blocks += 1
+                    if blocks % flush_every == 0:
+                        writer.flush()
+                if checkpoint is not None:
+                    checkpoint.maybe_save(self, writer)
+                yield ScenarioBlock(start, n, outputs)
+        finally:
+            if writer is not None and writer is not out:
+                writer.close()
+            elif writer is not None:
+                writer.flush()
+
+    def simulate(self, n_steps: int, **kwargs: Any) -> ScenarioState:
+        """Run to completion (outputs only on disk, if ``out`` is given)."""
+
+        for _ in self.run(n_steps, **kwargs):
+            pass
+        return self.state
@@ -0,0 +1,228 @@
+"""
+uncertainty.py
+---------------
+Monte Carlo propagation of spec-parameter uncertainty to ship totals.
+
+Method
+    • Distributions are declared per dotted spec path in
+      ``configs/uncertainty.yaml`` (uniform, normal, triangular, lognormal;
+      centred on the spec value unless stated).
+    • The spec files are compiled once (``ship.rates.compile_rates``); each
+      batch copies the base parameter vector, overwrites the sampled columns
+      and evaluates every sample with array operations.
+    • Batch ``i`` draws from child ``i`` of ``SeedSequence(seed)``, so results
+      are identical for any worker count and batches run in a process pool
+      (``workers=None`` → ``os.cpu_count()``, ``0`` → in-process).
+
+Convergence
+    Per-batch percentiles are independent estimates; their spread gives a
+    standard error for every reported band (batch-means method). The run is
+    converged when each band's standard error is within ``rtol`` of the
+    output's scale. With ``stop_when_converged`` batches stop early.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from data.loader import load_uncertainty
+from ship.rates import RateModel, compile_rates
+
+KINDS = ("uniform", "normal", "triangular", "lognormal")
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """One parameter's distribution, clipped to [lo, hi]."""
+
+    kind: str
+    a: float  # uniform/triangular low, normal mean, lognormal median
+    b: float  # uniform high, normal sd, triangular mode, lognormal sigma
+    c: float = float("nan")  # triangular high
+    lo: float = -float("inf")
+    hi: float = float("inf")
+
+    @classmethod
+    def from_config(cls, cfg: Mapping[str, Any], base: float) -> "Distribution":
+        kind = str(cfg.get("dist", "uniform"))
+        rel = cfg.get("rel")
+        low = cfg.get("low", base * (1 - rel) if rel is not None else None)
+        high = cfg.get("high", base * (1 + rel) if rel is not None else None)
+        c = float("nan")
+        if kind in ("uniform", "triangular"):
+            if low is None or high is None:
+                raise ValueError(f"{kind} needs low/high or rel.")
+            a, b = float(low), float(high)
+            if kind == "triangular":
+                a, b, c = float(low), float(cfg.get("mode", base)), float(high)
+        elif kind == "normal":
+            if "sd" not in cfg and "sd_rel" not in cfg:
+                raise ValueError("normal needs sd or sd_rel.")
+            a = float(cfg.get("mean", base))
+            b = float(cfg["sd"]) if "sd" in cfg else abs(base) * float(cfg["sd_rel"])
+        elif kind == "lognormal":
+            a, b = float(cfg.get("median", base)), float(cfg["sigma"])
+        else:
+            raise ValueError(f"Unknown distribution '{kind}'. Known: {', '.join(KINDS)}")
+        return cls(kind, a, b, c, float(cfg.get("min", -np.inf)), float(cfg.get("max", np.inf)))
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        if self.kind == "uniform":
+            x = rng.uniform(self.a, self.b, n)
+        elif self.kind == "normal":
+            x = rng.normal(self.a, self.b, n)
+        elif self.kind == "triangular":
+            x = rng.triangular(self.a, min(max(self.b, self.a), self.c), self.c, n)
+        else:
+            x = self.a * np.exp(self.b * rng.standard_normal(n))
+        return np.clip(x, self.lo, self.hi)
+
+
+def declared_distributions(
+    model: RateModel, cfg: Optional[Mapping[str, Any]] = None
+) -> Dict[str, Distribution]:
+    """Distributions from ``configs/uncertainty.yaml`` centred on ``model`` base values."""
+
+    cfg = cfg if cfg is not None else load_uncertainty()
+    return {
+        name: Distribution.from_config(spec or {}, float(model.base[model.index_of(name)]))
+        for name, spec in (cfg.get("parameters") or {}).items()
+    }
+
+
+@dataclass
+class UncertaintyResult:
+    """Samples, percentile bands and their batch-means standard errors."""
+
+    parameters: Tuple[str, ...]
+    inputs: np.ndarray  # (n, n_parameters) sampled values
+    outputs: Dict[str, np.ndarray]  # output -> (n,)
+    percentiles: Tuple[float, ...]
+    bands: Dict[str, np.ndarray] = field(default_factory=dict)  # output -> (n_percentiles,)
+    band_stderr: Dict[str, np.ndarray] = field(default_factory=dict)
+    history: List[Tuple[int, float]] = field(default_factory=list)  # (samples, worst relative stderr)
+    converged: bool = False
+
+    @property
+    def n_samples(self) -> int:
+        return self.inputs.shape[0]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        for name, values in self.outputs.items():
+            row = {"mean": float(values.mean()), "std": float(values.std(ddof=1)) if values.size > 1 else 0.0}
+            row.update({f"p{p:g}": float(v) for p, v in zip(self.percentiles, self.bands[name])})
+            out[name] = row
+        return out
+
+
+def _evaluate_batch(
+    model: RateModel, columns: np.ndarray, dists: Sequence[Distribution], seed: np.random.SeedSequence, size: int
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    rng = np.random.default_rng(seed)
+    V = model.batch(size)
+    for col, dist in zip(columns, dists):
+        V[:, col] = dist.sample(rng, size)
+    return V[:, columns], model.evaluate(V)
+
+
+def _bands(outputs: Mapping[str, np.ndarray], percentiles: Sequence[float]) -> Dict[str, np.ndarray]:
+    return {name: np.percentile(values, percentiles) for name, values in outputs.items()}
+
+
+def _relative_error(batches: List[Dict[str, np.ndarray]], bands: Dict[str, np.ndarray], outputs) -> Tuple[Dict, float]:
+    """Batch-means standard error of each band, and the worst one relative to scale."""
+
+    stderr: Dict[str, np.ndarray] = {}
+    worst = 0.0
+    for name in bands:
+        if len(batches) < 2:
+            stderr[name] = np.full(bands[name].shape, np.inf)
+            worst = np.inf
+            continue
+        per_batch = np.stack([b[name] for b in batches])
+        stderr[name] = per_batch.std(axis=0, ddof=1) / np.sqrt(len(batches))
+        scale = max(float(np.abs(outputs[name]).mean()), float(np.ptp(bands[name])))
+        if scale > 0:
+            worst = max(worst, float(stderr[name].max()) / scale)
+    return stderr, worst
+
+
+def run_monte_carlo(
+    model: Optional[RateModel] = None,
+    distributions: Optional[Mapping[str, Distribution]] = None,
+    *,
+    n_samples: int = 20_000,
+    batch_size: int = 2_000,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    percentiles: Sequence[float] = (5.0, 50.0, 95.0),
+    rtol: float = 0.01,
+    stop_when_converged: bool = False,
+) -> UncertaintyResult:
+    """
+    Sample ``distributions`` (default: declared ones) and evaluate ship
+    totals for up to ``n_samples`` samples in batches of ``batch_size``.
+    """
+
+    model = model if model is not None else compile_rates()
+    distributions = distributions if distributions is not None else declared_distributions(model)
+    names = tuple(distributions)
+    columns = np.array([model.index_of(n) for n in names], dtype=np.int64)
+    dists = [distributions[n] for n in names]
+
+    n_batches = max(-(-int(n_samples) // int(batch_size)), 1)
+    sizes = [min(batch_size, n_samples - i * batch_size) for i in range(n_batches)]
+    seeds = np.random.SeedSequence(seed).spawn(n_batches)
+    percentiles = tuple(float(p) for p in percentiles)
+
+    n_workers = (os.cpu_count() or 1) if workers is None else workers
+    round_size = max(n_workers, 1) if stop_when_converged else n_batches
+    inputs: List[np.ndarray] = []
+    chunks: List[Dict[str, np.ndarray]] = []
+    batch_bands: List[Dict[str, np.ndarray]] = []
+    history: List[Tuple[int, float]] = []
+    converged = False
+    stderr: Dict[str, np.ndarray] = {}
+
+    pool = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 0 and n_batches > 1 else None
+    try:
+        done = 0
+        while done < n_batches:
+            todo = range(done, min(done + round_size, n_batches))
+            if pool is None:
+                results = [_evaluate_batch(model, columns, dists, seeds[i], sizes[i]) for i in todo]
+            else:
+                futures = [pool.submit(_evaluate_batch, model, columns, dists, seeds[i], sizes[i]) for i in todo]
+                results = [f.result() for f in futures]
+            for sampled, outputs in results:
+                inputs.append(sampled)
+                chunks.append(outputs)
+                batch_bands.append(_bands(outputs, percentiles))
+            done = todo.stop
+
+            merged = {k: np.concatenate([c[k] for c in chunks]) for k in chunks[0]}
+            stderr, worst = _relative_error(batch_bands, _bands(merged, percentiles), merged)
+            history.append((sum(s.shape[0] for s in inputs), worst))
+            converged = worst <= rtol
+            if stop_when_converged and converged:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return UncertaintyResult(
+        parameters=names,
+        inputs=np.concatenate(inputs),
+        outputs=merged,
+        percentiles=percentiles,
+        bands=_bands(merged, percentiles),
+        band_stderr=stderr,
+        history=history,
+        converged=converged,
+    )
@@ -0,0 +1,187 @@
+"""
+test_heat_recovery.py
+---------------------
+Lightweight checks for working-fluid properties and heat-recovery components.
+"""
+
+import numpy as np
+import pytest
+
+from thermal import fluids
+from thermal.heat_dispatch import HeatDispatcher
+from thermal.sweep import axis, cartesian, dhw_preheat_point, latin_hypercube, run_sweep
+import thermal.heat_recovery as heat_recovery
+from thermal.heat_recovery import (
+    CompressorSpec,
+    FluidState,
+    HeatLoop,
+    HeatSink,
+    HeatSource,
+    DHWPreheatSpec,
+    HXMethod,
+    HXSpec,
+    WorkingFluid,
+    compressor_power_W,
+    compressor_sweep,
+    dhw_preheat_from_condenser,
+    fluid_props,
+    fluid_props_array,
+    hx_duty_W,
+    hx_sweep,
+)
+
+
+@pytest.fixture(autouse=True)
+def _table_cache(tmp_path_factory, monkeypatch):
+    monkeypatch.setattr(fluids, "DEFAULT_CACHE_DIR", tmp_path_factory.getbasetemp() / "fluid_tables")
+    yield
+    fluids.clear_fluid_tables()
+
+
+def test_saturation_matches_reference_data():
+    # CO2 at 0 °C: 3.485 MPa; NH3 at 40 °C: 1.555 MPa; H2O at 100 °C: 101.3 kPa.
+    p = [fluids.saturation_pressure(f, T)[0] for f, T in (("CO2", 273.15), ("NH3", 313.15), ("H2O", 373.15))]
+    assert np.allclose(p, [3.485e6, 1.555e6, 1.013e5], rtol=0.06)
+
+    sat = fluids.saturation_props(WorkingFluid.CO2, 3.485e6)
+    assert abs(float(sat["h_liq_kJ_per_kg"]) - 200.0) < 1.0  # IIR reference state
+    assert abs(float(sat["h_vap_kJ_per_kg"] - sat["h_liq_kJ_per_kg"]) - 230.9) < 7.0
+
+
+def test_fluid_props_fills_state_in_and_out_of_the_dome():
+    vapour = fluid_props(WorkingFluid.NH3, FluidState(T_K=300.0, p_Pa=3.0e5))
+    assert vapour.x_quality is None and vapour.h_kJ_per_kg > 1400.0
+
+    back = fluid_props(WorkingFluid.NH3, FluidState(T_K=0.0, p_Pa=3.0e5, h_kJ_per_kg=vapour.h_kJ_per_kg))
+    assert abs(back.T_K - 300.0) < 0.05
+
+    sat = fluids.saturation_props(WorkingFluid.NH3, 3.0e5)
+    h_mid = float(0.5 * (sat["h_liq_kJ_per_kg"] + sat["h_vap_kJ_per_kg"]))
+    wet = fluid_props(WorkingFluid.NH3, FluidState(T_K=0.0, p_Pa=3.0e5, h_kJ_per_kg=h_mid))
+    assert wet.x_quality == pytest.approx(0.5) and wet.T_K == pytest.approx(float(sat["T_K"]))
+
+
+def test_array_lookup_round_trips_transcritical_co2():
+    p = np.full(1000, 10.0e6)
+    T = np.linspace(280.0, 420.0, 1000)
+    forward = fluid_props_array(WorkingFluid.CO2, p, T_K=T)
+    back = fluid_props_array(WorkingFluid.CO2, p, h_kJ_per_kg=forward["h_kJ_per_kg"])
+    assert np.all(np.isnan(back["x"]))
+    assert np.abs(back["T_K"] - T).max() < 0.5
+    with pytest.raises(ValueError):
+        fluid_props_array(WorkingFluid.CO2, 1.0e3, T_K=300.0)
+
+
+def test_lmtd_and_ntu_sizing_agree_and_rating_inverts_them():
+    kwargs = dict(C_hot_W_per_K=1000.0, C_cold_W_per_K=2000.0)
+    Q, UA = hx_duty_W(HXSpec(), 80.0, None, 20.0, 10.0, **kwargs)
+    assert Q == pytest.approx(50_000.0)
+    assert hx_duty_W(HXSpec(method="e-NTU"), 80.0, None, 20.0, 10.0, **kwargs)[1] == pytest.approx(UA)
+    assert HXSpec(method="e-NTU").method is HXMethod.NTU
+
+    assert hx_duty_W(HXSpec(**kwargs), 80.0, None, 20.0, 10.0) == pytest.approx((Q, UA))
+    with pytest.raises(ValueError):
+        hx_duty_W(HXSpec(), 80.0, None, 20.0, 10.0, C_hot_W_per_K=1000.0)
+
+    rated = hx_sweep(HXSpec(UA_W_per_K=UA), 80.0, 20.0, **kwargs)
+    assert float(rated["Q_W"]) == pytest.approx(Q)
+    assert float(rated["T_hot_out_C"]) == pytest.approx(30.0)
+
+
+def test_sweep_enforces_pinch_over_many_points():
+    rng = np.random.default_rng(0)
+    n = 10_000
+    T_hot_in, T_cold_in = rng.uniform(40.0, 90.0, n), rng.uniform(5.0, 30.0, n)
+    out = hx_sweep(
+        HXSpec(pinch_K=5.0),
+        T_hot_in,
+        T_cold_in,
+        C_hot_W_per_K=rng.uniform(100.0, 5000.0, n),
+        C_cold_W_per_K=rng.uniform(100.0, 5000.0, n),
+        target_approach_K=rng.uniform(1.0, 15.0, n),
+    )
+    assert out["Q_W"].shape == (n,) and np.all(np.isfinite(out["UA_W_per_K"]))
+    assert out["pinch_limited"].any() and not out["pinch_limited"].all()
+    terminal = np.minimum(T_hot_in - out["T_cold_out_C"], out["T_hot_out_C"] - T_cold_in)
+    assert terminal.min() >= 5.0 - 1e-9
+
+
+def test_compressor_is_isentropic_at_unit_efficiency_and_memoizes():
+    ideal = CompressorSpec(eta_isentropic=1.0, eta_mech=1.0)
+    suction = fluid_props(WorkingFluid.NH3, FluidState(T_K=268.15, p_Pa=3.0e5))
+    W, outlet = compressor_power_W(WorkingFluid.NH3, suction, 1.2e6, ideal, m_dot_kg_per_s=0.1)
+    assert outlet.s_kJ_per_kgK == pytest.approx(suction.s_kJ_per_kgK, abs=2e-3)
+    assert W == pytest.approx(0.1 * (outlet.h_kJ_per_kg - suction.h_kJ_per_kg) * 1e3)
+
+    real_W, real_out = compressor_power_W(WorkingFluid.NH3, suction, 1.2e6, CompressorSpec())
+    assert real_W > W / 0.1 and real_out.T_K > outlet.T_K
+
+    heat_recovery.clear_isentropic_cache()
+    p_in = np.repeat([3.0e5, 3.5e5], 500)
+    h_in = np.full(p_in.size, suction.h_kJ_per_kg)
+    out = compressor_sweep(WorkingFluid.NH3, p_in, h_in, 1.2e6, CompressorSpec())
+    assert len(heat_recovery._ISENTROPIC_CACHE) == 2
+    assert np.all(np.isfinite(out["W_shaft_W"]))
+
+
+def test_dispatch_respects_grade_priority_and_warm_starts():
+    loop = HeatLoop()
+    loop.add_source(HeatSource("gas_cooler", Q_out_W=6_000.0, T_supply_C=70.0))
+    loop.add_source(HeatSource("condenser", Q_out_W=6_000.0, T_supply_C=35.0))
+    loop.add_sink(HeatSink("dhw", Q_in_W=5_000.0, T_required_C=55.0, priority=3.0))
+    loop.add_sink(HeatSink("space", Q_in_W=8_000.0, T_required_C=25.0, priority=1.0))
+
+    dispatcher = HeatDispatcher(min_approach_K=5.0)
+    result = loop.dispatch(dispatcher)
+    # Only the gas cooler is hot enough for DHW; the condenser heats the space.
+    assert result.flows_W[("gas_cooler", "dhw")] == pytest.approx(5_000.0)
+    assert ("condenser", "dhw") not in result.flows_W
+    assert result.delivered_W["space"] == pytest.approx(7_000.0)
+    assert result.rejected_W == {"gas_cooler": 0.0, "condenser": pytest.approx(0.0)}
+
+    loop.sources[0].Q_out_W = 4_000.0  # DHW now contested: priority wins
+    warm = loop.dispatch(dispatcher)
+    assert warm.delivered_W["dhw"] == pytest.approx(4_000.0)
+    assert warm.cycles_canceled <= result.cycles_canceled
+    assert loop.balance()["Q_unserved_W"] == pytest.approx(3_000.0)
+
+
+def test_dhw_preheat_respects_setpoint_and_hot_side_approach():
+    spec = DHWPreheatSpec(m_dot_water_kg_per_s=0.1, T_in_C=10.0, T_set_C=55.0)
+    partial = dhw_preheat_from_condenser(10_000.0, spec)
+    assert partial["unused_Q_W"] == 0.0 and 33.0 < partial["T_out_C"] < 35.0
+
+    limited = dhw_preheat_from_condenser(20_000.0, spec, T_hot_C=50.0)
+    assert limited["T_out_C"] == pytest.approx(45.0)
+    assert limited["Q_to_DHW_W"] + limited["unused_Q_W"] == pytest.approx(20_000.0)
+
+
+def test_dhw_preheat_balance_holds_when_outlet_clip_binds(monkeypatch):
+    # A cp that climbs steeply with temperature pushes the corrected outlet
+    # past the limit, so the clip on T_out has to clip Q with it.
+    monkeypatch.setattr(heat_recovery, "cp_water_J_per_kgK", lambda T: 4000.0 * np.exp((np.asarray(T) - 30.0) / 10.0))
+    spec = DHWPreheatSpec(m_dot_water_kg_per_s=0.1, T_in_C=10.0, T_set_C=55.0)
+    Q_cap = 0.1 * heat_recovery.cp_water_J_per_kgK(32.5) * 45.0
+    result = dhw_preheat_from_condenser(0.99 * Q_cap, spec)
+
+    cp = heat_recovery.cp_water_J_per_kgK(0.5 * (10.0 + 10.0 + 0.99 * 45.0))  # the one corrected pass
+    assert result["T_out_C"] == 55.0
+    assert result["Q_to_DHW_W"] == pytest.approx(0.1 * cp * 45.0)
+    assert result["Q_to_DHW_W"] + result["unused_Q_W"] == pytest.approx(0.99 * Q_cap)
+    assert result["unused_Q_W"] > 0.0
+
+
+def test_sweep_caches_points_and_only_evaluates_widened_range(tmp_path):
+    grid = {"Q_reject_W": axis(0.0, 10_000.0, 2_500.0), "m_dot_water_kg_per_s": axis(0.05, 0.2, 0.05)}
+    first = run_sweep(dhw_preheat_point, cartesian(grid), workers=0, cache_dir=tmp_path)
+    assert (first.evaluated, first.cached) == (20, 0)
+
+    grid["Q_reject_W"] = axis(0.0, 15_000.0, 2_500.0)
+    second = run_sweep(dhw_preheat_point, cartesian(grid), workers=2, chunk_size=2, cache_dir=tmp_path)
+    assert (second.evaluated, second.cached) == (8, 20)
+    cols = second.columns()
+    assert np.all(cols["Q_to_DHW_W"] <= cols["Q_reject_W"] + 1e-9)
+
+    lhs = latin_hypercube({"a": (0.0, 1.0), "b": (5.0, 6.0)}, 10, seed=3)
+    strata = np.sort(np.floor(np.array([p["a"] for p in lhs]) * 10))
+    assert np.array_equal(strata, np.arange(10))
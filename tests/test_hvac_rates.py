@@ -0,0 +1,29 @@
+"""
+test_hvac_rates.py
+------------------
+Checks for HVAC rate resolution and the exhaust drivers in hvac_design.yaml.
+"""
+
+import pytest
+
+from env.hvac.calc_env import exhaust_rate
+from env.hvac.design import get_hvac_design, resolve_room_activity
+from ship.registry import compute
+
+
+def test_re_exhaust_resolves_and_drives_area_based_exhaust():
+    rates = resolve_room_activity(get_hvac_design(), "hygiene_block")
+    assert rates["exhaust"]["Re_Lps_per_m2"] == pytest.approx(3.8)
+
+    # Area driver vs per-fixture driver: the larger one wins.
+    assert exhaust_rate(18.0, rates["exhaust"]) == pytest.approx(3.8 * 18.0)
+    assert exhaust_rate(18.0, rates["exhaust"], fixtures=4) == pytest.approx(23.6 * 4)
+    # Legacy Ra_ configs still count as area-based exhaust.
+    assert exhaust_rate(10.0, {"Ra_Lps_per_m2": 2.0}) == pytest.approx(20.0)
+
+    report = compute("hygiene_block", floor_area_m2=18.0)
+    assert report.hvac["exhaust_Lps"] == pytest.approx(3.8 * 18.0)
+
+    cfg = {"rooms": {"lab": {"exhaust": {"Rx_Lps_per_m2": 1.0}}}}
+    with pytest.raises(KeyError):
+        resolve_room_activity(cfg, "lab")
@@ -0,0 +1,49 @@
+"""
+test_occupancy.py
+-----------------
+Checks for crew-profile occupancy and activity multipliers.
+"""
+
+import numpy as np
+import pytest
+
+from env.occupancy import OccupancyModel, state_fractions
+from ship.manifest import ShipManifest
+
+
+def test_state_fractions_partition_each_group():
+    fractions = state_fractions(step_s=900)
+    for group, frac in fractions.items():
+        assert frac.shape == (3, 96)
+        assert np.allclose(frac.sum(axis=0), 1.0, atol=1e-6), group
+    # Each shift works 8 h and sleeps 8 h; the rotation keeps a third on duty.
+    assert fractions["adults.alpha"][2].sum() * 0.25 == pytest.approx(8.0)
+    assert np.allclose(fractions["adults"][2], 1 / 3, atol=1e-6)
+
+
+def test_profiles_feed_thermal_and_power_time_series():
+    model = OccupancyModel(step_s=900)
+    dorm = model.occupancy("child_dorm_8")
+    assert dorm.period_s == pytest.approx(86_400.0)
+    assert dorm.sample(3 * 3600.0) == pytest.approx(1.0)  # asleep
+    assert dorm.sample(10 * 3600.0) == pytest.approx(0.0)  # lessons
+    assert model.activity("child_dorm_8").sample(3 * 3600.0) == pytest.approx(1.0)
+
+    manifest = ShipManifest.from_columns(
+        type_id=["child_dorm_8", "warehouse", "unknown"],
+        floor_area_m2=[24.0, 100.0, 5.0],
+        height_m=2.6,
+        occupants=[8, 10, 3],
+    )
+    loads = model.room_loads_kW(manifest, n_nodes=7)
+    night = loads(3 * 3600.0)
+    assert night.shape == (7,)
+    assert night[0] == pytest.approx(8 * 80.0 / 1000.0)
+    assert night[2:].tolist() == [0.0] * 5
+
+    # One day at 1-minute steps (lessons 08–15 h) without per-step objects.
+    profile = model.power_profile(0.1, manifest, dt_s=60.0)
+    day = profile(0, 1440)
+    assert day.shape == (1440,)
+    assert day[3 * 60] == pytest.approx(0.1 * (8 + 10 * 0.1))
+    assert day[10 * 60] == pytest.approx(0.1 * 10 * 0.1)
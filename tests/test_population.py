@@ -0,0 +1,66 @@
+"""
+test_population.py
+------------------
+Checks for the columnar agent-based crew population.
+"""
+
+import numpy as np
+
+from ship.manifest import ShipManifest
+from ship.population import PHASES, Population
+
+
+def _manifest(child_dorms: int, adult_dorms: int) -> ShipManifest:
+    types = ["child_dorm_8"] * child_dorms + ["dorm_communal_8"] * adult_dorms + ["hygiene_block"]
+    return ShipManifest.from_columns(
+        type_id=types,
+        floor_area_m2=np.full(len(types), 24.0),
+        height_m=2.6,
+        occupants=[8] * (child_dorms + adult_dorms) + [12],
+    )
+
+
+def test_initial_crew_is_housed_and_spread_over_shifts():
+    pop = Population.from_crew(manifest=_manifest(3, 5), seed=0)
+    assert pop.census() == {"children": 18, "adolescents": 12, "adults": 24, "seniors": 0}
+    assert pop.shift_counts().tolist() == [8, 8, 8]
+    occupants = pop.room_occupants()
+    assert occupants[:3].sum() == 18 and occupants[3:8].sum() == 36
+    assert occupants[-1] == 12.0  # shared room at design headcount
+    assert [row["occupants"] for row in pop.room_overrides()] == np.rint(occupants).astype(int).tolist()
+
+
+def test_stepping_keeps_columns_consistent():
+    pop = Population.from_crew(manifest=_manifest(400, 800), scale=100, seed=3)
+    pop.demography.births_per_woman_day *= 5
+    start = len(pop)
+    births = deaths = 0
+    for events in pop.run(5 * 365, step_days=7):
+        births += events.births
+        deaths += events.deaths
+    assert len(pop) == start + births - deaths
+    assert np.unique(pop["id"]).size == len(pop)
+    assert np.array_equal(pop["phase"], pop.demography.phase_of(pop["age_days"]))
+    adults = pop["phase"] == PHASES.index("adults")
+    assert np.all(pop["shift"][adults] >= 0) and np.all(pop["shift"][~adults] == -1)
+    assert np.ptp(pop.shift_counts()) <= 1
+
+    occupants = pop.to_manifest().occupants
+    assert np.all(occupants[:-1] <= 8)
+    dorm = pop["dorm"]
+    assert occupants[:-1].sum() == np.count_nonzero(dorm >= 0)
+    housed_type = pop.manifest.type_id[dorm[dorm >= 0]]
+    is_child = pop["phase"][dorm >= 0] == PHASES.index("children")
+    assert np.all((housed_type == "child_dorm_8") == is_child)
+
+
+def test_shifts_are_rebalanced_after_losses():
+    pop = Population.from_crew(manifest=_manifest(400, 800), scale=100, seed=5)
+    pop.demography.mortality_per_day[:] = 0.0
+    shift = pop["shift"]
+    before = pop.shift_counts()
+    alpha = np.flatnonzero(shift == 0)
+    pop["age_days"][alpha[: before[0] // 2]] = pop.demography.max_age_days  # half of shift 0 dies
+    pop.step(1)
+    assert np.ptp(pop.shift_counts()) <= 1
+
@@ -4,6 +4,8 @@ test_power_bus.py
 Lightweight checks for the power bus helpers.
 """
 
+import pytest
+
 from power.bus import get_power_design, power_balance
 from data.cache import clear_cache, list_cached_files
 
@@ -24,3 +26,51 @@ def test_cache_reporting_roundtrip():
     _ = get_power_design()
     cached = list_cached_files()
     assert cached, "expected cache to contain at least one entry"
+
+
+def test_rate_based_sinks_resolve_from_estimates_and_manifest():
+    from power.bus import get_total_consumption, resolve_sink_consumption
+    from ship.manifest import ShipManifest
+
+    cfg = {
+        "sinks": {
+            "core": {"consumption_kW": 5.0},
+            "lighting": {"consumption_kW_per_m2": 0.01, "area_m2_estimate": 200.0},
+            "hvac": {"consumption_kW_per_person": 0.2, "occupants_estimate": 10, "phases": ["adult"]},
+        }
+    }
+    assert resolve_sink_consumption(cfg) == {"core": 5.0, "lighting": 2.0, "hvac": 2.0}
+
+    manifest = ShipManifest.from_columns(
+        type_id=["dorm_communal_8", "child_dorm_8", "dorm_communal_8"],
+        floor_area_m2=[24.0, 24.0, 52.0],
+        height_m=2.6,
+        phase=["adult", "children", "adult"],
+        occupants=[8, 8, 12],
+    )
+    resolved = resolve_sink_consumption(cfg, manifest)
+    assert resolved["lighting"] == pytest.approx(1.0)
+    assert resolved["hvac"] == pytest.approx(0.2 * 20)
+    assert get_total_consumption(cfg, manifest) == pytest.approx(5.0 + 1.0 + 4.0)
+
+
+def test_per_person_sinks_count_housed_crew_once():
+    from power.bus import resolve_sink_consumption
+    from ship.manifest import ShipManifest
+
+    cfg = {"sinks": {"galley": {"consumption_kW_per_person": 0.1}}}
+    manifest = ShipManifest.from_columns(
+        type_id=["child_dorm_8", "dorm_communal_8", "hygiene_block", "warehouse"],
+        floor_area_m2=[24.0, 28.0, 18.0, 100.0],
+        height_m=2.6,
+        occupants=[8, 8, 12, 10],  # the shared rooms hold the same 16 people
+    )
+    assert resolve_sink_consumption(cfg, manifest)["galley"] == pytest.approx(0.1 * 16)
+
+
+def test_registry_reports_carry_occupants():
+    from ship import compute
+    from ship.manifest import ShipManifest
+
+    manifest = ShipManifest.from_reports([compute("child_dorm_8"), compute("child_dorm_8", occupants=6)])
+    assert manifest.occupants.tolist() == [8.0, 6.0]
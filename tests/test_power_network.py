@@ -0,0 +1,104 @@
+"""
+test_power_network.py
+---------------------
+Checks for the bus graph and DC load flow.
+"""
+
+import numpy as np
+import pytest
+
+from power.bus import feeder_loading
+from power.network import PowerNetwork, build_bus_network, redundancy_paths
+
+
+def _design(load_kW):
+    return {
+        "sources": {"reactor": {"generation_kW": 5000.0}},
+        "storage": {"battery": {"discharge_rate_kW": 0.0}},
+        "sinks": {name: {"consumption_kW": kw} for name, kw in load_kW.items()},
+    }
+
+
+_LAYOUT = {
+    "backbone_voltage_kV": 11,
+    "secondary_voltage_kV": 0.48,
+    "feeders": {
+        "ls": {"breaker_rating_A": 400, "redundancy": "n+1", "sinks": ["a"]},
+        "hab": {"breaker_rating_A": 250, "redundancy": "n", "sinks": ["b"]},
+    },
+}
+
+
+def test_feeder_currents_and_breaker_check():
+    net = build_bus_network(_LAYOUT, _design({"a": 300.0, "b": 250.0}))
+    result = net.solve_dc()
+    report = {row["branch"]: row for row in net.feeder_report(result)}
+
+    # n+1 → two parallel breakers sharing 300 kW equally at 0.48 kV.
+    expected = 150.0 / (np.sqrt(3) * 0.48)
+    assert report["feeder:ls#0"]["current_A"] == pytest.approx(expected)
+    assert report["feeder:ls#1"]["current_A"] == pytest.approx(expected)
+    assert not report["feeder:ls#0"]["overloaded"]
+    assert report["feeder:hab"]["current_A"] == pytest.approx(250.0 / (np.sqrt(3) * 0.48))
+    assert report["feeder:hab"]["overloaded"]
+    assert result.unserved_kW == 0.0 and result.shortfall_kW == 0.0
+
+
+def test_islands_without_sources_are_unserved():
+    net = PowerNetwork()
+    net.add_buses(["g", "a", "b", "c"], 1.0, load_kW=[0.0, 10.0, 5.0, 7.0], capacity_kW=[100.0, 0, 0, 0])
+    net.add_branches(["g", "a", "b"], ["a", "b", "c"], x_pu=[0.1, 0.2, 0.1])
+    out = net.solve_dc(in_service=np.array([True, True, False]))
+    assert out.unserved_kW == pytest.approx(7.0)
+    assert out.flow_kW[:2] == pytest.approx([15.0, 5.0])
+    assert out.energized.tolist() == [True, True, True, False]
+
+    # Large radial + meshed grid still solves with a single factorization.
+    big = PowerNetwork()
+    n = 2000
+    big.add_buses([f"b{i}" for i in range(n)], 0.48, load_kW=1.0, capacity_kW=np.r_[n * 2.0, np.zeros(n - 1)])
+    big.add_branches(np.arange(n - 1), np.arange(1, n))
+    big.add_branches(np.arange(0, n - 10, 10), np.arange(10, n, 10))
+    flow = big.solve_dc()
+    assert flow.generation_kW[0] == pytest.approx(n)
+    assert redundancy_paths("n+2") == 3
+
+
+def test_default_layout_builds():
+    rows = feeder_loading()
+    assert {r["branch"] for r in rows} >= {"feeder:life_support#0", "feeder:life_support#1", "feeder:habitation"}
+
+
+def test_n_minus_1_matches_full_resolves():
+    from power.contingency import check_layout_redundancy, n_minus_1
+
+    rng = np.random.default_rng(3)
+    n = 40
+    net = PowerNetwork()
+    cap = np.zeros(n)
+    cap[[0, 20, 39]] = [20.0, 8.0, 1.0]
+    net.add_buses([f"b{i}" for i in range(n)], 0.48, load_kW=rng.random(n), capacity_kW=cap)
+    parents = [int(rng.integers(0, i)) for i in range(1, n)]
+    net.add_branches(parents, list(range(1, n)), rating_A=rng.uniform(5, 40, n - 1))
+    net.add_branches([1, 5, 5, 7], [9, 12, 12, 30], x_pu=0.05, rating_A=30.0)
+
+    report = n_minus_1(net, kinds=None, workers=2, chunk_size=8)
+    assert len(report.outages) == net.n_branches
+    for outage in report.outages:
+        keep = np.ones(net.n_branches, dtype=bool)
+        keep[outage.branch] = False
+        full = net.solve_dc(keep)
+        assert sorted(net.branch_names[i] for i in np.flatnonzero(full.overloaded)) == sorted(
+            name for name, _ in outage.overloaded
+        )
+        assert outage.max_loading == pytest.approx(full.loading.max(), abs=1e-9)
+        assert outage.unserved_kW == pytest.approx(full.unserved_kW)
+        assert outage.shortfall_kW == pytest.approx(full.shortfall_kW)
+        assert outage.islanding == (full.island.max() > report.base.island.max())
+
+    # n+1 life-support feeder survives losing either breaker; the n feeder does not.
+    layout_report = check_layout_redundancy(_LAYOUT, _design({"a": 100.0, "b": 50.0}), workers=0)
+    by_name = {o.element: o for o in layout_report.outages}
+    assert by_name["feeder:ls#0"].secure and by_name["feeder:ls#1"].secure
+    assert by_name["feeder:hab"].de_energized == ["sink:b"]
+    assert set(by_name["source:reactor"].de_energized) == {"sink:a", "sink:b"}
@@ -0,0 +1,86 @@
+"""
+test_power_telemetry.py
+-----------------------
+Checks for streaming meter-log ingestion.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from power.telemetry import TelemetryIngestor
+
+_DESIGN = {"sinks": {"a": {"consumption_kW": 50.0}, "b": {"consumption_kW_per_person": 1.0, "occupants_estimate": 20}}}
+_LAYOUT = {"feeders": {"f1": {"sinks": ["a", "b"]}}}
+
+
+def _readings(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.round(np.sort(rng.uniform(0.0, 86_400.0, n)), 3)
+    meters = rng.choice(["m-a", "b", "unknown"], n)
+    kW = np.round(rng.lognormal(3.0, 0.5, n), 4)
+    return t, meters, kW
+
+
+def test_csv_and_jsonl_streams_agree_with_direct_statistics(tmp_path):
+    t, meters, kW = _readings()
+    csv_path = tmp_path / "log.csv"
+    csv_path.write_text(
+        "meter,timestamp,kW\n" + "\n".join(f"{m},{a},{v}" for a, m, v in zip(t, meters, kW)) + "\n"
+    )
+    jsonl_path = tmp_path / "log.jsonl"
+    jsonl_path.write_text(
+        "\n".join(json.dumps({"timestamp": float(a), "meter": m, "kW": float(v)}) for a, m, v in zip(t, meters, kW))
+    )
+
+    results = []
+    for path in (csv_path, jsonl_path):
+        ingest = TelemetryIngestor(_DESIGN, _LAYOUT, meter_map={"m-a": "a"}, window_s=600, n_windows=12)
+        assert ingest.ingest(path, chunk_rows=1_500) == t.size
+        results.append(ingest)
+    csv_ingest, jsonl_ingest = results
+    assert csv_ingest.rolling("a") == jsonl_ingest.rolling("a")
+    assert csv_ingest.unmapped_rows == np.count_nonzero(meters == "unknown")
+
+    # Rolling stats cover only the last 12 ten-minute windows.
+    recent = (meters == "m-a") & (t >= (np.floor(t.max() / 600) - 11) * 600)
+    rolling = csv_ingest.rolling("a")
+    assert rolling["count"] == recent.sum()
+    assert rolling["mean_kW"] == pytest.approx(kW[recent].mean())
+    assert rolling["peak_kW"] == pytest.approx(kW[recent].max())
+    assert rolling["p95_kW"] == pytest.approx(np.quantile(kW[recent], 0.95), rel=0.03)
+
+    # Design limits: a = 50 kW, b = 1 kW/person × 20 people.
+    flagged = csv_ingest.exceedances()
+    assert flagged["a"].exceed_count == np.count_nonzero((meters == "m-a") & (kW > 50.0))
+    assert flagged["b"].exceed_count == np.count_nonzero((meters == "b") & (kW > 20.0))
+
+    starts, feeders = csv_ingest.feeder_window_means()
+    assert starts.size == 12 and np.all(np.diff(starts) == 600)
+    assert feeders["f1"].shape == (12,)
+
+
+def test_malformed_rows_are_counted_not_fatal(tmp_path):
+    csv_path = tmp_path / "bad.csv"
+    csv_path.write_text(
+        "timestamp,meter,kW\n"
+        "2031-04-01T00:00:00Z,b,10\n"
+        "2031-04-01T02:00:00+01:00,b,12\n"  # same instant as 01:00Z
+        "2,b,\n"
+        "3,b,x\n"
+        "not-a-time,b,5\n"
+        "4,b,1,extra\n"
+        ",,\n"
+        "5,unknown,7\n"
+    )
+    ingest = TelemetryIngestor(_DESIGN, _LAYOUT, window_s=3600, n_windows=4)
+    assert ingest.ingest(csv_path, chunk_rows=3) == 8
+    assert ingest.bad_rows == 5 and ingest.unmapped_rows == 1
+    assert ingest.summary()["b"].count == 2
+
+    jsonl_path = tmp_path / "bad.jsonl"
+    jsonl_path.write_text('{"timestamp": 1, "meter": "b", "kW": null}\n{broken\n{"timestamp": 2, "meter": "b", "kW": 3}\n')
+    ingest = TelemetryIngestor(_DESIGN, _LAYOUT)
+    assert ingest.ingest(jsonl_path) == 3
+    assert ingest.bad_rows == 2 and ingest.summary()["b"].count == 1
@@ -0,0 +1,95 @@
+"""
+test_power_timeseries.py
+------------------------
+Checks for the chunked power balance simulator.
+"""
+
+import numpy as np
+import pytest
+
+from power.timeseries import BatterySpec, PowerTimeSeries, clamp_scan, repeating
+
+
+def test_clamp_scan_matches_sequential_loop():
+    rng = np.random.default_rng(0)
+    x = rng.normal(0.0, 3.0, 5000)
+    lo = rng.uniform(0.0, 2.0, x.size)
+    hi = lo + rng.uniform(5.0, 20.0, x.size)
+
+    s, expected = 5.0, []
+    for xi, l, h in zip(x, lo, hi):
+        s = min(max(s + xi, l), h)
+        expected.append(s)
+    assert np.allclose(clamp_scan(x, 5.0, lo, hi), expected, atol=1e-12)
+
+
+def test_energy_balance_and_chunking():
+    day = np.r_[np.zeros(720), np.full(720, 30.0)]
+    demand = repeating(15.0 + 5.0 * np.sin(np.arange(1440) / 1440 * 2 * np.pi))
+    battery = BatterySpec(200.0, 20.0, 25.0, eta_charge=0.95, eta_discharge=0.9, initial_frac=0.5)
+
+    def make():
+        return PowerTimeSeries({"array": repeating(day), "reactor": 10.0}, {"hab": demand}, battery, backup_kW=2.0)
+
+    summary = make().simulate(30 * 1440)
+    supplied = summary.generation_kWh + summary.backup_kWh + summary.discharge_kWh
+    used = summary.charge_kWh + summary.spilled_kWh + summary.demand_kWh - summary.unserved_kWh
+    assert supplied == pytest.approx(used)
+    assert 0.0 <= summary.min_soc_kWh <= 200.0
+    assert summary.unserved_kWh > 0.0 and summary.backup_kWh > 0.0
+
+    # Chunk size does not change the trajectory.
+    a = np.concatenate([c.soc_kWh for c in make().run(3 * 1440, chunk_steps=1440)])
+    b = np.concatenate([c.soc_kWh for c in make().run(3 * 1440, chunk_steps=97)])
+    assert np.allclose(a, b)
+
+
+def test_from_design_uses_storage_entries():
+    cfg = {
+        "sources": {"reactor": {"generation_kW": 10}},
+        "storage": {
+            "battery_bank": {"storage_kWh": 50, "discharge_rate_kW": 5, "charge_efficiency_percent": 0},
+            "emergency_fuel_cell": {"generation_kW": 3},
+        },
+        "sinks": {"core": {"consumption_kW": 12}},
+    }
+    sim = PowerTimeSeries.from_design(cfg)
+    assert sim.battery.capacity_kWh == 50 and sim.battery.eta_charge == 1.0
+    summary = sim.simulate(24 * 60)
+    # 2 kW deficit: battery covers 25 h of it, so no backup in the first day.
+    assert summary.backup_kWh == pytest.approx(0.0)
+    assert summary.final_soc_kWh == pytest.approx(50 - 2 * 24)
+
+
+def test_dp_dispatch_matches_brute_force_and_rolling():
+    import itertools
+
+    from power.dispatch import StorageDispatcher
+
+    rng = np.random.default_rng(0)
+    battery = BatterySpec(100.0, 30.0, 40.0, eta_charge=0.9, eta_discharge=0.95, initial_frac=0.5)
+    small = StorageDispatcher(battery, fuel_cell_kW=20.0, n_soc=5)
+    demand, generation = rng.uniform(10, 60, 6), rng.uniform(0, 60, 6)
+    schedule = small.optimize(demand, generation)
+
+    cost = small._stage(demand - generation)[0]
+    value = small._terminal_value()
+    best = min(
+        cost[np.arange(6), np.diff((2,) + path) + 4].sum() - value * small.grid[path[-1]]
+        for path in itertools.product(range(5), repeat=6)
+    )
+    assert schedule.total_cost - value * schedule.soc_kWh[-1] == pytest.approx(best)
+
+    # Energy balance of the returned schedule.
+    bus = generation + schedule.battery_kW + schedule.fuel_cell_kW + schedule.unserved_kW - schedule.spilled_kW
+    assert np.allclose(bus, demand)
+
+    # Daily cycle: a rolling 48 h / 24 h horizon reproduces the full-year optimum.
+    t = np.arange(24 * 60)
+    load = 30 + 10 * np.sin(2 * np.pi * t / 24)
+    array = np.where((t % 24 > 8) & (t % 24 < 18), 60.0, 0.0)
+    dispatcher = StorageDispatcher(battery, fuel_cell_kW=20.0, n_soc=41)
+    full = dispatcher.optimize(load, array)
+    rolled = dispatcher.rolling(load, array, horizon_steps=48, commit_steps=24)
+    assert rolled.soc_kWh.shape == (t.size + 1,)
+    assert rolled.total_cost == pytest.approx(full.total_cost, rel=1e-6)
@@ -0,0 +1,59 @@
+"""
+test_rates.py
+-------------
+Checks for the compiled spec-parameter model of ship totals.
+"""
+
+import numpy as np
+import pytest
+
+from ship.manifest import ShipManifest
+from ship.rates import compile_rates, default_manifest
+from ship.registry import compute
+
+
+def test_compiled_totals_match_room_calculators():
+    manifest = ShipManifest.from_columns(
+        type_id=["child_dorm_8", "dorm_communal_8", "hygiene_block", "intimacy_pod", "warehouse", "warehouse"],
+        floor_area_m2=[24.0, 28.0, 18.0, 6.0, 100.0, 60.0],
+        height_m=2.6,
+        occupants=[8, 7, 12, 2, 10, 3],
+    )
+    totals = compile_rates(manifest).evaluate()
+
+    expected = {}
+    for t, area, occ in zip(manifest.type_id, manifest.floor_area_m2, manifest.occupants):
+        for key, value in compute(str(t), floor_area_m2=float(area), occupants=int(occ)).hvac.items():
+            expected[key] = expected.get(key, 0.0) + value
+    for key, value in expected.items():
+        assert float(totals[key]) == pytest.approx(value, abs=0.02), key
+
+
+def test_batched_evaluation_follows_the_effective_leaf():
+    model = compile_rates(default_manifest())
+    dorm_rp = model.index_of("hvac.rooms.dorm.ventilation.Rp_Lps_per_person")
+    default_rp = model.index_of("hvac.defaults.ventilation.Rp_Lps_per_person")
+
+    V = model.batch(3)
+    V[1, dorm_rp] += 1.0
+    V[2, default_rp] += 1.0  # every registered room overrides the default
+    vent = model.evaluate(V)["ventilation_Lps"]
+    assert vent.shape == (3,)
+    assert vent[1] - vent[0] == pytest.approx(16.0)  # two 8-person dorms
+    assert vent[2] == pytest.approx(vent[0])
+    assert np.array_equal(model.evaluate(model.base)["ventilation_Lps"], vent[0])
+
+
+def test_power_term_counts_housed_crew_once():
+    from power.bus import get_total_consumption
+
+    power = {"sinks": {"galley": {"consumption_kW": 1.0, "consumption_kW_per_person": 0.1}}}
+    manifest = ShipManifest.from_columns(
+        type_id=["child_dorm_8", "dorm_communal_8", "hygiene_block", "warehouse"],
+        floor_area_m2=[24.0, 28.0, 18.0, 100.0],
+        height_m=2.6,
+        occupants=[8, 8, 12, 10],
+    )
+    demand = compile_rates(manifest, power=power).evaluate()["demand_kW"]
+    assert float(demand) == pytest.approx(1.0 + 0.1 * 16)
+    assert float(demand) == pytest.approx(get_total_consumption(power, manifest))
@@ -0,0 +1,51 @@
+"""
+test_scenario.py
+----------------
+Checks for the block-stepped scenario engine and its output files.
+"""
+
+import numpy as np
+
+from ship.manifest import ShipManifest
+from ship.scenario import PopulationSubsystem, Scenario, load_outputs
+from ship.population import Population
+
+
+def _manifest() -> ShipManifest:
+    types = ["child_dorm_8"] * 3 + ["dorm_communal_8"] * 5 + ["hygiene_block", "warehouse"]
+    return ShipManifest.from_columns(
+        type_id=types,
+        floor_area_m2=np.full(len(types), 30.0),
+        height_m=2.6,
+        occupants=[8] * 8 + [12, 10],
+    )
+
+
+def test_blocks_align_to_population_ticks_and_stream_to_disk(tmp_path):
+    def load(state, start, n):
+        return {"kW": np.full(n, 0.1 * state.values["headcount"])}
+
+    population = Population.from_crew(manifest=_manifest(), seed=4)
+    scenario = Scenario([PopulationSubsystem(population), load], dt_s=3600.0, block_steps=10)
+    blocks = list(scenario.run(24 * 3, out=tmp_path / "run"))
+
+    assert [b.n_steps for b in blocks] == [10, 10, 4] * 3
+    out = load_outputs(tmp_path / "run")
+    assert out["load.kW"].shape == (72,)
+    assert out["population.headcount"].shape == (3,)
+    assert out["population.time_s"].tolist() == [86_400.0, 172_800.0, 259_200.0]
+    assert out["population.headcount"][-1] == len(population)
+
+
+def test_design_scenario_couples_population_power_and_thermal(tmp_path):
+    scenario = Scenario.from_design(_manifest(), dt_s=3600.0, seed=2)
+    state = scenario.simulate(24 * 30, out=tmp_path / "run")
+
+    out = load_outputs(tmp_path / "run")
+    assert state.step == 720
+    assert out["power.soc_kWh"].shape == (720,)
+    assert np.array_equal(out["thermal.time_s"], out["power.time_s"])
+    assert np.isfinite(out["thermal.mean_c"]).all()
+    assert out["thermal.max_c"].max() > 20.0  # occupants warm the rooms
+    housed = state.manifest.occupants[:8].sum()
+    assert housed == sum(state.values["census"].values()) - out["population.unhoused"][-1]
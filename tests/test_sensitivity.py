@@ -0,0 +1,39 @@
+"""
+test_sensitivity.py
+-------------------
+Checks for batched gradients of ship totals against spec parameters.
+"""
+
+import numpy as np
+import pytest
+
+from ship.rates import compile_rates, default_manifest
+from ship.sensitivity import dependents, gradients
+
+
+def test_gradients_match_brute_force_differences():
+    model = compile_rates(default_manifest())
+    n = len(model)
+    h = 1e-6 * np.maximum(np.abs(model.base), 1.0)
+    plus, minus = model.batch(n), model.batch(n)
+    plus[np.arange(n), np.arange(n)] += h
+    minus[np.arange(n), np.arange(n)] -= h
+    up, down = model.evaluate(plus), model.evaluate(minus)
+
+    for method in ("complex", "central", "forward"):
+        result = gradients(model, method=method)
+        assert result.rows_evaluated < n * len(model.terms)  # only dependent terms are perturbed
+        for key, grad in result.gradient.items():
+            assert grad == pytest.approx((up[key] - down[key]) / (2 * h), abs=1e-6), (method, key)
+
+
+def test_ranking_and_dependencies_of_a_room_parameter():
+    model = compile_rates(default_manifest())
+    dorm_rp = "hvac.rooms.dorm.ventilation.Rp_Lps_per_person"
+    assert set(dependents(model)[dorm_rp]) == {"room:child_dorm_8", "room:dorm_communal_8"}
+
+    result = gradients(model, [dorm_rp, "hvac.defaults.ventilation.Rp_Lps_per_person"])
+    assert result.gradient["ventilation_Lps"] == pytest.approx([16.0, 0.0])  # two 8-person dorms
+    (name, grad, elasticity), = result.ranked("ventilation_Lps")
+    assert name == dorm_rp and grad == pytest.approx(16.0)
+    assert elasticity == pytest.approx(16.0 * result.values[0] / result.totals["ventilation_Lps"])
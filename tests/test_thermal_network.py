@@ -0,0 +1,279 @@
+"""
+test_thermal_network.py
+-----------------------
+Lightweight checks for thermal network assembly and solvers.
+"""
+
+import math
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from thermal.network import ThermalEdge, ThermalNetwork, ThermalNode
+import thermal.transient as transient
+from thermal.transient import get_factorization, partition_digest
+
+
+def _two_node_network() -> ThermalNetwork:
+    net = ThermalNetwork()
+    net.add_node(ThermalNode("cabin", capacity_kj_per_k=100.0, temperature_c=30.0))
+    net.add_node(ThermalNode("hull", temperature_c=0.0, fixed=True))
+    net.add_edge(ThermalEdge("cabin", "hull", conductance_kw_per_k=0.5))
+    return net
+
+
+def test_backward_euler_tracks_exponential_decay():
+    net = _two_node_network()
+    stepper = net.transient(dt_s=1.0)
+    chunks = list(stepper.run(n_steps=400, chunk_steps=128, record=["cabin"]))
+
+    assert [c.temperatures_c.shape[0] for c in chunks] == [128, 128, 128, 16]
+    expected = 30.0 * math.exp(-0.5 / 100.0 * 400.0)
+    assert abs(net.nodes["cabin"].temperature_c - expected) < 0.05
+    assert net.nodes["hull"].temperature_c == 0.0
+
+
+def test_factorization_reused_until_conductance_changes():
+    net = _two_node_network()
+    first = get_factorization(net, 60.0)
+    assert get_factorization(net, 60.0) is first
+
+    net.set_conductance("hull", "cabin", 1.0)
+    assert get_factorization(net, 60.0) is not first
+
+
+def test_crank_nicolson_is_second_order_accurate():
+    net = _two_node_network()
+    list(net.transient(dt_s=20.0, theta=0.5).run(n_steps=20))
+    expected = 30.0 * math.exp(-0.5 / 100.0 * 400.0)
+    assert np.isclose(net.nodes["cabin"].temperature_c, expected, atol=0.01)
+
+
+def test_crank_nicolson_stays_second_order_with_time_varying_loads():
+    # C·dT/dt = -G·T + sin(ωt): exact solution for T(0) = 0.
+    C, G, w, t_end = 100.0, 0.5, 2 * math.pi / 400.0, 400.0
+    a = G / C
+    exact = (a * math.sin(w * t_end) - w * math.cos(w * t_end) + w * math.exp(-a * t_end)) / (C * (a * a + w * w))
+
+    errors = []
+    for dt in (20.0, 10.0):
+        net = _two_node_network()
+        net.nodes["cabin"].temperature_c = 0.0
+        loads = lambda t: np.array([math.sin(w * t), 0.0])
+        list(net.transient(dt_s=dt, theta=0.5).run(n_steps=int(t_end / dt), loads=loads))
+        errors.append(abs(net.nodes["cabin"].temperature_c - exact))
+    assert errors[0] / errors[1] == pytest.approx(4.0, rel=0.1)
+
+
+def test_bulk_construction_and_csr_neighbours():
+    net = ThermalNetwork()
+    idx = net.add_nodes([f"panel_{i}" for i in range(5)], capacity_kj_per_k=2.0)
+    net.add_edges(idx[:-1], idx[1:], 0.25)
+    assert sorted(net.neighbors("panel_2")) == [("panel_1", 0.25), ("panel_3", 0.25)]
+
+    # Edges added after the first query are merged into the CSR incrementally.
+    net.add_edge(ThermalEdge("panel_0", "panel_4", 1.0))
+    assert sorted(net.neighbors("panel_4")) == [("panel_0", 1.0), ("panel_3", 0.25)]
+    assert net.degree().tolist() == [2, 2, 2, 2, 2]
+    assert net.summary() == {"nodes": 5, "edges": 5}
+
+
+def test_builder_emits_two_nodes_per_room_plus_boundary():
+    from ship.manifest import ShipManifest
+    from thermal.builder import room_network_arrays
+
+    manifest = ShipManifest.from_columns(
+        type_id="dorm_communal_8", floor_area_m2=[28.0, 28.0, 70.0], height_m=2.6
+    )
+    arrays = room_network_arrays(manifest, boundary_temperature_c=-10.0)
+    net = arrays.to_network()
+
+    assert net.summary() == {"nodes": 7, "edges": 3 + 2 + 3}
+    assert net.node("boundary").fixed
+    # Walls carry far more thermal mass than the zone air they enclose.
+    cap = net.capacity_vector()
+    assert np.all(cap[3:6] > 10 * cap[:3])
+
+
+def test_material_table_gathers_by_index():
+    from thermal.materials import get_material_properties, get_materials, get_material_table
+
+    table = get_material_table()
+    rows = table.indices(["regolith_brick", "aluminum_alloy_6061", "regolith_brick"])
+    assert rows[0] == rows[2]
+    assert table.thermal_conductivity_W_per_mK[rows].tolist() == [1.0, 167.0, 1.0]
+    assert table.ids[table.category_index("structural")] == "aluminum_alloy_6061"
+    # Materials without a yield strength compile to NaN rather than failing.
+    assert np.isnan(table.yield_strength_MPa[table.index_of("polyethylene_shield")])
+    assert get_material_table() is table
+    assert get_material_properties(get_materials(), "regolith_brick")["density_kg_per_m3"] == 2200
+
+
+def test_radiator_steady_state_matches_stefan_boltzmann(tmp_path):
+    from common.physics import STEFAN_BOLTZMANN
+    from thermal.radiation import cached_view_factors
+
+    net = ThermalNetwork()
+    net.add_node(ThermalNode("radiator", heat_load_kw=10.0))
+    net.add_node(ThermalNode("space", temperature_c=-270.15, fixed=True))
+    net.add_radiative_edges(["radiator"], ["space"], area_m2=50.0, view_factor=1.0, emissivity_to=1.0)
+    result = net.solve_steady()
+
+    expected_k = (10_000.0 / (STEFAN_BOLTZMANN * 50.0 * 0.9) + 3.0**4) ** 0.25
+    assert result.converged and result.iterations <= 6
+    assert abs(net.node("radiator").temperature_c - (expected_k - 273.15)) < 1e-6
+
+    # Facing unit patches 1 m apart; second call must come from the disk cache.
+    centroids = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+    normals = np.array([[0.0, 0.0, 1.0], [0.0, 0.0, -1.0]])
+    i, j, f = cached_view_factors(centroids, normals, np.ones(2), cache_dir=tmp_path)
+    assert np.allclose(f, 1.0 / np.pi)
+    assert i.tolist() == [0] and j.tolist() == [1]  # one triplet per pair
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+    assert np.array_equal(cached_view_factors(centroids, normals, np.ones(2), cache_dir=tmp_path)[2], f)
+
+
+def test_partitioned_step_matches_single_lu(monkeypatch):
+    from thermal.transient import clear_factorizations
+
+    net = ThermalNetwork()
+    idx = net.add_nodes([f"p{i}" for i in range(400)], capacity_kj_per_k=5.0).reshape(20, 20)
+    net.add_edges(idx[:, :-1].ravel(), idx[:, 1:].ravel(), 0.3)
+    net.add_edges(idx[:-1, :].ravel(), idx[1:, :].ravel(), 0.3)
+    net.add_node(ThermalNode("space", temperature_c=-270.0, fixed=True))
+    net.add_edges(idx[0], ["space"] * 20, 0.1)
+
+    parts = net.partition(4)
+    assert np.bincount(parts).tolist() == [100, 100, 100, 101]
+
+    T, q = net.temperature_vector(), net.load_vector()
+    reference = net.transient(600.0).step(T, q)
+    for workers in (0, 2):
+        stepped = net.transient(600.0, parts=parts, workers=workers).step(T, q)
+        assert np.allclose(stepped, reference, atol=1e-10)
+    clear_factorizations(net)
+
+    # The cache key is independent of PYTHONHASHSEED (stable across processes).
+    script = "import numpy as np; from thermal.transient import partition_digest; print(partition_digest(np.arange(9) % 4))"
+    seen = {
+        subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONHASHSEED": seed, "PYTHONPATH": os.path.dirname(os.path.dirname(os.path.abspath(__file__)))},
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+    assert seen == {partition_digest(np.arange(9) % 4)}
+
+    # The stepper hashes its partition once, not on every step.
+    stepper = net.transient(600.0, parts=parts)
+    hashed = []
+    monkeypatch.setattr(transient, "partition_digest", lambda p: hashed.append(p) or "rehashed")
+    for _ in range(3):
+        T = stepper.step(T, q)
+    assert not hashed
+    clear_factorizations(net)
+
+
+def test_reduced_model_tracks_outputs_within_tolerance():
+    net = ThermalNetwork()
+    idx = net.add_nodes(
+        [f"p{i}" for i in range(900)], capacity_kj_per_k=50.0, temperature_c=20.0
+    ).reshape(30, 30)
+    net.add_edges(idx[:, :-1].ravel(), idx[:, 1:].ravel(), 0.2)
+    net.add_edges(idx[:-1, :].ravel(), idx[1:, :].ravel(), 0.2)
+    net.add_node(ThermalNode("space", temperature_c=-50.0, fixed=True))
+    net.add_edges(idx[0], ["space"] * 30, 0.05)
+    net.set_loads(np.where(np.arange(net.n_nodes) == idx[15, 15], 2.0, 0.0))
+
+    outputs = ["p0", "p465", "p899"]
+    model = net.reduce(outputs, tol_k=0.05, dt_s=3600.0, validate_steps=200)
+    assert model.order < 100 and model.error_k <= 0.05 and model.converged
+    with pytest.warns(RuntimeWarning, match="max_order"):
+        capped = net.reduce(outputs, tol_k=1e-6, dt_s=3600.0, validate_steps=20, max_order=12)
+    assert capped.order == 12 and not capped.converged and capped.error_k > 1e-6
+
+    reference = next(net.transient(3600.0).run(500, record=outputs, write_back=False, chunk_steps=500))
+    reduced = next(model.run(500, 3600.0, chunk_steps=500))
+    assert np.abs(reduced.temperatures_c - reference.temperatures_c).max() < 0.1
+
+    kron = net.reduce(outputs, method="kron", validate_steps=50)
+    assert kron.order == 3
+    # Kron reduction is exact once the network settles.
+    steady = next(kron.run(1, 1e12)).temperatures_c[-1]
+    exact = next(net.transient(1e12).run(1, record=outputs, write_back=False)).temperatures_c[-1]
+    assert np.allclose(steady, exact, atol=1e-6)
+
+
+def test_reduction_of_a_network_without_fixed_nodes():
+    net = ThermalNetwork()
+    idx = net.add_nodes([f"n{i}" for i in range(5)], capacity_kj_per_k=10.0, temperature_c=20.0)
+    net.add_edges(idx[:-1], idx[1:], 0.5)  # adiabatic chain: G alone is singular
+    net.set_loads(np.r_[1.0, 0.0, 0.0, 0.0, 0.0])
+    model = net.reduce(["n4"], tol_k=0.01, dt_s=600.0, validate_steps=50)
+    assert model.converged and model.order < 5
+
+    massless = ThermalNetwork()
+    idx = massless.add_nodes(["a", "b"])
+    massless.add_edges(idx[:1], idx[1:], 0.5)
+    with pytest.raises(ValueError, match="singular"):
+        massless.reduce(["a"], validate_steps=1)
+
+
+def test_save_load_round_trip_with_stored_factorization(tmp_path):
+    from thermal.transient import clear_factorizations
+
+    net = ThermalNetwork()
+    idx = net.add_nodes([f"p{i}" for i in range(100)], capacity_kj_per_k=5.0, temperature_c=20.0)
+    net.add_edges(idx[:-1], idx[1:], 0.3)
+    net.add_node(ThermalNode("space", temperature_c=-270.0, fixed=True))
+    net.add_edges([0], ["space"], 0.1)
+    T, q = net.temperature_vector(), net.load_vector()
+    reference = net.transient(600.0).step(T, q)
+
+    net.save(tmp_path / "net", factorizations=True)
+    loaded = ThermalNetwork.load(tmp_path / "net")
+    assert isinstance(loaded._capacity.view, np.memmap)
+    assert loaded._id_blob is not None  # IDs not decoded yet
+    assert np.allclose(loaded.transient(600.0).step(T, q), reference, atol=1e-12)
+    assert type(loaded.transient(600.0).factorization.lu).__name__ == "StoredLU"
+
+    assert sorted(loaded.neighbors("p1")) == [("p0", 0.3), ("p2", 0.3)]
+    loaded.add_edges(["p5"], ["space"], 0.2)  # mutating a loaded network is allowed
+    assert loaded.degree()[5] == 3
+    assert np.load(tmp_path / "net" / "edge_src.npy").size == 100  # file untouched
+
+    loaded.save(tmp_path / "net")  # overwrite: the old snapshot is swapped out, then removed
+    assert [p.name for p in tmp_path.iterdir()] == ["net"]
+    assert ThermalNetwork.load(tmp_path / "net").n_edges == 101
+    clear_factorizations()
+
+
+def test_node_and_edge_views_write_through():
+    net = _two_node_network()
+    revision = net.revision
+    net.nodes["cabin"].temperature_c = 25.0
+    assert net.temperature_vector()[0] == 25.0
+    assert net.revision == revision  # temperatures do not invalidate factorizations
+
+    net.edges[-1].conductance_kw_per_k = 2.0
+    assert net.neighbors("cabin") == [("hull", 2.0)]
+    assert net.revision > revision
+    assert [e.to_node for e in net.edges[:]] == ["hull"]
+    with pytest.raises(TypeError):
+        net.edges["cabin"]
+
+
+def test_view_factor_blocks_cover_each_pair_once():
+    from thermal.radiation import view_factors
+
+    rng = np.random.default_rng(3)
+    centroids, normals = rng.normal(size=(300, 3)) * 4.0, rng.normal(size=(300, 3))
+    areas = rng.uniform(0.1, 1.0, 300)
+    i, j, f = view_factors(centroids, normals, areas, block_size=7)
+    assert np.all(i < j)
+    assert np.unique(i * 300 + j).size == i.size
+    budgeted = view_factors(centroids, normals, areas, memory_budget_bytes=64 * 2**10)
+    assert all(np.array_equal(a, b) for a, b in zip((i, j, f), budgeted))
@@ -0,0 +1,43 @@
+"""
+test_uncertainty.py
+-------------------
+Checks for Monte Carlo propagation of spec uncertainty.
+"""
+
+import numpy as np
+import pytest
+
+from ship.rates import compile_rates
+from ship.uncertainty import Distribution, declared_distributions, run_monte_carlo
+
+
+def test_streams_are_independent_of_worker_count():
+    model = compile_rates()
+    kwargs = dict(n_samples=6_000, batch_size=1_000, seed=5)
+    serial = run_monte_carlo(model, workers=0, **kwargs)
+    pooled = run_monte_carlo(model, workers=2, **kwargs)
+    assert serial.parameters == tuple(declared_distributions(model))
+    for key in serial.outputs:
+        assert np.array_equal(serial.outputs[key], pooled.outputs[key]), key
+
+
+def test_bands_match_analytic_distribution_and_converge():
+    model = compile_rates()
+    rp = "hvac.rooms.dorm.ventilation.Rp_Lps_per_person"
+    result = run_monte_carlo(
+        model,
+        {rp: Distribution("uniform", 2.0, 3.0)},
+        n_samples=200_000,
+        batch_size=10_000,
+        workers=0,
+        rtol=0.002,
+        stop_when_converged=True,
+    )
+    assert result.converged and result.n_samples < 200_000
+    base = float(model.evaluate()["ventilation_Lps"])
+    occupants = 16.0  # two 8-person dorms in the default manifest
+    p5, p50, p95 = result.bands["ventilation_Lps"]
+    low = base + occupants * (2.0 - model.base[model.index_of(rp)])
+    assert p5 == pytest.approx(low + occupants * 0.05, abs=0.1)
+    assert p50 == pytest.approx(low + occupants * 0.5, abs=0.1)
+    assert p95 == pytest.approx(low + occupants * 0.95, abs=0.1)
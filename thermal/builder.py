@@ -0,0 +1,187 @@
+"""
+builder.py
+-----------
+Generate a ThermalNetwork from room geometry and the materials library.
+
+Model (per room i)
+    • ``<type>[i]/air``  — zone air node, C = ρ_air·cp_air·V
+    • ``<type>[i]/wall`` — lumped envelope node, C = ρ·cp·A_env·t
+      (A_env = four walls of a square footprint + floor + ceiling)
+    • air ↔ wall: surface film in series with half the wall thickness
+    • air_i ↔ air_j for each adjacent pair: film + bulkhead + film;
+      bulkhead mass is split between the two rooms' wall nodes
+    • optional fixed ``boundary`` node coupled to every wall node through
+      the other half of the wall (exterior fraction of the envelope)
+
+Materials come from ``materials.yaml``: walls default to the ``structural``
+category material, bulkheads to ``interior``. Rooms are mapped to rows of the
+compiled MaterialTable and properties are gathered by fancy indexing, so cost
+scales with the number of rooms only through NumPy array work.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from common.physics import air_density_kg_per_m3, cp_dry_air_J_per_kgK
+from ship.manifest import ShipManifest
+from thermal.materials import MaterialTable, compile_materials, get_material_table
+from thermal.network import ThermalNetwork
+
+MaterialChoice = Union[None, str, Sequence[str], np.ndarray]
+
+BOUNDARY_NODE_ID = "boundary"
+
+
+@dataclass
+class NetworkArrays:
+    """Bulk node/edge arrays ready for ThermalNetwork.add_nodes/add_edges."""
+
+    node_ids: List[str]
+    capacity_kj_per_k: np.ndarray
+    temperature_c: np.ndarray
+    fixed: np.ndarray
+    edge_from: np.ndarray
+    edge_to: np.ndarray
+    conductance_kw_per_k: np.ndarray
+
+    def to_network(self, network: Optional[ThermalNetwork] = None) -> ThermalNetwork:
+        """Append these arrays onto ``network`` (or a new one) in two bulk calls."""
+
+        net = network if network is not None else ThermalNetwork()
+        offset = net.n_nodes
+        net.add_nodes(
+            self.node_ids,
+            capacity_kj_per_k=self.capacity_kj_per_k,
+            temperature_c=self.temperature_c,
+            fixed=self.fixed,
+        )
+        net.add_edges(self.edge_from + offset, self.edge_to + offset, self.conductance_kw_per_k)
+        return net
+
+
+def _material_rows(
+    table: MaterialTable, choice: MaterialChoice, category: str, n: int
+) -> np.ndarray:
+    """Return one material-table row per room (category default when choice is None)."""
+
+    if choice is None:
+        return np.full(n, table.category_index(category), dtype=np.int64)
+    return np.broadcast_to(table.indices(choice), (n,))
+
+
+def room_network_arrays(
+    manifest: ShipManifest,
+    *,
+    materials_cfg: Optional[Dict[str, Any]] = None,
+    materials: Optional[MaterialTable] = None,
+    wall_material: MaterialChoice = None,
+    bulkhead_material: MaterialChoice = None,
+    wall_category: str = "structural",
+    bulkhead_category: str = "interior",
+    wall_thickness_m: float = 0.05,
+    bulkhead_thickness_m: float = 0.02,
+    film_coefficient_W_per_m2K: float = 3.0,
+    adjacency: Optional[np.ndarray] = None,
+    boundary_temperature_c: Optional[float] = None,
+    exterior_fraction: Union[float, np.ndarray] = 1.0,
+    initial_temperature_c: float = 20.0,
+) -> NetworkArrays:
+    """
+    Derive node capacities and edge conductances for every room in bulk.
+
+    Parameters
+    ----------
+    adjacency : (m, 2) int array of room-row pairs sharing a bulkhead. Defaults
+                to consecutive manifest rows (rooms strung along a corridor).
+    boundary_temperature_c : add a fixed boundary node at this temperature.
+    exterior_fraction : share of each envelope that faces the boundary.
+    """
+
+    if materials is None:
+        materials = (
+            compile_materials(materials_cfg) if materials_cfg is not None else get_material_table()
+        )
+    n = len(manifest)
+    area = manifest.floor_area_m2
+    height = manifest.height_m
+    side = np.sqrt(area)
+    envelope_m2 = 4.0 * side * height + 2.0 * area
+
+    # --- air ---------------------------------------------------------------
+    rho_air = air_density_kg_per_m3(293.15)
+    cp_air_kJ = cp_dry_air_J_per_kgK(293.15) / 1000.0
+    air_cap = rho_air * cp_air_kJ * manifest.volume_m3
+
+    # --- walls -------------------------------------------------------------
+    wall_rows = _material_rows(materials, wall_material, wall_category, n)
+    w_rho = materials.density_kg_per_m3[wall_rows]
+    w_cp = materials.specific_heat_J_per_kgK[wall_rows]
+    w_k = materials.thermal_conductivity_W_per_mK[wall_rows]
+    wall_cap = w_rho * w_cp * envelope_m2 * wall_thickness_m / 1000.0
+
+    h = film_coefficient_W_per_m2K
+    air_wall_g = envelope_m2 / (1.0 / h + wall_thickness_m / (2.0 * w_k)) / 1000.0
+
+    # --- bulkheads ---------------------------------------------------------
+    if adjacency is None:
+        rows = np.arange(n - 1, dtype=np.int64)
+        pairs = np.column_stack([rows, rows + 1]) if n > 1 else np.empty((0, 2), np.int64)
+    else:
+        pairs = np.asarray(adjacency, dtype=np.int64).reshape(-1, 2)
+    a, b = pairs[:, 0], pairs[:, 1]
+    shared_m2 = np.minimum(side[a], side[b]) * np.minimum(height[a], height[b])
+
+    bulk_rows = _material_rows(materials, bulkhead_material, bulkhead_category, n)[a]
+    b_rho = materials.density_kg_per_m3[bulk_rows]
+    b_cp = materials.specific_heat_J_per_kgK[bulk_rows]
+    b_k = materials.thermal_conductivity_W_per_mK[bulk_rows]
+    bulk_g = shared_m2 / (2.0 / h + bulkhead_thickness_m / b_k) / 1000.0
+    half_mass_cap = 0.5 * b_rho * b_cp * shared_m2 * bulkhead_thickness_m / 1000.0
+    np.add.at(wall_cap, a, half_mass_cap)
+    np.add.at(wall_cap, b, half_mass_cap)
+
+    # --- assemble (air nodes 0..n-1, wall nodes n..2n-1) --------------------
+    air_idx = np.arange(n, dtype=np.int64)
+    wall_idx = air_idx + n
+    node_ids = [f"{t}[{i}]/air" for i, t in enumerate(manifest.type_id.tolist())]
+    node_ids += [f"{t}[{i}]/wall" for i, t in enumerate(manifest.type_id.tolist())]
+    capacity = np.concatenate([air_cap, wall_cap])
+    fixed = np.zeros(2 * n, dtype=bool)
+
+    edge_from = [air_idx, a]
+    edge_to = [wall_idx, b]
+    conductance = [air_wall_g, bulk_g]
+
+    if boundary_temperature_c is not None:
+        exterior_m2 = envelope_m2 * np.broadcast_to(np.asarray(exterior_fraction, dtype=float), (n,))
+        exposed = np.flatnonzero(exterior_m2 > 0.0)
+        node_ids.append(BOUNDARY_NODE_ID)
+        capacity = np.append(capacity, 0.0)
+        fixed = np.append(fixed, True)
+        edge_from.append(wall_idx[exposed])
+        edge_to.append(np.full(exposed.size, 2 * n, dtype=np.int64))
+        conductance.append(exterior_m2[exposed] * 2.0 * w_k[exposed] / wall_thickness_m / 1000.0)
+
+    temperature = np.full(len(node_ids), float(initial_temperature_c))
+    if boundary_temperature_c is not None:
+        temperature[-1] = boundary_temperature_c
+
+    return NetworkArrays(
+        node_ids=node_ids,
+        capacity_kj_per_k=capacity,
+        temperature_c=temperature,
+        fixed=fixed,
+        edge_from=np.concatenate(edge_from),
+        edge_to=np.concatenate(edge_to),
+        conductance_kw_per_k=np.concatenate(conductance),
+    )
+
+
+def build_room_network(manifest: ShipManifest, **kwargs: Any) -> ThermalNetwork:
+    """Convenience wrapper: ``room_network_arrays(...).to_network()``."""
+
+    return room_network_arrays(manifest, **kwargs).to_network()
@@ -0,0 +1,492 @@
+"""
+fluids.py
+----------
+Built-in working-fluid property tables (CO2, NH3, H2O) for heat-recovery
+cycle calculations, without an external property library.
+
+Model
+    • Peng–Robinson cubic EOS for residual properties plus ideal-gas
+      cp(T) polynomials (Poling/Prausnitz/O'Connell, cp = A + BT + CT² + DT³
+      in J/mol/K). Saturation from equal fugacities.
+    • IIR reference state: saturated liquid at 0 °C has h = 200 kJ/kg,
+      s = 1 kJ/kg/K. Differences (duties, compressor work) are what the
+      cycle code uses; absolute values match other IIR-based tables only
+      to EOS accuracy.
+    • Accuracy is that of a cubic EOS: vapour pressures and vapour
+      enthalpies within a few percent, liquid densities ~10-25 % off (PR's
+      known weakness). Adequate for sizing sweeps, not for custody transfer.
+
+Tables (built offline, cached as memory-mapped .npy files)
+    • Axes: log-uniform pressure, uniform T and uniform h, so a lookup is
+      an O(1) index computation followed by bilinear interpolation.
+    • (p, T): h, s, ρ on both the liquid-like and vapour-like EOS roots;
+      queries pick the branch from T_sat(p), so cells never blend phases.
+    • (p, h): T, s on each pressure row, built by inverting h(p, T) with
+      the saturated end points inserted. Inside the dome, queries use the
+      saturated-line arrays and the lever rule directly (exact x, T_sat).
+
+Usage:
+    tables = get_fluid_tables(WorkingFluid.CO2)
+    out = props_ph(WorkingFluid.CO2, p_Pa=p_array, h_kJ_per_kg=h_array)
+    out["T_K"], out["s_kJ_per_kgK"], out["x"]
+
+Pre-build every table with ``python scripts/build_fluid_tables.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from common.physics import MOLAR_GAS_CONSTANT
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "fluid_tables"
+TABLE_FORMAT = 1
+
+_SQRT2 = np.sqrt(2.0)
+_T_REF_K = 273.15
+_H_REF_KJ = 200.0
+_S_REF_KJ = 1.0
+
+
+@dataclass(frozen=True)
+class FluidConstants:
+    """Critical constants, acentric factor, molar mass and ideal-gas cp."""
+
+    name: str
+    M_kg_per_mol: float
+    Tc_K: float
+    Pc_Pa: float
+    omega: float
+    cp_coeffs: Tuple[float, float, float, float]  # J/mol/K
+    T_range_K: Tuple[float, float]
+    p_range_Pa: Tuple[float, float]
+
+
+FLUIDS: Dict[str, FluidConstants] = {
+    "CO2": FluidConstants(
+        "CO2", 0.04401, 304.13, 7.3773e6, 0.2239,
+        (19.80, 7.344e-2, -5.602e-5, 1.715e-8), (220.0, 500.0), (2.0e5, 2.0e7),
+    ),
+    "NH3": FluidConstants(
+        "NH3", 0.017031, 405.40, 11.333e6, 0.2560,
+        (27.31, 2.383e-2, 1.707e-5, -1.185e-8), (200.0, 500.0), (1.0e4, 8.0e6),
+    ),
+    "H2O": FluidConstants(
+        "H2O", 0.018015, 647.096, 22.064e6, 0.3443,
+        (32.24, 1.924e-3, 1.055e-5, -3.596e-9), (274.0, 700.0), (6.0e2, 5.0e6),
+    ),
+}
+
+
+def _key(fluid) -> str:
+    return getattr(fluid, "value", fluid)
+
+
+def fluid_constants(fluid) -> FluidConstants:
+    try:
+        return FLUIDS[_key(fluid)]
+    except KeyError:
+        raise KeyError(f"No built-in property model for fluid '{_key(fluid)}'.") from None
+
+
+# ---------------------------------------------------------------------------
+# Peng–Robinson EOS (vectorized, molar units)
+# ---------------------------------------------------------------------------
+def _pr_params(fc: FluidConstants, T: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+    R = MOLAR_GAS_CONSTANT
+    kappa = 0.37464 + 1.54226 * fc.omega - 0.26992 * fc.omega**2
+    sqrt_alpha = 1.0 + kappa * (1.0 - np.sqrt(T / fc.Tc_K))
+    ac = 0.45724 * R**2 * fc.Tc_K**2 / fc.Pc_Pa
+    a = ac * sqrt_alpha**2
+    da_dT = -ac * kappa * sqrt_alpha / np.sqrt(T * fc.Tc_K)
+    b = 0.07780 * R * fc.Tc_K / fc.Pc_Pa
+    return a, da_dT, b
+
+
+def _cubic_roots(A: np.ndarray, B: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Smallest and largest physical (Z > B) roots of the PR cubic."""
+
+    c2 = -(1.0 - B)
+    c1 = A - 3.0 * B**2 - 2.0 * B
+    c0 = -(A * B - B**2 - B**3)
+    p = c1 - c2**2 / 3.0
+    q = 2.0 * c2**3 / 27.0 - c2 * c1 / 3.0 + c0
+    disc = (q / 2.0) ** 2 + (p / 3.0) ** 3
+    shift = -c2 / 3.0
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        sq = np.sqrt(np.maximum(disc, 0.0))
+        one = np.cbrt(-q / 2.0 + sq) + np.cbrt(-q / 2.0 - sq) + shift
+        m = 2.0 * np.sqrt(np.maximum(-p / 3.0, 0.0))
+        p_neg = np.minimum(p, -1e-300)
+        arg = np.clip(3.0 * q / (2.0 * p_neg) * np.sqrt(-3.0 / p_neg), -1.0, 1.0)
+        phi = np.arccos(arg) / 3.0
+        roots = np.stack([m * np.cos(phi - 2.0 * np.pi * k / 3.0) + shift for k in range(3)])
+    three = disc < 0.0
+    roots = np.where(roots > B, roots, np.inf)
+    z_min = np.where(three, roots.min(axis=0), one)
+    roots = np.where(np.isfinite(roots), roots, -np.inf)
+    z_max = np.where(three, roots.max(axis=0), one)
+    z_min = np.where(np.isfinite(z_min), z_min, z_max)
+    return z_min, z_max
+
+
+def _ideal_h_s(fc: FluidConstants, T: np.ndarray, p: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Ideal-gas molar h, s relative to (T_ref, 1 bar), J/mol and J/mol/K."""
+
+    A, B, C, D = fc.cp_coeffs
+    R = MOLAR_GAS_CONSTANT
+    T0 = _T_REF_K
+
+    def h_int(t):
+        return A * t + B * t**2 / 2 + C * t**3 / 3 + D * t**4 / 4
+
+    def s_int(t):
+        return A * np.log(t) + B * t + C * t**2 / 2 + D * t**3 / 3
+
+    return h_int(T) - h_int(T0), s_int(T) - s_int(T0) - R * np.log(p / 1.0e5)
+
+
+def _residual(fc: FluidConstants, T: np.ndarray, p: np.ndarray, Z: np.ndarray):
+    """Residual molar h, s and ln φ for a chosen root Z."""
+
+    R = MOLAR_GAS_CONSTANT
+    a, da_dT, b = _pr_params(fc, T)
+    A = a * p / (R * T) ** 2
+    B = b * p / (R * T)
+    log_term = np.log((Z + (1.0 + _SQRT2) * B) / (Z + (1.0 - _SQRT2) * B))
+    h_res = R * T * (Z - 1.0) + (T * da_dT - a) / (2.0 * _SQRT2 * b) * log_term
+    s_res = R * np.log(Z - B) + da_dT / (2.0 * _SQRT2 * b) * log_term
+    ln_phi = Z - 1.0 - np.log(Z - B) - A / (2.0 * _SQRT2 * B) * log_term
+    return h_res, s_res, ln_phi
+
+
+def _eos_state(fc: FluidConstants, T: np.ndarray, p: np.ndarray):
+    """Per-branch molar (h, s, ρ[kg/m³], ln φ) for liquid-like and vapour-like roots."""
+
+    R = MOLAR_GAS_CONSTANT
+    a, _, b = _pr_params(fc, T)
+    z_liq, z_vap = _cubic_roots(a * p / (R * T) ** 2, b * p / (R * T))
+    h_ig, s_ig = _ideal_h_s(fc, T, p)
+    out = []
+    for Z in (z_liq, z_vap):
+        h_res, s_res, ln_phi = _residual(fc, T, p, Z)
+        rho = p * fc.M_kg_per_mol / (Z * R * T)
+        out.append((h_ig + h_res, s_ig + s_res, rho, ln_phi))
+    return out
+
+
+def saturation_pressure(fluid, T_K, *, max_iter: int = 200, tol: float = 1e-10) -> np.ndarray:
+    """Vectorized p_sat(T) [Pa] for T < Tc by fugacity successive substitution."""
+
+    fc = fluid_constants(fluid)
+    T = np.atleast_1d(np.asarray(T_K, dtype=float))
+    if np.any(T >= fc.Tc_K):
+        raise ValueError(f"Saturation requires T < Tc = {fc.Tc_K} K.")
+    # Wilson estimate, then p ← p·φ_L/φ_V.
+    p = fc.Pc_Pa * np.exp(5.373 * (1.0 + fc.omega) * (1.0 - fc.Tc_K / T))
+    for _ in range(max_iter):
+        (_, _, _, lnphi_l), (_, _, _, lnphi_v) = _eos_state(fc, T, p)
+        step = lnphi_l - lnphi_v
+        p = p * np.exp(step)
+        if np.all(np.abs(step) < tol):
+            break
+    return p
+
+
+# ---------------------------------------------------------------------------
+# Table generation
+# ---------------------------------------------------------------------------
+def _reference_offsets(fc: FluidConstants) -> Tuple[float, float]:
+    """Molar (h, s) offsets that put saturated liquid at 0 °C at IIR values."""
+
+    T0 = np.array([_T_REF_K])
+    p0 = saturation_pressure(fc.name, T0)
+    (h_l, s_l, _, _), _ = _eos_state(fc, T0, p0)
+    M = fc.M_kg_per_mol
+    return float(_H_REF_KJ * 1e3 * M - h_l[0]), float(_S_REF_KJ * 1e3 * M - s_l[0])
+
+
+def build_fluid_tables(
+    fluid, *, n_p: int = 240, n_T: int = 480, n_h: int = 480, n_sat: int = 400
+) -> Dict[str, np.ndarray]:
+    """Generate every table array for one fluid (mass units: kJ/kg, kJ/kg/K)."""
+
+    fc = fluid_constants(fluid)
+    M = fc.M_kg_per_mol
+    h_off, s_off = _reference_offsets(fc)
+    to_h = lambda h: (h + h_off) / M / 1e3  # noqa: E731 - molar J → kJ/kg
+    to_s = lambda s: (s + s_off) / M / 1e3  # noqa: E731
+
+    log_p = np.linspace(np.log(fc.p_range_Pa[0]), np.log(fc.p_range_Pa[1]), n_p)
+    T_axis = np.linspace(fc.T_range_K[0], fc.T_range_K[1], n_T)
+    P, T = np.meshgrid(np.exp(log_p), T_axis, indexing="ij")
+    (h_l, s_l, rho_l, _), (h_v, s_v, rho_v, _) = _eos_state(fc, T, P)
+
+    # Saturation line sampled in T, re-gridded onto the pressure axis.
+    T_sat_axis = np.linspace(fc.T_range_K[0], fc.Tc_K * 0.999, n_sat)
+    p_sat_axis = saturation_pressure(fc.name, T_sat_axis)
+    (hl, sl, rhol, _), (hv, sv, rhov, _) = _eos_state(fc, T_sat_axis, p_sat_axis)
+    p_axis = np.exp(log_p)
+    sub = (p_axis >= p_sat_axis[0]) & (p_axis <= p_sat_axis[-1])
+    lp_sat = np.log(p_sat_axis)
+
+    def on_p(values):
+        out = np.full(n_p, np.nan)
+        out[sub] = np.interp(log_p[sub], lp_sat, values)
+        return out
+
+    sat = {
+        "sat_T_K": on_p(T_sat_axis),
+        "sat_h_liq": on_p(to_h(hl)),
+        "sat_h_vap": on_p(to_h(hv)),
+        "sat_s_liq": on_p(to_s(sl)),
+        "sat_s_vap": on_p(to_s(sv)),
+        "sat_rho_liq": on_p(rhol),
+        "sat_rho_vap": on_p(rhov),
+    }
+
+    # Stable single phase on the (p, T) grid, used to invert h → T per row.
+    liquid = sub[:, None] & (T < sat["sat_T_K"][:, None])
+    h_st = np.where(liquid, to_h(h_l), to_h(h_v))
+    s_st = np.where(liquid, to_s(s_l), to_s(s_v))
+    h_axis = np.linspace(np.nanmin(h_st), np.nanmax(h_st), n_h)
+
+    T_ph = np.full((n_p, n_h), np.nan)
+    s_ph = np.full((n_p, n_h), np.nan)
+    for i in range(n_p):
+        row_h, row_T, row_s = h_st[i], T_axis, s_st[i]
+        if sub[i]:
+            # Insert saturated end points so interpolation never crosses the dome.
+            k = int(np.count_nonzero(liquid[i]))
+            Ts = sat["sat_T_K"][i]
+            row_h = np.concatenate([row_h[:k], [sat["sat_h_liq"][i], sat["sat_h_vap"][i]], row_h[k:]])
+            row_T = np.concatenate([row_T[:k], [Ts, Ts], row_T[k:]])
+            row_s = np.concatenate([row_s[:k], [sat["sat_s_liq"][i], sat["sat_s_vap"][i]], row_s[k:]])
+        T_ph[i] = np.interp(h_axis, row_h, row_T, left=np.nan, right=np.nan)
+        s_ph[i] = np.interp(h_axis, row_h, row_s, left=np.nan, right=np.nan)
+
+    return {
+        "log_p": log_p,
+        "T_axis": T_axis,
+        "h_axis": h_axis,
+        "pt_h_liq": to_h(h_l),
+        "pt_h_vap": to_h(h_v),
+        "pt_s_liq": to_s(s_l),
+        "pt_s_vap": to_s(s_v),
+        "pt_rho_liq": rho_l,
+        "pt_rho_vap": rho_v,
+        "ph_T_K": T_ph,
+        "ph_s": s_ph,
+        **sat,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Cached, memory-mapped tables
+# ---------------------------------------------------------------------------
+class FluidTables:
+    """Memory-mapped table arrays for one fluid plus O(1) grid lookups."""
+
+    def __init__(self, constants: FluidConstants, arrays: Dict[str, np.ndarray]) -> None:
+        self.constants = constants
+        self.arrays = arrays
+        self.log_p = arrays["log_p"]
+        self.T_axis = arrays["T_axis"]
+        self.h_axis = arrays["h_axis"]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    @staticmethod
+    def _locate(axis: np.ndarray, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Cell index and fractional offset on a uniform axis."""
+
+        step = (axis[-1] - axis[0]) / (axis.size - 1)
+        pos = (x - axis[0]) / step
+        i = np.clip(np.floor(pos).astype(np.int64), 0, axis.size - 2)
+        return i, pos - i
+
+    def bilinear(self, name: str, lp: np.ndarray, y: np.ndarray, y_axis: np.ndarray) -> np.ndarray:
+        table = self.arrays[name]
+        i, fx = self._locate(self.log_p, lp)
+        j, fy = self._locate(y_axis, y)
+        return (
+            table[i, j] * (1 - fx) * (1 - fy)
+            + table[i + 1, j] * fx * (1 - fy)
+            + table[i, j + 1] * (1 - fx) * fy
+            + table[i + 1, j + 1] * fx * fy
+        )
+
+    def saturation(self, lp: np.ndarray, name: str) -> np.ndarray:
+        """Linear interpolation of a saturated-line array in log p (NaN above p_c)."""
+
+        i, fx = self._locate(self.log_p, lp)
+        line = self.arrays[name]
+        return line[i] * (1 - fx) + line[i + 1] * fx
+
+
+_TABLES: Dict[Tuple[str, Path], FluidTables] = {}
+
+
+def _write_tables(directory: Path, fluid_name: str, arrays: Dict[str, np.ndarray]) -> None:
+    tmp = directory.with_name(f"{directory.name}.tmp-{os.getpid()}")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+    for name, values in arrays.items():
+        np.save(tmp / f"{name}.npy", values)
+    meta = {"format": TABLE_FORMAT, "fluid": fluid_name, "constants": fluid_constants(fluid_name).__dict__}
+    (tmp / "tables.json").write_text(json.dumps(meta, indent=2))
+    if directory.exists():
+        shutil.rmtree(directory)
+    os.replace(tmp, directory)
+
+
+def _tables_current(directory: Path, fluid_name: str) -> bool:
+    try:
+        meta = json.loads((directory / "tables.json").read_text())
+    except (OSError, ValueError):
+        return False
+    constants = json.loads(json.dumps(fluid_constants(fluid_name).__dict__))
+    return meta.get("format") == TABLE_FORMAT and meta.get("constants") == constants
+
+
+def get_fluid_tables(
+    fluid, *, cache_dir: Optional[Union[str, Path]] = None, rebuild: bool = False
+) -> FluidTables:
+    """Load (memory-mapped) or build-then-load the tables for ``fluid``."""
+
+    fc = fluid_constants(fluid)
+    root = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    key = (fc.name, root)
+    if not rebuild and key in _TABLES:
+        return _TABLES[key]
+
+    directory = root / fc.name
+    if rebuild or not _tables_current(directory, fc.name):
+        _write_tables(directory, fc.name, build_fluid_tables(fc.name))
+    arrays = {
+        path.stem: np.load(path, mmap_mode="r") for path in sorted(directory.glob("*.npy"))
+    }
+    _TABLES[key] = FluidTables(fc, arrays)
+    return _TABLES[key]
+
+
+def clear_fluid_tables() -> None:
+    """Forget loaded tables (files on disk are kept)."""
+
+    _TABLES.clear()
+
+
+# ---------------------------------------------------------------------------
+# Vectorized queries
+# ---------------------------------------------------------------------------
+def _check_range(tables: FluidTables, lp: np.ndarray) -> None:
+    if np.any(lp < tables.log_p[0] - 1e-12) or np.any(lp > tables.log_p[-1] + 1e-12):
+        lo, hi = np.exp(tables.log_p[[0, -1]])
+        raise ValueError(
+            f"Pressure outside {tables.constants.name} table range [{lo:.3g}, {hi:.3g}] Pa."
+        )
+
+
+def props_ph(fluid, p_Pa, h_kJ_per_kg, *, tables: Optional[FluidTables] = None) -> Dict[str, np.ndarray]:
+    """
+    Properties from (p, h): T_K, s_kJ_per_kgK and quality x (NaN outside the dome).
+
+    Points beyond the enthalpy range of the table come back as NaN.
+    """
+
+    tables = tables or get_fluid_tables(fluid)
+    p, h = np.broadcast_arrays(np.asarray(p_Pa, dtype=float), np.asarray(h_kJ_per_kg, dtype=float))
+    lp = np.log(p)
+    _check_range(tables, lp)
+
+    T = tables.bilinear("ph_T_K", lp, h, tables.h_axis)
+    s = tables.bilinear("ph_s", lp, h, tables.h_axis)
+    out_of_range = (h < tables.h_axis[0]) | (h > tables.h_axis[-1])
+    T = np.where(out_of_range, np.nan, T)
+    s = np.where(out_of_range, np.nan, s)
+
+    h_l = tables.saturation(lp, "sat_h_liq")
+    h_v = tables.saturation(lp, "sat_h_vap")
+    with np.errstate(invalid="ignore"):
+        x = (h - h_l) / (h_v - h_l)
+        two_phase = (x >= 0.0) & (x <= 1.0)
+    s_l = tables.saturation(lp, "sat_s_liq")
+    s_v = tables.saturation(lp, "sat_s_vap")
+    T = np.where(two_phase, tables.saturation(lp, "sat_T_K"), T)
+    s = np.where(two_phase, s_l + x * (s_v - s_l), s)
+    return {"T_K": T, "s_kJ_per_kgK": s, "x": np.where(two_phase, x, np.nan)}
+
+
+def props_pt(fluid, p_Pa, T_K, *, tables: Optional[FluidTables] = None) -> Dict[str, np.ndarray]:
+    """Single-phase properties from (p, T): h_kJ_per_kg, s_kJ_per_kgK, rho_kg_per_m3."""
+
+    tables = tables or get_fluid_tables(fluid)
+    p, T = np.broadcast_arrays(np.asarray(p_Pa, dtype=float), np.asarray(T_K, dtype=float))
+    lp = np.log(p)
+    _check_range(tables, lp)
+    if np.any(T < tables.T_axis[0]) or np.any(T > tables.T_axis[-1]):
+        raise ValueError(
+            f"Temperature outside {tables.constants.name} table range "
+            f"[{tables.T_axis[0]:.1f}, {tables.T_axis[-1]:.1f}] K."
+        )
+
+    with np.errstate(invalid="ignore"):
+        liquid = T < tables.saturation(lp, "sat_T_K")  # False above p_c (NaN)
+    out = {}
+    for key, stem in (("h_kJ_per_kg", "pt_h"), ("s_kJ_per_kgK", "pt_s"), ("rho_kg_per_m3", "pt_rho")):
+        liq = tables.bilinear(f"{stem}_liq", lp, T, tables.T_axis)
+        vap = tables.bilinear(f"{stem}_vap", lp, T, tables.T_axis)
+        out[key] = np.where(liquid, liq, vap)
+    return out
+
+
+def saturation_props(fluid, p_Pa, *, tables: Optional[FluidTables] = None) -> Dict[str, np.ndarray]:
+    """Saturated-line T, h and s at pressure p (NaN at or above p_c)."""
+
+    tables = tables or get_fluid_tables(fluid)
+    lp = np.log(np.asarray(p_Pa, dtype=float))
+    _check_range(tables, lp)
+    return {
+        "T_K": tables.saturation(lp, "sat_T_K"),
+        "h_liq_kJ_per_kg": tables.saturation(lp, "sat_h_liq"),
+        "h_vap_kJ_per_kg": tables.saturation(lp, "sat_h_vap"),
+        "s_liq_kJ_per_kgK": tables.saturation(lp, "sat_s_liq"),
+        "s_vap_kJ_per_kgK": tables.saturation(lp, "sat_s_vap"),
+    }
+
+
+def h_from_ps(
+    fluid, p_Pa, s_kJ_per_kgK, *, tables: Optional[FluidTables] = None, iterations: int = 40
+) -> np.ndarray:
+    """
+    Invert s(p, h) for h by vectorized bisection (s rises with h at fixed p).
+
+    Returns NaN where the entropy lies outside the tabulated row.
+    """
+
+    tables = tables or get_fluid_tables(fluid)
+    p, s = np.broadcast_arrays(np.asarray(p_Pa, dtype=float), np.asarray(s_kJ_per_kgK, dtype=float))
+    lo = np.full(p.shape, float(tables.h_axis[0]))
+    hi = np.full(p.shape, float(tables.h_axis[-1]))
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        s_mid = props_ph(fluid, p, mid, tables=tables)["s_kJ_per_kgK"]
+        # NaN rows ends: below the liquid range counts as "too low", beyond
+        # the hot end as "too high".
+        too_low = np.where(np.isnan(s_mid), mid < 0.5 * (tables.h_axis[0] + tables.h_axis[-1]), s_mid < s)
+        lo = np.where(too_low, mid, lo)
+        hi = np.where(too_low, hi, mid)
+    h = 0.5 * (lo + hi)
+    s_end = props_ph(fluid, p, h, tables=tables)["s_kJ_per_kgK"]
+    return np.where(np.abs(s_end - s) < 1e-3, h, np.nan)
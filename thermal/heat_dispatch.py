@@ -0,0 +1,207 @@
+"""
+heat_dispatch.py
+-----------------
+Assign loop heat from HeatSources to HeatSinks as a min-cost circulation.
+
+Graph
+    S → source i    capacity Q_out_W,  cost 0
+    source i → j    unbounded,         cost -priority_j + penalty·(T_i - T_j)
+    sink j → T      capacity Q_in_W,   cost 0
+    T → S           unbounded,         cost 0   (closes the circulation)
+
+    An i → j arc exists only when T_supply_i ≥ T_required_j + min_approach_K
+    (temperature-grade limit). ``priority`` is the value of one watt
+    delivered to the sink, so contested heat goes to the highest priority;
+    the small grade penalty steers low-grade heat to low-grade sinks and
+    keeps high-grade heat for sinks that need it.
+
+Solver
+    Cycle canceling: a circulation is optimal iff its residual graph has no
+    negative-cost cycle. Bellman–Ford (vectorized over arcs) finds one, the
+    bottleneck amount is pushed around it, repeat. Warm starts reuse the
+    previous flows, clipped to the new capacities: when only a few sources
+    change between calls, only a handful of cycles remain to cancel.
+
+Sizes are small (tens of devices), so a local solver beats an LP service.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from thermal.heat_recovery import HeatSink, HeatSource
+
+_EPS = 1e-9
+
+
+@dataclass
+class DispatchResult:
+    """Heat assignment for one dispatch call (all values in W)."""
+
+    flows_W: Dict[Tuple[str, str], float]
+    delivered_W: Dict[str, float]  # per sink
+    unserved_W: Dict[str, float]  # per sink: demand not met
+    used_W: Dict[str, float]  # per source
+    rejected_W: Dict[str, float]  # per source: must be dumped (radiators)
+    objective: float
+    cycles_canceled: int
+    notes: List[str] = field(default_factory=list)
+
+    @property
+    def total_delivered_W(self) -> float:
+        return float(sum(self.delivered_W.values()))
+
+
+def _bellman_ford_cycle(
+    n_nodes: int, u: np.ndarray, v: np.ndarray, cost: np.ndarray
+) -> Optional[np.ndarray]:
+    """Return residual-edge indices of one negative cycle, or None."""
+
+    dist = np.zeros(n_nodes)
+    pred = np.full(n_nodes, -1, dtype=np.int64)
+    last = -1
+    for _ in range(n_nodes):
+        cand = dist[u] + cost
+        order = np.lexsort((cand, v))
+        first = order[np.r_[True, v[order][1:] != v[order][:-1]]]
+        improved = first[cand[first] < dist[v[first]] - _EPS]
+        if improved.size == 0:
+            return None
+        dist[v[improved]] = cand[improved]
+        pred[v[improved]] = improved
+        last = int(v[improved[0]])
+
+    # Still relaxing after n passes: walk back n steps to land on the cycle.
+    node = last
+    for _ in range(n_nodes):
+        node = int(u[pred[node]])
+    cycle, start = [], node
+    while True:
+        edge = int(pred[node])
+        cycle.append(edge)
+        node = int(u[edge])
+        if node == start:
+            break
+    return np.asarray(cycle[::-1], dtype=np.int64)
+
+
+class HeatDispatcher:
+    """
+    Reusable dispatcher; keeps the last solution as a warm start.
+
+    Example:
+        dispatcher = HeatDispatcher(min_approach_K=5.0)
+        for minute in range(n):
+            update_sources(loop.sources)
+            result = dispatcher.dispatch(loop.sources, loop.sinks)
+    """
+
+    def __init__(
+        self,
+        *,
+        min_approach_K: float = 5.0,
+        grade_penalty_per_K: float = 1e-3,
+        max_cycles: int = 10_000,
+    ) -> None:
+        self.min_approach_K = float(min_approach_K)
+        self.grade_penalty_per_K = float(grade_penalty_per_K)
+        self.max_cycles = int(max_cycles)
+        self._previous: Dict[Tuple[str, str], float] = {}
+
+    def reset(self) -> None:
+        """Forget the warm start."""
+
+        self._previous.clear()
+
+    def _pairs(
+        self, sources: Sequence[HeatSource], sinks: Sequence[HeatSink]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        t_src = np.array([np.nan if s.T_supply_C is None else s.T_supply_C for s in sources], dtype=float)
+        t_snk = np.array([np.nan if s.T_required_C is None else s.T_required_C for s in sinks], dtype=float)
+        prio = np.array([s.priority for s in sinks], dtype=float)
+        lift = t_src[:, None] - t_snk[None, :]
+        known = ~np.isnan(lift)
+        ok = ~known | (lift >= self.min_approach_K - _EPS)
+        cost = -prio[None, :] + self.grade_penalty_per_K * np.where(known, np.maximum(lift, 0.0), 0.0)
+        # Pairs that cannot profit (priority ≤ penalty) never carry flow.
+        ok &= cost < 0.0
+        i, j = np.nonzero(ok)
+        return i, j, cost[i, j]
+
+    def dispatch(self, sources: Sequence[HeatSource], sinks: Sequence[HeatSink]) -> DispatchResult:
+        m, n = len(sources), len(sinks)
+        S, T = 0, m + n + 1
+        supply = np.array([max(s.Q_out_W, 0.0) for s in sources], dtype=float)
+        demand = np.array([max(s.Q_in_W, 0.0) for s in sinks], dtype=float)
+        big = float(supply.sum() + demand.sum() + 1.0)
+
+        pi, pj, pair_cost = self._pairs(sources, sinks)
+        n_pairs = pi.size
+        # Arc layout: [S→i (m)] [i→j (n_pairs)] [j→T (n)] [T→S (1)]
+        tail = np.concatenate([np.full(m, S), 1 + pi, 1 + m + np.arange(n), [T]]).astype(np.int64)
+        head = np.concatenate([1 + np.arange(m), 1 + m + pj, np.full(n, T), [S]]).astype(np.int64)
+        cap = np.concatenate([supply, np.full(n_pairs, big), demand, [big]])
+        cost = np.concatenate([np.zeros(m), pair_cost, np.zeros(n), [0.0]])
+
+        flow = self._warm_flow(sources, sinks, pi, pj, supply, demand)
+        cycles = 0
+        while cycles < self.max_cycles:
+            fwd = cap - flow > _EPS
+            bwd = flow > _EPS
+            ids = np.concatenate([np.flatnonzero(fwd), np.flatnonzero(bwd)])
+            sign = np.concatenate([np.ones(fwd.sum()), -np.ones(bwd.sum())])
+            ru = np.where(sign > 0, tail[ids], head[ids])
+            rv = np.where(sign > 0, head[ids], tail[ids])
+            rc = sign * cost[ids]
+            cycle = _bellman_ford_cycle(T + 1, ru, rv, rc)
+            if cycle is None or rc[cycle].sum() > -_EPS:
+                break
+            arcs, dirs = ids[cycle], sign[cycle]
+            room = np.where(dirs > 0, cap[arcs] - flow[arcs], flow[arcs])
+            delta = float(room.min())
+            np.add.at(flow, arcs, dirs * delta)
+            cycles += 1
+
+        pair_flow = flow[m : m + n_pairs]
+        flows = {
+            (sources[a].name, sinks[b].name): float(f)
+            for a, b, f in zip(pi.tolist(), pj.tolist(), pair_flow)
+            if f > _EPS
+        }
+        self._previous = dict(flows)
+        used = flow[:m]
+        delivered = flow[m + n_pairs : m + n_pairs + n]
+        notes = []
+        if cycles >= self.max_cycles:
+            notes.append(f"Stopped after max_cycles={self.max_cycles}; solution may be suboptimal.")
+        return DispatchResult(
+            flows_W=flows,
+            delivered_W={s.name: float(d) for s, d in zip(sinks, delivered)},
+            unserved_W={s.name: float(q - d) for s, q, d in zip(sinks, demand, delivered)},
+            used_W={s.name: float(u) for s, u in zip(sources, used)},
+            rejected_W={s.name: float(q - u) for s, q, u in zip(sources, supply, used)},
+            objective=float(cost @ flow),
+            cycles_canceled=cycles,
+            notes=notes,
+        )
+
+    def _warm_flow(self, sources, sinks, pi, pj, supply, demand) -> np.ndarray:
+        """Previous pair flows clipped to the new capacities (conservation kept)."""
+
+        m, n = len(sources), len(sinks)
+        pair = np.array(
+            [self._previous.get((sources[a].name, sinks[b].name), 0.0) for a, b in zip(pi.tolist(), pj.tolist())],
+            dtype=float,
+        )
+        if pair.size and pair.any():
+            for idx, limit in ((pi, supply), (pj, demand)):
+                total = np.bincount(idx, weights=pair, minlength=limit.size)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    scale = np.where(total > limit, limit / total, 1.0)
+                pair = pair * scale[idx]
+        out_i = np.bincount(pi, weights=pair, minlength=m) if pi.size else np.zeros(m)
+        in_j = np.bincount(pj, weights=pair, minlength=n) if pj.size else np.zeros(n)
+        return np.concatenate([out_i, pair, in_j, [pair.sum()]])
@@ -1,25 +1,41 @@
 """
 heat_recovery.py
 ----------------
-SKELETON ONLY — scaffolding for ship-wide heat capture and reuse.
-
-Purpose
-    • Define nouns (sources, sinks, loop) and calculation seams.
-    • Leave ALL physics/thermo to you (TODOs).
+Ship-wide heat capture and reuse: loop components and bookkeeping.
+
+Model
+    • Working-fluid states from the built-in CO₂/NH₃/H₂O tables in
+      thermal.fluids (``fluid_props``; ``fluid_props_array`` for sweeps).
+    • Compressor: isentropic discharge enthalpy at constant entropy, constant
+      isentropic and mechanical efficiencies (``compressor_sweep``).
+    • Counterflow heat exchangers sized by LMTD or inverse ε-NTU, or rated
+      from a given UA, with a pinch cap on both terminal ΔT (``hx_sweep``).
+    • Domestic hot water preheat from condenser/gas-cooler heat, limited by
+      the set point, the hot-side approach and the available reject heat.
+    • ``HeatLoop`` routes source heat to sinks with the min-cost-flow
+      dispatcher in thermal.heat_dispatch; unusable heat is rejected.
 
 Conventions
     • SI units (W, kW, K, Pa, kg/s, kJ/kg).
-    • Keep this module domain-agnostic; call into your own physics later.
+    • Sweep functions accept arrays and broadcast; the scalar wrappers
+      (``compressor_power_W``, ``hx_duty_W``) return floats.
 """
 
 from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional, Dict, Any, List, Tuple
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
+
+import numpy as np
+
+from thermal import fluids
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from thermal.heat_dispatch import DispatchResult, HeatDispatcher
 
 
 # ---------------------------------------------------------------------------
-# Working fluid & properties — PLACEHOLDERS
+# Working fluid & properties
 # ---------------------------------------------------------------------------
 
 
@@ -36,9 +52,8 @@ class FluidState:
     """
     Minimal fluid state descriptor passed to property routines.
 
-    TODO:
-    [ ] Decide which pair (p-h, p-T, T-s) is primary across your loop.
-    [ ] Add/remove fields to match your property library.
+    (p, h) is primary inside the loop (it stays well defined in the two-phase
+    dome); (p, T) is used for single-phase boundary conditions.
     """
 
     T_K: float
@@ -50,13 +65,71 @@ class FluidState:
 
 def fluid_props(fluid: WorkingFluid, state: FluidState) -> FluidState:
     """
-    Property lookup seam.
+    Complete a FluidState from the built-in property tables.
 
-    TODO:
-    [ ] Implement via CoolProp/REFPROP or your own correlations.
-    [ ] Validate state (region checks, transcritical limits for CO2).
+    • ``h_kJ_per_kg`` set → (p, h) lookup: fills T_K, s and x (two-phase only).
+    • otherwise        → (p, T) lookup: fills h and s (single phase, x=None).
+
+    Returns a new FluidState. Raises ValueError outside the table range
+    (transcritical CO2 is inside it; x stays None above the critical point).
+    """
+
+    out = fluid_props_array(
+        fluid,
+        state.p_Pa,
+        h_kJ_per_kg=state.h_kJ_per_kg,
+        T_K=None if state.h_kJ_per_kg is not None else state.T_K,
+    )
+    if not np.isfinite(out["T_K"]):
+        raise ValueError(f"{fluid.value} state outside property tables: {state}")
+    x = float(out["x"])
+    return FluidState(
+        T_K=float(out["T_K"]),
+        p_Pa=state.p_Pa,
+        h_kJ_per_kg=float(out["h_kJ_per_kg"]),
+        s_kJ_per_kgK=float(out["s_kJ_per_kgK"]),
+        x_quality=None if np.isnan(x) else x,
+    )
+
+
+def fluid_props_array(
+    fluid: WorkingFluid,
+    p_Pa,
+    *,
+    h_kJ_per_kg=None,
+    T_K=None,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized property lookup over arrays of (p, h) or (p, T) points.
+
+    Returns arrays T_K, p_Pa, h_kJ_per_kg, s_kJ_per_kgK and x (NaN when
+    single phase or out of range).
     """
-    return state  # SKELETON: return unchanged
+
+    if (h_kJ_per_kg is None) == (T_K is None):
+        raise ValueError("Pass exactly one of h_kJ_per_kg or T_K.")
+    tables = fluids.get_fluid_tables(fluid)
+    if h_kJ_per_kg is not None:
+        p, h = np.broadcast_arrays(
+            np.asarray(p_Pa, dtype=float), np.asarray(h_kJ_per_kg, dtype=float)
+        )
+        ph = fluids.props_ph(fluid, p, h, tables=tables)
+        return {
+            "T_K": ph["T_K"],
+            "p_Pa": p,
+            "h_kJ_per_kg": h,
+            "s_kJ_per_kgK": ph["s_kJ_per_kgK"],
+            "x": ph["x"],
+        }
+    p, T = np.broadcast_arrays(np.asarray(p_Pa, dtype=float), np.asarray(T_K, dtype=float))
+    pt = fluids.props_pt(fluid, p, T, tables=tables)
+    return {
+        "T_K": T,
+        "p_Pa": p,
+        "h_kJ_per_kg": pt["h_kJ_per_kg"],
+        "s_kJ_per_kgK": pt["s_kJ_per_kgK"],
+        "x": np.full(p.shape, np.nan),
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -69,30 +142,37 @@ class HeatSource:
     """
     A device that rejects heat to the loop (e.g., condenser/gas cooler).
 
-    TODO:
-    [ ] Define sign conventions for Q and W across your project.
+    ``Q_out_W`` is the heat available this step (≥ 0); ``T_supply_C`` its
+    delivery temperature (None = no grade limit).
     """
 
     name: str
-    Q_out_W: float = 0.0  # placeholder
+    Q_out_W: float = 0.0
     W_in_W: float = 0.0  # compressor/fans if you choose to track here
     meta: Dict[str, Any] = field(default_factory=dict)
+    T_supply_C: Optional[float] = None
 
 
 @dataclass
 class HeatSink:
     """
     A device that absorbs heat from the loop (e.g., DHW preheater, space coil).
+
+    ``Q_in_W`` is the demand this step (≥ 0); ``T_required_C`` the minimum
+    useful supply temperature; ``priority`` the value of one delivered watt
+    relative to other sinks (see thermal.heat_dispatch).
     """
 
     name: str
-    Q_in_W: float = 0.0  # placeholder
+    Q_in_W: float = 0.0
     UA_W_per_K: Optional[float] = None  # sizing result (optional)
     meta: Dict[str, Any] = field(default_factory=dict)
+    T_required_C: Optional[float] = None
+    priority: float = 1.0
 
 
 # ---------------------------------------------------------------------------
-# Component seams — ALL TODOs
+# Components
 # ---------------------------------------------------------------------------
 
 
@@ -101,77 +181,327 @@ class CompressorSpec:
     """
     Compressor model parameters.
 
-    TODO:
-    [ ] Choose efficiency model (isentropic/volumetric maps).
-    [ ] Define envelopes (suction/discharge limits).
+    Constant isentropic and mechanical efficiencies; volumetric maps and
+    suction/discharge envelopes are not modelled.
     """
 
     eta_isentropic: float = 0.65
     eta_mech: float = 0.95
 
 
+# (fluid, quantized ln p, quantized s) -> isentropic h [kJ/kg]
+_ISENTROPIC_CACHE: Dict[Tuple[str, int, int], float] = {}
+ISENTROPIC_CACHE_LIMIT = 1_000_000
+_LN_P_QUANTUM = 1e-6  # relative pressure resolution
+_S_QUANTUM = 1e-6  # kJ/kg/K
+
+
+def isentropic_enthalpy(fluid: WorkingFluid, p_Pa, s_kJ_per_kgK) -> np.ndarray:
+    """
+    h(p, s) memoized on quantized (ln p, s) keys.
+
+    Control sweeps revisit the same suction/discharge points, so only keys
+    not seen before reach the (bisection) table inversion. Values are
+    evaluated at the quantized point, so cached and fresh results agree.
+    """
+
+    p, s = np.broadcast_arrays(np.asarray(p_Pa, dtype=float), np.asarray(s_kJ_per_kgK, dtype=float))
+    keys = np.stack(
+        [np.round(np.log(p) / _LN_P_QUANTUM), np.round(s / _S_QUANTUM)], axis=-1
+    ).astype(np.int64).reshape(-1, 2)
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    values = np.empty(unique.shape[0])
+    missing = []
+    for k, (kp, ks) in enumerate(unique.tolist()):
+        cached = _ISENTROPIC_CACHE.get((fluid.value, kp, ks))
+        if cached is None:
+            missing.append(k)
+        else:
+            values[k] = cached
+    if missing:
+        miss = np.asarray(missing, dtype=np.int64)
+        values[miss] = fluids.h_from_ps(
+            fluid, np.exp(unique[miss, 0] * _LN_P_QUANTUM), unique[miss, 1] * _S_QUANTUM
+        )
+        if len(_ISENTROPIC_CACHE) + miss.size > ISENTROPIC_CACHE_LIMIT:
+            _ISENTROPIC_CACHE.clear()
+        _ISENTROPIC_CACHE.update(
+            zip(((fluid.value, kp, ks) for kp, ks in unique[miss].tolist()), values[miss].tolist())
+        )
+    return values[inverse.reshape(-1)].reshape(p.shape)
+
+
+def clear_isentropic_cache() -> Dict[str, int]:
+    purged = len(_ISENTROPIC_CACHE)
+    _ISENTROPIC_CACHE.clear()
+    return {"cleared_items": purged}
+
+
+def compressor_sweep(
+    fluid: WorkingFluid,
+    p_in_Pa,
+    h_in_kJ_per_kg,
+    p_out_Pa,
+    spec: CompressorSpec,
+    *,
+    m_dot_kg_per_s=1.0,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized compression from suction (p, h) states to discharge pressures.
+
+        h_s   = h(p_out, s_in)
+        h_out = h_in + (h_s - h_in) / η_is
+        W     = ṁ·(h_out - h_in) / η_mech
+
+    Returns arrays W_shaft_W, h_out_kJ_per_kg, h_isentropic_kJ_per_kg,
+    T_out_K and s_out_kJ_per_kgK (NaN where states leave the tables).
+    """
+
+    p_in, h_in, p_out, m_dot = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (p_in_Pa, h_in_kJ_per_kg, p_out_Pa, m_dot_kg_per_s))
+    )
+    tables = fluids.get_fluid_tables(fluid)
+    s_in = fluids.props_ph(fluid, p_in, h_in, tables=tables)["s_kJ_per_kgK"]
+    h_s = isentropic_enthalpy(fluid, p_out, s_in)
+    h_out = h_in + (h_s - h_in) / spec.eta_isentropic
+    discharge = fluids.props_ph(fluid, p_out, h_out, tables=tables)
+    return {
+        "W_shaft_W": m_dot * (h_out - h_in) * 1e3 / spec.eta_mech,
+        "h_out_kJ_per_kg": h_out,
+        "h_isentropic_kJ_per_kg": h_s,
+        "T_out_K": discharge["T_K"],
+        "s_out_kJ_per_kgK": discharge["s_kJ_per_kgK"],
+    }
+
+
 def compressor_power_W(
     fluid: WorkingFluid,
     inlet: FluidState,
     outlet_p_Pa: float,
     spec: CompressorSpec,
+    *,
+    m_dot_kg_per_s: float = 1.0,
 ) -> Tuple[float, FluidState]:
     """
-    Compute compressor shaft/electric power and outlet state.
+    Compute compressor shaft power and discharge state for one operating point.
 
-    TODO:
-    [ ] Implement isentropic step (s_out = s_in), then efficiency corrections.
-    [ ] Return updated FluidState (T,p,h,s) at discharge.
+    ``inlet`` may carry h, or only (T, p) for superheated suction. With the
+    default ``m_dot_kg_per_s=1`` the power is specific work in W per kg/s.
     """
-    W_in_W = 0.0  # placeholder
-    outlet = inlet  # placeholder (no state change)
-    return W_in_W, outlet
+
+    if inlet.h_kJ_per_kg is None:
+        inlet = fluid_props(fluid, inlet)
+    out = compressor_sweep(
+        fluid, inlet.p_Pa, inlet.h_kJ_per_kg, outlet_p_Pa, spec, m_dot_kg_per_s=m_dot_kg_per_s
+    )
+    if not np.isfinite(out["W_shaft_W"]):
+        raise ValueError(f"{fluid.value} compression to {outlet_p_Pa} Pa leaves the property tables.")
+    outlet = FluidState(
+        T_K=float(out["T_out_K"]),
+        p_Pa=outlet_p_Pa,
+        h_kJ_per_kg=float(out["h_out_kJ_per_kg"]),
+        s_kJ_per_kgK=float(out["s_out_kJ_per_kgK"]),
+    )
+    return float(out["W_shaft_W"]), outlet
+
+
+class HXMethod(str, Enum):
+    """Heat-exchanger calculation method (string values keep YAML/CLI input simple)."""
+
+    LMTD = "LMTD"
+    NTU = "NTU"  # ε-NTU
+
+    @classmethod
+    def _missing_(cls, value):
+        key = str(value).upper().replace("Ε", "E").replace("EPSILON", "E")
+        if key in ("E-NTU", "ENTU", "EPS-NTU"):
+            return cls.NTU
+        return cls.__members__.get(key)
 
 
 @dataclass
 class HXSpec:
     """
-    Heat-exchanger sizing parameters.
+    Heat-exchanger sizing parameters (counterflow).
 
-    TODO:
-    [ ] Pick method: LMTD or ε-NTU; define pinch/approach constraints.
-    [ ] Add pressure-drop/fouling models if needed.
+    ``pinch_K`` is the minimum terminal temperature difference; duties that
+    would violate it are capped. ``UA_W_per_K`` switches from sizing to
+    rating: the duty then follows from the given UA. The capacity rates m·cp
+    are the defaults for ``hx_sweep``/``hx_duty_W`` calls that omit them;
+    use ``np.inf`` explicitly for a condensing or boiling stream.
     """
 
-    method: str = "LMTD"
+    method: HXMethod = HXMethod.LMTD
     pinch_K: float = 5.0
     UA_W_per_K: Optional[float] = None
+    C_hot_W_per_K: Optional[float] = None
+    C_cold_W_per_K: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        self.method = HXMethod(self.method)
+
+
+def _counterflow_effectiveness(ntu: np.ndarray, cr: np.ndarray) -> np.ndarray:
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        e = np.exp(-ntu * (1.0 - cr))
+        eps = (1.0 - e) / (1.0 - cr * e)
+        return np.where(np.isclose(cr, 1.0), ntu / (1.0 + ntu), eps)
+
+
+def _counterflow_ntu(eps: np.ndarray, cr: np.ndarray) -> np.ndarray:
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        ntu = np.log((eps - 1.0) / (eps * cr - 1.0)) / (cr - 1.0)
+        return np.where(np.isclose(cr, 1.0), eps / (1.0 - eps), ntu)
+
+
+def _log_mean(dt1: np.ndarray, dt2: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        lm = (dt1 - dt2) / np.log(dt1 / dt2)
+    return np.where(np.isclose(dt1, dt2), 0.5 * (dt1 + dt2), lm)
+
+
+def hx_sweep(
+    spec: HXSpec,
+    T_hot_in_C,
+    T_cold_in_C,
+    *,
+    C_hot_W_per_K=None,
+    C_cold_W_per_K=None,
+    T_hot_out_C=None,
+    target_approach_K=None,
+    UA_W_per_K=None,
+    pinch_K=None,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized counterflow HX duty/size for arrays of operating points.
+
+    Every argument broadcasts. Capacity rates are m·cp [W/K] (default: the
+    spec's); pass ``np.inf`` for a phase-changing stream. A side with no
+    capacity rate raises ValueError.
+
+    Sizing (no UA): the hot outlet is ``T_hot_out_C`` if given, else
+    ``T_cold_in + target_approach_K``; the duty is capped so neither terminal
+    ΔT drops below ``pinch_K``; UA follows from LMTD or inverse ε-NTU (same
+    answer for counterflow, different numerics).
+
+    Rating (UA given, argument or spec): Q = ε·C_min·(T_hot_in - T_cold_in),
+    then pinch-capped.
+
+    Returns arrays Q_W, UA_W_per_K, T_hot_out_C, T_cold_out_C,
+    pinch_limited (bool).
+    """
+
+    pinch = spec.pinch_K if pinch_K is None else pinch_K
+    UA = spec.UA_W_per_K if UA_W_per_K is None else UA_W_per_K
+    C_hot_W_per_K = spec.C_hot_W_per_K if C_hot_W_per_K is None else C_hot_W_per_K
+    C_cold_W_per_K = spec.C_cold_W_per_K if C_cold_W_per_K is None else C_cold_W_per_K
+    if C_hot_W_per_K is None or C_cold_W_per_K is None:
+        raise ValueError(
+            "Both capacity rates are required: pass C_hot_W_per_K/C_cold_W_per_K "
+            "or set them on HXSpec (np.inf for a phase-changing stream)."
+        )
+    arrays = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (T_hot_in_C, T_cold_in_C, C_hot_W_per_K, C_cold_W_per_K, pinch))
+    )
+    T_hi, T_ci, C_h, C_c, pinch = arrays
+    C_min = np.minimum(C_h, C_c)
+    C_max = np.maximum(C_h, C_c)
+    cr = np.where(np.isfinite(C_max), C_min / C_max, 0.0)
+    span = T_hi - T_ci
+    Q_cap = np.maximum(C_min * (span - pinch), 0.0)
+
+    if UA is not None:
+        UA = np.broadcast_to(np.asarray(UA, dtype=float), T_hi.shape)
+        Q_target = _counterflow_effectiveness(UA / C_min, cr) * C_min * np.maximum(span, 0.0)
+    else:
+        if T_hot_out_C is None:
+            if target_approach_K is None:
+                raise ValueError("Sizing needs T_hot_out_C or target_approach_K (or a UA to rate).")
+            T_ho_target = T_ci + np.asarray(target_approach_K, dtype=float)
+        else:
+            T_ho_target = np.asarray(T_hot_out_C, dtype=float)
+        Q_target = np.maximum(C_h * (T_hi - T_ho_target), 0.0)
+
+    Q = np.minimum(Q_target, Q_cap)
+    pinch_limited = Q_target > Q_cap
+    T_ho = T_hi - Q / C_h
+    T_co = T_ci + Q / C_c
+
+    if UA is None:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if spec.method is HXMethod.LMTD:
+                UA = np.where(Q > 0.0, Q / _log_mean(T_hi - T_co, T_ho - T_ci), 0.0)
+            else:
+                eps = np.where(span > 0.0, Q / (C_min * span), 0.0)
+                UA = np.where(Q > 0.0, _counterflow_ntu(eps, cr) * C_min, 0.0)
+    elif np.any(pinch_limited):
+        # The pinch cap lowers the duty a given UA can deliver usefully; report
+        # the UA actually needed for the capped duty.
+        eps = np.where(span > 0.0, Q / (C_min * span), 0.0)
+        UA = np.where(pinch_limited, _counterflow_ntu(eps, cr) * C_min, UA)
+
+    return {
+        "Q_W": Q,
+        "UA_W_per_K": np.asarray(UA, dtype=float),
+        "T_hot_out_C": T_ho,
+        "T_cold_out_C": T_co,
+        "pinch_limited": pinch_limited,
+    }
 
 
 def hx_duty_W(
     spec: HXSpec,
-    T_hot_in_C: float,
-    T_hot_out_C: Optional[float],
-    T_cold_in_C: float,
-    target_approach_K: float,
-) -> Tuple[float, Optional[float]]:
+    T_hot_in_C,
+    T_hot_out_C,
+    T_cold_in_C,
+    target_approach_K,
+    *,
+    C_hot_W_per_K=None,
+    C_cold_W_per_K=None,
+):
     """
-    Compute HX duty and (optionally) required UA.
+    Compute HX duty and required UA (scalars or arrays; see ``hx_sweep``).
 
-    TODO:
-    [ ] Implement chosen method; enforce approach/pinch constraints.
-    [ ] Return (Q_W, UA_W_per_K). Either/both may be None if not sized.
+    The positional signature is unchanged; capacity rates come from the
+    keywords or, when omitted, from ``spec``.
+
+    Returns ``(Q_W, UA_W_per_K)``; floats for scalar input.
     """
-    return 0.0, None  # placeholders
+
+    out = hx_sweep(
+        spec,
+        T_hot_in_C,
+        T_cold_in_C,
+        C_hot_W_per_K=C_hot_W_per_K,
+        C_cold_W_per_K=C_cold_W_per_K,
+        T_hot_out_C=T_hot_out_C,
+        target_approach_K=target_approach_K,
+    )
+    Q, UA = out["Q_W"], out["UA_W_per_K"]
+    if Q.ndim == 0:
+        return float(Q), float(UA)
+    return Q, UA
 
 
 # ---------------------------------------------------------------------------
-# DHW preheat seam — NO THERMAL MATH, just I/O framing
+# DHW preheat
 # ---------------------------------------------------------------------------
 
 
+def cp_water_J_per_kgK(T_C):
+    """Liquid water cp, 0–100 °C polynomial fit (within ~0.4 %). Accepts arrays."""
+
+    T = np.asarray(T_C, dtype=float)
+    return 4217.4 - 3.720 * T + 0.1412 * T**2 - 2.654e-3 * T**3 + 2.093e-5 * T**4
+
+
 @dataclass
 class DHWPreheatSpec:
     """
     Domestic hot water preheat using condenser/gas-cooler rejected heat.
 
-    TODO:
-    [ ] Decide cp_water(T) handling and safety limits (scalding, code).
+    The preheater may not heat water above ``T_set_C`` (downstream heater
+    and scald protection own the final temperature).
     """
 
     m_dot_water_kg_per_s: float
@@ -181,33 +511,57 @@ class DHWPreheatSpec:
 
 
 def dhw_preheat_from_condenser(
-    Q_reject_W: float, spec: DHWPreheatSpec
+    Q_reject_W: float, spec: DHWPreheatSpec, *, T_hot_C: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Allocate available rejected heat to DHW preheating.
 
+    Energy balance Q = ṁ·cp(T_mean)·(T_out - T_in) with
+
+        T_out ≤ T_set_C                          (setpoint)
+        T_out ≤ T_hot_C - allowed_approach_K     (if the hot-side T is known)
+
     Returns:
         {
-          "Q_to_DHW_W": float,   # allocated heat (placeholder)
-          "T_out_C": float,      # outlet estimate (placeholder)
-          "unused_Q_W": float,   # remainder (placeholder)
-          "notes": list[str],    # assumptions/limits
+          "Q_to_DHW_W": float,   # allocated heat
+          "T_out_C": float,      # water outlet temperature
+          "unused_Q_W": float,   # remainder left for other sinks / dump
+          "notes": list[str],    # active limits
         }
-
-    TODO:
-    [ ] Implement energy balance with cp_water(T) and HX approach.
-    [ ] Enforce T_out <= (hot-side limit - approach).
     """
-    return {
-        "Q_to_DHW_W": 0.0,
-        "T_out_C": spec.T_in_C,
-        "unused_Q_W": Q_reject_W,
-        "notes": ["SKELETON: no HX model, no cp(T), no approach constraint."],
-    }
+
+    notes: List[str] = []
+    T_limit = spec.T_set_C
+    if T_hot_C is not None and T_hot_C - spec.allowed_approach_K < T_limit:
+        T_limit = T_hot_C - spec.allowed_approach_K
+        notes.append("Outlet limited by hot-side temperature minus approach.")
+    if T_limit <= spec.T_in_C or spec.m_dot_water_kg_per_s <= 0.0 or Q_reject_W <= 0.0:
+        notes.append("No useful preheat possible.")
+        return {
+            "Q_to_DHW_W": 0.0,
+            "T_out_C": spec.T_in_C,
+            "unused_Q_W": max(Q_reject_W, 0.0),
+            "notes": notes,
+        }
+
+    cp_max = float(cp_water_J_per_kgK(0.5 * (spec.T_in_C + T_limit)))
+    Q_cap = spec.m_dot_water_kg_per_s * cp_max * (T_limit - spec.T_in_C)
+    Q = min(Q_reject_W, Q_cap)
+    if Q < Q_reject_W:
+        notes.append("Heat exceeds what the water stream can absorb.")
+    # One fixed-point pass: re-evaluate cp at the actual mean temperature.
+    T_out = spec.T_in_C + Q / (spec.m_dot_water_kg_per_s * cp_max)
+    cp = float(cp_water_J_per_kgK(0.5 * (spec.T_in_C + T_out)))
+    T_out = spec.T_in_C + Q / (spec.m_dot_water_kg_per_s * cp)
+    if T_out > T_limit:
+        # Clipping T_out must also clip Q, or the balance would not close.
+        T_out = T_limit
+        Q = spec.m_dot_water_kg_per_s * cp * (T_out - spec.T_in_C)
+    return {"Q_to_DHW_W": Q, "T_out_C": T_out, "unused_Q_W": Q_reject_W - Q, "notes": notes}
 
 
 # ---------------------------------------------------------------------------
-# Minimal loop bookkeeping — aggregation policy left to you
+# Loop bookkeeping
 # ---------------------------------------------------------------------------
 
 
@@ -216,9 +570,11 @@ class HeatLoop:
     """
     Bookkeeping for a simple heat loop.
 
+    Routing is a min-cost-flow dispatch (thermal.heat_dispatch); heat a sink
+    cannot use is reported as rejected (dump/radiator).
+
     TODO:
-    [ ] Decide routing/control (priority sinks, storage, dump).
-    [ ] Add pumps/fans and transport losses if desired.
+    [ ] Add storage, pumps/fans and transport losses if desired.
     """
 
     fluid: WorkingFluid = WorkingFluid.CO2
@@ -233,29 +589,40 @@ class HeatLoop:
         self.sinks.append(sink)
         return self
 
-    def balance(self) -> Dict[str, Any]:
+    def dispatch(self, dispatcher: Optional["HeatDispatcher"] = None) -> "DispatchResult":
+        """Assign source heat to sinks; pass a long-lived dispatcher to warm-start."""
+
+        from thermal.heat_dispatch import HeatDispatcher
+
+        return (dispatcher or HeatDispatcher()).dispatch(self.sources, self.sinks)
+
+    def balance(self, dispatcher: Optional["HeatDispatcher"] = None) -> Dict[str, Any]:
         """
-        Report current bookkeeping without enforcing physics.
+        Report available heat, demand and the dispatched split.
 
-        TODO:
-        [ ] Define sign conventions and whether W_in_W is included in balances.
-        [ ] Implement temperature-grade/exergy checks if required.
+        W_in_W is not part of the heat balance (it is electrical input).
         """
+
+        result = self.dispatch(dispatcher)
         return {
-            "Q_sources_W": sum(s.Q_out_W for s in self.sources),  # trivial sum
-            "Q_sinks_W": sum(s.Q_in_W for s in self.sinks),  # trivial sum
-            "notes": ["SKELETON: no transport losses, no routing logic."],
+            "Q_sources_W": sum(s.Q_out_W for s in self.sources),
+            "Q_sinks_W": sum(s.Q_in_W for s in self.sinks),
+            "Q_delivered_W": result.total_delivered_W,
+            "Q_unserved_W": sum(result.unserved_W.values()),
+            "Q_rejected_W": sum(result.rejected_W.values()),
+            "notes": ["No transport losses; grade limits per HeatDispatcher.min_approach_K."]
+            + result.notes,
         }
 
 
 # ---------------------------------------------------------------------------
-# Example wiring (safe to delete) — no physics invoked
+# Example wiring (safe to delete)
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
-    # Placeholder objects only; no calculations performed.
     loop = HeatLoop()
-    loop.add_source(HeatSource(name="condenser_A"))
-    loop.add_sink(HeatSink(name="dhw_preheat"))
+    loop.add_source(HeatSource(name="condenser_A", Q_out_W=8_000.0, T_supply_C=60.0))
+    loop.add_sink(HeatSink(name="dhw_preheat", Q_in_W=5_000.0, T_required_C=45.0, priority=2.0))
+    loop.add_sink(HeatSink(name="space_coil", Q_in_W=5_000.0, T_required_C=30.0))
 
-    print("Loop (placeholder) balance:", loop.balance())
+    print("Loop balance:", loop.balance())
@@ -2,14 +2,33 @@
 materials.py
 -------------
 Helpers for working with material property tables.
+
+Two access paths:
+    • ``get_material_properties`` — dict lookup for one material (scripts, reports).
+    • ``MaterialTable`` — materials.yaml compiled once into aligned NumPy
+      columns plus an ID→index map, so per-element gathers over millions of
+      panels are single fancy-indexing operations.
 """
 
 from __future__ import annotations
 
-from typing import Dict, Any
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from data.loader import load_materials
 
+# Numeric columns compiled into MaterialTable (missing entries become NaN).
+PROPERTY_KEYS = (
+    "density_kg_per_m3",
+    "specific_heat_J_per_kgK",
+    "thermal_conductivity_W_per_mK",
+    "yield_strength_MPa",
+)
+
+_CACHED_TABLE: Optional[Tuple[int, "MaterialTable"]] = None
+
 
 def get_materials(*, force_reload: bool = False) -> Dict[str, Any]:
     """Load the materials library."""
@@ -25,3 +44,84 @@ def get_material_properties(cfg: Dict[str, Any], material_id: str) -> Dict[str,
         known = ", ".join(sorted(materials))
         raise KeyError(f"Material '{material_id}' not found. Known: {known}")
     return materials[material_id]
+
+
+@dataclass(frozen=True)
+class MaterialTable:
+    """Aligned property arrays; row ``i`` describes material ``ids[i]``."""
+
+    ids: Tuple[str, ...]
+    index: Dict[str, int]
+    category_defaults: Dict[str, int]
+    density_kg_per_m3: np.ndarray
+    specific_heat_J_per_kgK: np.ndarray
+    thermal_conductivity_W_per_mK: np.ndarray
+    yield_strength_MPa: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index_of(self, material_id: str) -> int:
+        try:
+            return self.index[material_id]
+        except KeyError:
+            known = ", ".join(self.ids)
+            raise KeyError(f"Material '{material_id}' not found. Known: {known}") from None
+
+    def indices(self, material_ids: Union[str, Sequence[str], np.ndarray]) -> np.ndarray:
+        """Map material IDs to row indices (one dict lookup per distinct ID)."""
+
+        arr = np.asarray(material_ids, dtype=str)
+        unique, inverse = np.unique(arr.ravel(), return_inverse=True)
+        rows = np.array([self.index_of(str(mid)) for mid in unique], dtype=np.int64)
+        return rows[inverse].reshape(arr.shape)
+
+    def category_index(self, category: str) -> int:
+        """Row index of a category's ``default_material``."""
+
+        try:
+            return self.category_defaults[category]
+        except KeyError:
+            raise KeyError(f"materials.yaml has no category '{category}'.") from None
+
+    def column(self, key: str) -> np.ndarray:
+        if key not in PROPERTY_KEYS:
+            raise KeyError(f"Unknown material property '{key}'. Known: {', '.join(PROPERTY_KEYS)}")
+        return getattr(self, key)
+
+
+def compile_materials(cfg: Dict[str, Any]) -> MaterialTable:
+    """Compile a materials.yaml document into a MaterialTable."""
+
+    materials = cfg.get("materials", {})
+    ids = tuple(materials)
+    index = {mid: i for i, mid in enumerate(ids)}
+    columns = {
+        key: np.array(
+            [float(materials[mid].get(key, np.nan)) for mid in ids], dtype=float
+        )
+        for key in PROPERTY_KEYS
+    }
+    for col in columns.values():
+        col.setflags(write=False)
+
+    category_defaults: Dict[str, int] = {}
+    for name, category in cfg.get("categories", {}).items():
+        default = category.get("default_material")
+        if default is None:
+            continue
+        if default not in index:
+            raise KeyError(f"Category '{name}' references unknown material '{default}'.")
+        category_defaults[name] = index[default]
+
+    return MaterialTable(ids=ids, index=index, category_defaults=category_defaults, **columns)
+
+
+def get_material_table(*, force_reload: bool = False) -> MaterialTable:
+    """Return the compiled table for the canonical materials.yaml (cached)."""
+
+    global _CACHED_TABLE
+    cfg = get_materials(force_reload=force_reload)
+    if _CACHED_TABLE is None or _CACHED_TABLE[0] != id(cfg):
+        _CACHED_TABLE = (id(cfg), compile_materials(cfg))
+    return _CACHED_TABLE[1]
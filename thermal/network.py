@@ -1,52 +1,681 @@
 """
 network.py
 -----------
-Stub module for thermal network modeling.
+Lumped-capacitance thermal network model.
 
 Responsible for:
     - Defining node/edge abstractions for conductive and radiative exchange.
     - Loading material properties via thermal.materials.
     - Providing helpers that higher-level simulations can consume.
+
+Conventions
+    • Capacities in kJ/K, conductances in kW/K, loads in kW, time in seconds.
+      With these units C·dT/dt = -G·T + Q balances without extra factors.
+    • Nodes are addressed by integer index (insertion order); string IDs map
+      onto those indices. Matrix/vector order is index order.
+
+Storage
+    • Node and edge attributes live in growable NumPy columns, not per-object
+      dataclasses. ``ThermalNode``/``ThermalEdge`` are input records and
+      snapshots (``node()``); ``nodes[id]`` and ``edges[i]`` are live views
+      whose attribute writes go straight to the columns.
+    • A symmetric CSR adjacency (neighbour index + edge index per row) is
+      merged incrementally from edges appended since the last query, giving
+      O(degree) neighbour iteration.
+    • Radiative edges are stored separately as exchange coefficients
+      σ·A·F·ε₁ε₂ [kW/K⁴]; they are not part of the conductive adjacency.
+    • ``save``/``load`` (thermal.storage) persist the columns as .npy files
+      that reload memory-mapped; node IDs are decoded on first use.
 """
 
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence as SequenceABC
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from common.physics import STEFAN_BOLTZMANN
+
+try:
+    from scipy import sparse  # type: ignore
+except ImportError:  # pragma: no cover - defensive guard
+    sparse = None  # type: ignore
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from thermal.radiation import SteadyResult
+    from thermal.reduction import ReducedModel
+    from thermal.transient import ImplicitStepper
 
-@dataclass
+
+NodeRef = Union[str, int]
+
+
+@dataclass(slots=True)
 class ThermalNode:
-    """Simple placeholder for a lumped thermal node."""
+    """
+    Lumped thermal node record.
+
+    Nodes with ``fixed=True`` are boundaries: their temperature is prescribed
+    (e.g. deep-space sink, coolant loop) and never integrated.
+    """
 
     node_id: str
     capacity_kj_per_k: float = 0.0
     temperature_c: float = 20.0
+    heat_load_kw: float = 0.0
+    fixed: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ThermalEdge:
-    """Placeholder conductive edge between two thermal nodes."""
+    """Conductive edge between two thermal nodes."""
 
     from_node: str
     to_node: str
     conductance_kw_per_k: float = 0.0
 
 
+def _require_scipy() -> None:
+    if sparse is None:
+        raise ImportError(
+            "SciPy is required for thermal network matrices. Please install it."
+        )
+
+
+class _Column:
+    """Append-only NumPy buffer with amortized O(1) growth."""
+
+    __slots__ = ("_data", "size")
+
+    def __init__(self, dtype, capacity: int = 16) -> None:
+        self._data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    @classmethod
+    def wrap(cls, array: np.ndarray) -> "_Column":
+        """Adopt an existing (possibly memory-mapped) array without copying."""
+
+        col = cls.__new__(cls)
+        col._data = array
+        col.size = array.shape[0]
+        return col
+
+    def _reserve(self, extra: int) -> None:
+        needed = self.size + extra
+        if needed > self._data.size:
+            grown = np.empty(max(needed, 2 * self._data.size), dtype=self._data.dtype)
+            grown[: self.size] = self._data[: self.size]
+            self._data = grown
+
+    def append(self, value) -> None:
+        self._reserve(1)
+        self._data[self.size] = value
+        self.size += 1
+
+    def extend(self, values: np.ndarray) -> None:
+        self._reserve(values.size)
+        self._data[self.size : self.size + values.size] = values
+        self.size += values.size
+
+    @property
+    def view(self) -> np.ndarray:
+        return self._data[: self.size]
+
+
+class _NodeProxy:
+    """Live view of one node: attribute reads and writes go to the columns."""
+
+    __slots__ = ("_net", "_i")
+
+    def __init__(self, network: "ThermalNetwork", index: int) -> None:
+        self._net = network
+        self._i = index
+
+    @property
+    def node_id(self) -> str:
+        return self._net._ids[self._i]
+
+    @property
+    def capacity_kj_per_k(self) -> float:
+        return float(self._net._capacity.view[self._i])
+
+    @capacity_kj_per_k.setter
+    def capacity_kj_per_k(self, value: float) -> None:
+        self._net._capacity.view[self._i] = value
+        self._net.revision += 1
+
+    @property
+    def temperature_c(self) -> float:
+        return float(self._net._temperature.view[self._i])
+
+    @temperature_c.setter
+    def temperature_c(self, value: float) -> None:
+        self._net._temperature.view[self._i] = value
+
+    @property
+    def heat_load_kw(self) -> float:
+        return float(self._net._load.view[self._i])
+
+    @heat_load_kw.setter
+    def heat_load_kw(self, value: float) -> None:
+        self._net._load.view[self._i] = value
+
+    @property
+    def fixed(self) -> bool:
+        return bool(self._net._fixed.view[self._i])
+
+    @fixed.setter
+    def fixed(self, value: bool) -> None:
+        self._net._fixed.view[self._i] = value
+        self._net.revision += 1
+
+    def snapshot(self) -> ThermalNode:
+        return self._net.node(self._i)
+
+    def __repr__(self) -> str:
+        return repr(self.snapshot())
+
+
+class _EdgeProxy:
+    """Live view of one conductive edge; the conductance is writable."""
+
+    __slots__ = ("_net", "_i")
+
+    def __init__(self, network: "ThermalNetwork", index: int) -> None:
+        self._net = network
+        self._i = index
+
+    @property
+    def from_node(self) -> str:
+        return self._net._ids[self._net._edge_src.view[self._i]]
+
+    @property
+    def to_node(self) -> str:
+        return self._net._ids[self._net._edge_dst.view[self._i]]
+
+    @property
+    def conductance_kw_per_k(self) -> float:
+        return float(self._net._edge_g.view[self._i])
+
+    @conductance_kw_per_k.setter
+    def conductance_kw_per_k(self, value: float) -> None:
+        self._net._edge_g.view[self._i] = value
+        self._net.revision += 1
+
+    def snapshot(self) -> ThermalEdge:
+        return ThermalEdge(self.from_node, self.to_node, self.conductance_kw_per_k)
+
+    def __repr__(self) -> str:
+        return repr(self.snapshot())
+
+
+class _NodeView(Mapping):
+    """``node_id -> live node`` mapping (writes update the network columns)."""
+
+    def __init__(self, network: "ThermalNetwork") -> None:
+        self._net = network
+
+    def __getitem__(self, node_id: str) -> _NodeProxy:
+        return _NodeProxy(self._net, self._net.index_of(node_id))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._net.node_ids())
+
+    def __len__(self) -> int:
+        return self._net.n_nodes
+
+
+class _EdgeView(SequenceABC):
+    """Sequence of live edges (the conductance is writable); slices give lists."""
+
+    def __init__(self, network: "ThermalNetwork") -> None:
+        self._net = network
+
+    def __getitem__(self, i):  # type: ignore[override]
+        n = self._net.n_edges
+        if isinstance(i, slice):
+            return [_EdgeProxy(self._net, k) for k in range(*i.indices(n))]
+        if not isinstance(i, (int, np.integer)):
+            raise TypeError(f"Edge indices must be integers or slices, not {type(i).__name__}.")
+        if not -n <= i < n:
+            raise IndexError(i)
+        return _EdgeProxy(self._net, int(i) % n)
+
+    def __len__(self) -> int:
+        return self._net.n_edges
+
+
 class ThermalNetwork:
-    """Minimal skeleton until full solver lands."""
+    """Array-backed thermal nodes/edges plus matrix assembly helpers."""
 
     def __init__(self) -> None:
-        self.nodes: Dict[str, ThermalNode] = {}
-        self.edges: List[ThermalEdge] = []
+        self._id_list: List[str] = []
+        self._id_map: Dict[str, int] = {}
+        # UTF-8, newline-separated IDs from thermal.storage, decoded lazily.
+        self._id_blob: Union[np.ndarray, None] = None
+
+        self._capacity = _Column(np.float64)
+        self._temperature = _Column(np.float64)
+        self._load = _Column(np.float64)
+        self._fixed = _Column(np.bool_)
+
+        self._edge_src = _Column(np.int64)
+        self._edge_dst = _Column(np.int64)
+        self._edge_g = _Column(np.float64)
+
+        self._rad_src = _Column(np.int64)
+        self._rad_dst = _Column(np.int64)
+        self._rad_coeff = _Column(np.float64)
+
+        # Symmetric CSR adjacency covering edges [0, _csr_edges).
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._adj_nodes = np.empty(0, dtype=np.int64)
+        self._adj_edges = np.empty(0, dtype=np.int64)
+        self._csr_edges = 0
+
+        # Bumped whenever capacities or conductances change so solvers know
+        # when a cached factorization is stale.
+        self.revision = 0
+
+    # ------------------------------------------------------------------
+    # Sizes / lookup
+    # ------------------------------------------------------------------
+    def _decode_ids(self) -> None:
+        blob, self._id_blob = self._id_blob, None
+        text = blob.tobytes().decode("utf-8") if blob.size else ""
+        self._id_list = text.split("\n") if self.n_nodes else []
+        self._id_map = dict(zip(self._id_list, range(len(self._id_list))))
+
+    @property
+    def _ids(self) -> List[str]:
+        if self._id_blob is not None:
+            self._decode_ids()
+        return self._id_list
+
+    @property
+    def _index(self) -> Dict[str, int]:
+        if self._id_blob is not None:
+            self._decode_ids()
+        return self._id_map
+
+    @property
+    def n_nodes(self) -> int:
+        return self._capacity.size
+
+    @property
+    def n_edges(self) -> int:
+        return self._edge_src.size
+
+    @property
+    def n_radiative_edges(self) -> int:
+        return self._rad_src.size
+
+    @property
+    def nodes(self) -> _NodeView:
+        """Mapping of live node views (``net.nodes["cabin"].temperature_c = 21``)."""
+
+        return _NodeView(self)
+
+    @property
+    def edges(self) -> _EdgeView:
+        """Sequence of live edge views."""
 
-    def add_node(self, node: ThermalNode) -> None:
-        self.nodes[node.node_id] = node
+        return _EdgeView(self)
 
-    def add_edge(self, edge: ThermalEdge) -> None:
-        self.edges.append(edge)
+    def index_of(self, node: NodeRef) -> int:
+        """Return the integer index for a node ID (ints pass through)."""
+
+        if isinstance(node, (int, np.integer)):
+            if not 0 <= node < self.n_nodes:
+                raise IndexError(f"Node index {node} out of range.")
+            return int(node)
+        try:
+            return self._index[node]
+        except KeyError:
+            raise KeyError(f"Node '{node}' is not in the network.") from None
+
+    def _indices(self, nodes) -> np.ndarray:
+        """Vectorized index_of for arrays of ints or sequences of IDs."""
+
+        arr = np.asarray(nodes)
+        if arr.dtype.kind in "iu":
+            idx = arr.astype(np.int64, copy=False)
+            if idx.size and (idx.min() < 0 or idx.max() >= self.n_nodes):
+                raise IndexError("Edge endpoint index out of range.")
+            return idx
+        return np.fromiter((self.index_of(n) for n in arr.tolist()), dtype=np.int64, count=arr.size)
+
+    def node_ids(self) -> List[str]:
+        return list(self._ids)
+
+    def node(self, node: NodeRef) -> ThermalNode:
+        """Return a snapshot of one node."""
+
+        i = self.index_of(node)
+        return ThermalNode(
+            node_id=self._ids[i],
+            capacity_kj_per_k=float(self._capacity.view[i]),
+            temperature_c=float(self._temperature.view[i]),
+            heat_load_kw=float(self._load.view[i]),
+            fixed=bool(self._fixed.view[i]),
+        )
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    def add_node(self, node: ThermalNode) -> int:
+        """Add (or overwrite) a node and return its index."""
+
+        existing = self._index.get(node.node_id)
+        if existing is not None:
+            self._capacity.view[existing] = node.capacity_kj_per_k
+            self._temperature.view[existing] = node.temperature_c
+            self._load.view[existing] = node.heat_load_kw
+            self._fixed.view[existing] = node.fixed
+            self.revision += 1
+            return existing
+
+        i = len(self._ids)
+        self._ids.append(node.node_id)
+        self._index[node.node_id] = i
+        self._capacity.append(node.capacity_kj_per_k)
+        self._temperature.append(node.temperature_c)
+        self._load.append(node.heat_load_kw)
+        self._fixed.append(node.fixed)
+        self.revision += 1
+        return i
+
+    def add_nodes(
+        self,
+        node_ids: Sequence[str],
+        *,
+        capacity_kj_per_k=0.0,
+        temperature_c=20.0,
+        heat_load_kw=0.0,
+        fixed=False,
+    ) -> np.ndarray:
+        """
+        Bulk-add new nodes from arrays (scalars broadcast). Returns their indices.
+
+        Raises ValueError if any ID already exists or repeats within the batch.
+        """
+
+        ids = [str(node_id) for node_id in node_ids]
+        n = len(ids)
+        start = len(self._ids)
+        new_index = dict(zip(ids, range(start, start + n)))
+        if len(new_index) != n:
+            raise ValueError("Duplicate node IDs within add_nodes batch.")
+        clash = new_index.keys() & self._index.keys()
+        if clash:
+            raise ValueError(f"Node IDs already present: {sorted(clash)[:5]}")
+
+        self._ids.extend(ids)
+        self._index.update(new_index)
+        self._capacity.extend(np.broadcast_to(np.asarray(capacity_kj_per_k, dtype=float), (n,)))
+        self._temperature.extend(np.broadcast_to(np.asarray(temperature_c, dtype=float), (n,)))
+        self._load.extend(np.broadcast_to(np.asarray(heat_load_kw, dtype=float), (n,)))
+        self._fixed.extend(np.broadcast_to(np.asarray(fixed, dtype=bool), (n,)))
+        self.revision += 1
+        return np.arange(start, start + n, dtype=np.int64)
+
+    def add_edge(self, edge: ThermalEdge) -> int:
+        """Add one conductive edge and return its index."""
+
+        src = self.index_of(edge.from_node)
+        dst = self.index_of(edge.to_node)
+        self._edge_src.append(src)
+        self._edge_dst.append(dst)
+        self._edge_g.append(edge.conductance_kw_per_k)
+        self.revision += 1
+        return self.n_edges - 1
+
+    def add_edges(self, from_nodes, to_nodes, conductance_kw_per_k) -> np.ndarray:
+        """
+        Bulk-add edges. Endpoints may be integer index arrays (fast path) or
+        sequences of node IDs. Returns the new edge indices.
+        """
+
+        src = self._indices(from_nodes)
+        dst = self._indices(to_nodes)
+        if src.shape != dst.shape:
+            raise ValueError("from_nodes and to_nodes must have the same length.")
+        g = np.broadcast_to(np.asarray(conductance_kw_per_k, dtype=float), src.shape)
+        start = self.n_edges
+        self._edge_src.extend(src)
+        self._edge_dst.extend(dst)
+        self._edge_g.extend(g)
+        self.revision += 1
+        return np.arange(start, start + src.size, dtype=np.int64)
+
+    def add_radiative_edges(
+        self,
+        from_nodes,
+        to_nodes,
+        *,
+        area_m2,
+        view_factor,
+        emissivity_from=0.9,
+        emissivity_to=0.9,
+    ) -> np.ndarray:
+        """
+        Bulk-add grey-body radiative exchange between surface nodes.
+
+        ``area_m2`` and ``view_factor`` refer to the emitting (from) surface.
+        The exchange coefficient is σ·A·F·ε₁·ε₂, i.e. inter-reflections are
+        neglected, which is adequate for high-emissivity radiator/hull panels.
+        Each edge carries the exchange both ways, so add every surface pair
+        once (``thermal.radiation.view_factors`` returns i < j pairs).
+        Returns the new radiative edge indices.
+        """
+
+        src = self._indices(from_nodes)
+        dst = self._indices(to_nodes)
+        if src.shape != dst.shape:
+            raise ValueError("from_nodes and to_nodes must have the same length.")
+        coeff = (
+            STEFAN_BOLTZMANN
+            / 1000.0
+            * np.asarray(area_m2, dtype=float)
+            * np.asarray(view_factor, dtype=float)
+            * np.asarray(emissivity_from, dtype=float)
+            * np.asarray(emissivity_to, dtype=float)
+        )
+        start = self.n_radiative_edges
+        self._rad_src.extend(src)
+        self._rad_dst.extend(dst)
+        self._rad_coeff.extend(np.broadcast_to(coeff, src.shape))
+        self.revision += 1
+        return np.arange(start, start + src.size, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # Adjacency
+    # ------------------------------------------------------------------
+    def _sync_adjacency(self) -> None:
+        """Merge edges appended since the last query into the CSR arrays."""
+
+        n = self.n_nodes
+        if self._indptr.size < n + 1:
+            pad = np.full(n + 1 - self._indptr.size, self._indptr[-1], dtype=np.int64)
+            self._indptr = np.concatenate([self._indptr, pad])
+
+        start, stop = self._csr_edges, self.n_edges
+        if start == stop:
+            return
+
+        src = self._edge_src.view[start:stop]
+        dst = self._edge_dst.view[start:stop]
+        eids = np.arange(start, stop, dtype=np.int64)
+        rows = np.concatenate([src, dst])
+        order = np.argsort(rows, kind="stable")
+        rows = rows[order]
+        nbrs = np.concatenate([dst, src])[order]
+        edge_ids = np.concatenate([eids, eids])[order]
+
+        # Append each new entry at the end of its row's existing segment.
+        positions = self._indptr[rows + 1]
+        self._adj_nodes = np.insert(self._adj_nodes, positions, nbrs)
+        self._adj_edges = np.insert(self._adj_edges, positions, edge_ids)
+        counts = np.bincount(rows, minlength=n)
+        self._indptr[1:] += np.cumsum(counts)
+        self._csr_edges = stop
+
+    def adjacency(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (indptr, neighbour_indices, edge_indices) of the symmetric CSR."""
+
+        self._sync_adjacency()
+        return self._indptr, self._adj_nodes, self._adj_edges
+
+    def neighbor_indices(self, node: NodeRef) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (neighbour indices, edge indices) for one node in O(degree)."""
+
+        i = self.index_of(node)
+        indptr, nbrs, eids = self.adjacency()
+        lo, hi = indptr[i], indptr[i + 1]
+        return nbrs[lo:hi], eids[lo:hi]
+
+    def neighbors(self, node: NodeRef) -> List[Tuple[str, float]]:
+        """Return ``[(neighbour_id, conductance_kw_per_k), ...]`` for one node."""
+
+        nbrs, eids = self.neighbor_indices(node)
+        g = self._edge_g.view[eids]
+        return [(self._ids[j], float(gj)) for j, gj in zip(nbrs.tolist(), g)]
+
+    def degree(self) -> np.ndarray:
+        indptr, _, _ = self.adjacency()
+        return np.diff(indptr)
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+    def set_conductance(self, from_node: NodeRef, to_node: NodeRef, value_kw_per_k: float) -> None:
+        """Update the conductance of every edge joining two nodes."""
+
+        j = self.index_of(to_node)
+        nbrs, eids = self.neighbor_indices(from_node)
+        hits = eids[nbrs == j]
+        if hits.size == 0:
+            raise KeyError(f"No edge between '{from_node}' and '{to_node}'.")
+        self._edge_g.view[hits] = value_kw_per_k
+        self.revision += 1
+
+    def set_conductances(self, edge_indices, values_kw_per_k) -> None:
+        """Bulk-update conductances by edge index."""
+
+        self._edge_g.view[np.asarray(edge_indices, dtype=np.int64)] = values_kw_per_k
+        self.revision += 1
+
+    def set_capacities(self, capacities_kj_per_k) -> None:
+        self._capacity.view[:] = capacities_kj_per_k
+        self.revision += 1
+
+    def set_temperatures(self, temperatures_c: np.ndarray) -> None:
+        """Write a temperature vector (index order) back onto the nodes."""
+
+        values = np.asarray(temperatures_c, dtype=float)
+        if values.shape != (self.n_nodes,):
+            raise ValueError(
+                f"Expected {self.n_nodes} temperatures, got shape {values.shape}."
+            )
+        self._temperature.view[:] = values
+
+    def set_loads(self, heat_loads_kw: np.ndarray) -> None:
+        self._load.view[:] = heat_loads_kw
 
     def summary(self) -> Dict[str, int]:
         """Return counts of nodes and edges for quick diagnostics."""
 
-        return {"nodes": len(self.nodes), "edges": len(self.edges)}
+        return {"nodes": self.n_nodes, "edges": self.n_edges}
+
+    # ------------------------------------------------------------------
+    # Vector / matrix views (index order)
+    # ------------------------------------------------------------------
+    def capacity_vector(self) -> np.ndarray:
+        return self._capacity.view.copy()
+
+    def temperature_vector(self) -> np.ndarray:
+        return self._temperature.view.copy()
+
+    def load_vector(self) -> np.ndarray:
+        return self._load.view.copy()
+
+    def fixed_mask(self) -> np.ndarray:
+        return self._fixed.view.copy()
+
+    def edge_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return copies of (from_index, to_index, conductance_kw_per_k)."""
+
+        return self._edge_src.view.copy(), self._edge_dst.view.copy(), self._edge_g.view.copy()
+
+    def radiative_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return copies of (from_index, to_index, coefficient_kw_per_k4)."""
+
+        return self._rad_src.view.copy(), self._rad_dst.view.copy(), self._rad_coeff.view.copy()
+
+    def conductance_matrix(self):
+        """
+        Return the weighted graph Laplacian G [kW/K] as a SciPy CSR matrix.
+
+        Row i holds +ΣG on the diagonal and -G_ij off-diagonal, so the net heat
+        leaving node i is (G @ T)[i].
+        """
+
+        _require_scipy()
+        n = self.n_nodes
+        rows = self._edge_src.view
+        cols = self._edge_dst.view
+        g = self._edge_g.view
+
+        off = sparse.coo_matrix(
+            (np.concatenate([-g, -g]), (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+            shape=(n, n),
+        ).tocsr()
+        diag = -np.asarray(off.sum(axis=1)).ravel()
+        return (off + sparse.diags(diag)).tocsr()
+
+    def transient(
+        self, dt_s: float, *, theta: float = 1.0, parts=None, workers: int = 0
+    ) -> "ImplicitStepper":
+        """Return an implicit time stepper bound to this network (see thermal.transient)."""
+
+        from thermal.transient import ImplicitStepper
+
+        return ImplicitStepper(self, dt_s, theta=theta, parts=parts, workers=workers)
+
+    def partition(self, n_parts: int = 2, *, tags=None) -> np.ndarray:
+        """Subdomain number per node: by ``tags`` if given, else BFS bisection."""
+
+        from thermal.partition import bisect, partition_by_tags
+
+        return partition_by_tags(self, tags) if tags is not None else bisect(self, n_parts)
+
+    def solve_steady(self, **kwargs) -> "SteadyResult":
+        """Solve for steady-state temperatures, including radiation (see thermal.radiation)."""
+
+        from thermal.radiation import solve_steady
+
+        return solve_steady(self, **kwargs)
+
+    def reduce(self, outputs: Sequence[str], **kwargs) -> "ReducedModel":
+        """Small surrogate observed at ``outputs`` (see thermal.reduction)."""
+
+        from thermal.reduction import reduce_network
+
+        return reduce_network(self, outputs, **kwargs)
+
+    def save(self, path, *, factorizations: bool = False):
+        """Write a reloadable binary snapshot (see thermal.storage)."""
+
+        from thermal.storage import save_network
+
+        return save_network(self, path, factorizations=factorizations)
+
+    @classmethod
+    def load(cls, path, *, mmap: bool = True) -> "ThermalNetwork":
+        """Reload a snapshot written by ``save`` (memory-mapped by default)."""
+
+        from thermal.storage import load_network
+
+        return load_network(path, mmap=mmap)
@@ -0,0 +1,227 @@
+"""
+parallel.py
+------------
+Domain-decomposed (Schur-complement) linear solves across worker processes.
+
+Method
+    Nodes are split into subdomain interiors I_k and an interface Γ (for
+    every cut edge, the endpoint in the higher-numbered part). Interiors of
+    different subdomains never touch, so
+
+        S = A_ΓΓ - Σ_k A_ΓI_k · A_I_kI_k⁻¹ · A_I_kΓ
+
+    is assembled once. Each solve then needs:
+        1. every worker: y_k = A_ΓI_k · A_I_kI_k⁻¹ · b_I_k      (parallel)
+        2. main:          x_Γ = S⁻¹ (b_Γ - Σ y_k)             (dense, small)
+        3. every worker: x_I_k = A_I_kI_k⁻¹ (b_I_k - A_I_kΓ x_Γ) (parallel)
+
+    Workers are persistent processes that keep their subdomain LUs between
+    solves, so a transient run pays the factorization cost once. Subdomains
+    are dealt round-robin onto ``workers`` processes.
+
+``workers=0`` runs the same subdomain code in-process (debugging, platforms
+without fork, or tiny models where IPC would dominate).
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+from typing import List, Optional
+
+import numpy as np
+
+from thermal.network import _require_scipy
+
+try:
+    from scipy import sparse  # type: ignore
+    from scipy.linalg import lu_factor, lu_solve  # type: ignore
+    from scipy.sparse.linalg import splu  # type: ignore
+except ImportError:  # pragma: no cover - defensive guard
+    sparse = None  # type: ignore
+    lu_factor = lu_solve = splu = None  # type: ignore
+
+
+class _Subdomain:
+    """Interior block of one subdomain plus its coupling to the interface."""
+
+    def __init__(self, A_II, A_IG, A_GI) -> None:
+        self.lu = splu(A_II.tocsc())
+        self.A_IG = A_IG.tocsr()
+        self.A_GI = A_GI.tocsr()
+        self._b = None
+
+    def schur(self, block: int = 64) -> np.ndarray:
+        """Dense A_ΓI·A_II⁻¹·A_IΓ over this subdomain's local interface."""
+
+        n_g = self.A_IG.shape[1]
+        out = np.zeros((n_g, n_g))
+        for lo in range(0, n_g, block):
+            hi = min(lo + block, n_g)
+            cols = self.A_IG[:, lo:hi].toarray()
+            out[:, lo:hi] = self.A_GI @ self.lu.solve(cols)
+        return out
+
+    def reduce(self, b_I: np.ndarray) -> np.ndarray:
+        self._b = b_I
+        return self.A_GI @ self.lu.solve(b_I)
+
+    def back(self, x_G: np.ndarray) -> np.ndarray:
+        return self.lu.solve(self._b - self.A_IG @ x_G)
+
+
+def _worker_main(conn, blocks) -> None:  # pragma: no cover - runs in child
+    subs = [_Subdomain(*blk) for blk in blocks]
+    conn.send([sub.schur() for sub in subs])
+    while True:
+        msg = conn.recv()
+        if msg is None:
+            break
+        kind, payload = msg
+        if kind == "reduce":
+            conn.send([sub.reduce(b) for sub, b in zip(subs, payload)])
+        else:
+            conn.send([sub.back(x) for sub, x in zip(subs, payload)])
+    conn.close()
+
+
+def interface_nodes(A, parts: np.ndarray) -> np.ndarray:
+    """Boolean mask of interface nodes for a partition of matrix ``A``."""
+
+    coo = sparse.coo_matrix(A)
+    cut = parts[coo.row] != parts[coo.col]
+    r, c = coo.row[cut], coo.col[cut]
+    mask = np.zeros(A.shape[0], dtype=bool)
+    mask[np.where(parts[r] > parts[c], r, c)] = True
+    return mask
+
+
+class SchurComplementSolver:
+    """
+    Drop-in replacement for a SuperLU object (``.solve(b)``) on a
+    partitioned sparse matrix.
+    """
+
+    def __init__(self, A, parts: np.ndarray, *, workers: int = 0) -> None:
+        _require_scipy()
+        A = sparse.csr_matrix(A)
+        parts = np.asarray(parts, dtype=np.int64)
+        if parts.shape != (A.shape[0],):
+            raise ValueError("parts must have one entry per matrix row.")
+
+        is_gamma = interface_nodes(A, parts)
+        self.gamma = np.flatnonzero(is_gamma)
+
+        A_GG = A[self.gamma][:, self.gamma].toarray()
+        self.interiors: List[np.ndarray] = []
+        self.local_gammas: List[np.ndarray] = []
+        blocks = []
+        for k in np.unique(parts):
+            interior = np.flatnonzero((parts == k) & ~is_gamma)
+            if interior.size == 0:
+                continue
+            rows = A[interior]
+            touching = np.unique(rows[:, self.gamma].nonzero()[1])
+            local_gamma = self.gamma[touching]
+            blocks.append(
+                (rows[:, interior], rows[:, local_gamma], A[local_gamma][:, interior])
+            )
+            self.interiors.append(interior)
+            self.local_gammas.append(touching)
+
+        self._procs: List[mp.Process] = []
+        self._conns = []
+        self._assignment: List[List[int]] = []
+        self._local: List[_Subdomain] = []
+        if workers > 0:
+            ctx = mp.get_context()
+            n_proc = min(workers, len(blocks))
+            self._assignment = [list(range(w, len(blocks), n_proc)) for w in range(n_proc)]
+            for owned in self._assignment:
+                parent, child = ctx.Pipe()
+                proc = ctx.Process(
+                    target=_worker_main, args=(child, [blocks[k] for k in owned]), daemon=True
+                )
+                proc.start()
+                child.close()
+                self._procs.append(proc)
+                self._conns.append(parent)
+            contributions: List[np.ndarray] = [None] * len(blocks)  # type: ignore[list-item]
+            for conn, owned in zip(self._conns, self._assignment):
+                for k, contrib in zip(owned, conn.recv()):
+                    contributions[k] = contrib
+        else:
+            self._local = [_Subdomain(*blk) for blk in blocks]
+            contributions = [sub.schur() for sub in self._local]
+
+        S = A_GG
+        for touching, contrib in zip(self.local_gammas, contributions):
+            S[np.ix_(touching, touching)] -= contrib
+        self._schur = lu_factor(S) if S.size else None
+        self.shape = A.shape
+
+    @property
+    def n_interface(self) -> int:
+        return int(self.gamma.size)
+
+    def _scatter(self, kind: str, payloads: List[np.ndarray]) -> List[np.ndarray]:
+        """Run one phase on every subdomain (in workers when available)."""
+
+        if not self._conns:
+            return [getattr(sub, kind)(p) for sub, p in zip(self._local, payloads)]
+        for conn, owned in zip(self._conns, self._assignment):
+            conn.send((kind, [payloads[k] for k in owned]))
+        results: List[np.ndarray] = [None] * len(payloads)  # type: ignore[list-item]
+        for conn, owned in zip(self._conns, self._assignment):
+            for k, value in zip(owned, conn.recv()):
+                results[k] = value
+        return results
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        b = np.asarray(b, dtype=float)
+        x = np.empty_like(b)
+
+        reduced = self._scatter("reduce", [b[interior] for interior in self.interiors])
+        g = b[self.gamma].copy()
+        for touching, y in zip(self.local_gammas, reduced):
+            g[touching] -= y
+        x_gamma = lu_solve(self._schur, g) if self._schur is not None else g
+        x[self.gamma] = x_gamma
+
+        backs = self._scatter("back", [x_gamma[touching] for touching in self.local_gammas])
+        for interior, values in zip(self.interiors, backs):
+            x[interior] = values
+        return x
+
+    def close(self) -> None:
+        """Stop worker processes (safe to call twice)."""
+
+        for conn in self._conns:
+            try:
+                conn.send(None)
+                conn.close()
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+        self._conns, self._procs = [], []
+
+    def __enter__(self) -> "SchurComplementSolver":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __del__(self) -> None:  # pragma: no cover - best-effort cleanup
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def make_solver(A, parts: Optional[np.ndarray] = None, *, workers: int = 0):
+    """Return SuperLU for unpartitioned systems, else a SchurComplementSolver."""
+
+    _require_scipy()
+    if parts is None or np.unique(parts).size <= 1:
+        return splu(sparse.csc_matrix(A))
+    return SchurComplementSolver(A, parts, workers=workers)
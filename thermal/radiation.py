@@ -0,0 +1,269 @@
+"""
+radiation.py
+-------------
+Radiative exchange for thermal networks: view factors and a Newton steady solver.
+
+View factors
+    • Flat-patch approximation F_ij ≈ cosθᵢ·cosθⱼ·Aⱼ / (π r²), clipped to
+      [0, 1]; no obstruction (shadowing) test. Valid when patches are small
+      compared with their separation — mesh large panels finer.
+    • One triplet per unordered pair (i < j); the exchange is reciprocal.
+    • Results are cached on disk as ``<sha256>.npz`` keyed by a hash of the
+      geometry arrays and parameters, so a hull/radiator mesh is only
+      integrated once.
+
+Steady solve
+    Residual on free nodes (temperatures in K):
+
+        r(T) = Q - G·T - Σ c·(Tᵢ⁴ - Tⱼ⁴)
+
+    Newton: (G + 4c·T³ terms)·ΔT = r. The combined conduction + radiation
+    sparsity pattern is assembled once; each iteration only refills the CSR
+    data array (one bincount) before re-factorizing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from common.conversions import C_to_K, K_to_C
+from thermal.network import ThermalNetwork, _require_scipy
+
+try:
+    from scipy import sparse  # type: ignore
+    from scipy.sparse.linalg import splu  # type: ignore
+except ImportError:  # pragma: no cover - defensive guard
+    sparse = None  # type: ignore
+    splu = None  # type: ignore
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "view_factors"
+
+
+# ---------------------------------------------------------------------------
+# View factors
+# ---------------------------------------------------------------------------
+def _rows_per_block(n: int, memory_budget_bytes: int) -> int:
+    # Per block row: the (n, 3) separation vectors plus about six (n,)
+    # float64 temporaries (r², two cosines, both view factors, mask).
+    return int(max(1, min(n, memory_budget_bytes // max(8 * 9 * n, 1))))
+
+
+def view_factors(
+    centroids_m: np.ndarray,
+    normals: np.ndarray,
+    areas_m2: np.ndarray,
+    *,
+    min_view_factor: float = 1e-6,
+    block_size: Optional[int] = None,
+    memory_budget_bytes: int = 256 * 2**20,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return sparse triplets (i, j, F_ij) with i < j, one per patch pair.
+
+    Exchange is reciprocal (Aᵢ·F_ij = Aⱼ·F_ji before clipping), so each pair appears once and
+    maps onto one radiative edge: ``add_radiative_edges(i, j,
+    area_m2=areas[i], view_factor=F_ij)``. A pair is kept when either
+    direction exceeds ``min_view_factor``.
+
+    Pairs are evaluated in row blocks sized so the block temporaries stay
+    within ``memory_budget_bytes`` (``block_size`` overrides it).
+    """
+
+    c = np.asarray(centroids_m, dtype=float)
+    nrm = np.asarray(normals, dtype=float)
+    nrm = nrm / np.linalg.norm(nrm, axis=1, keepdims=True)
+    area = np.asarray(areas_m2, dtype=float)
+    n = c.shape[0]
+    rows = int(block_size) if block_size is not None else _rows_per_block(n, memory_budget_bytes)
+
+    out_i, out_j, out_f = [], [], []
+    for lo in range(0, n, rows):
+        hi = min(lo + rows, n)
+        # Only columns j > i are needed; the block covers columns [lo, n).
+        d = c[None, lo:, :] - c[lo:hi, None, :]  # (b, n - lo, 3) from i to j
+        r2 = np.einsum("bnk,bnk->bn", d, d)
+        upper = np.arange(lo, n)[None, :] > np.arange(lo, hi)[:, None]
+        r2[~upper] = np.inf
+        cos_i = np.einsum("bnk,bk->bn", d, nrm[lo:hi])
+        cos_j = -np.einsum("bnk,nk->bn", d, nrm[lo:])
+        with np.errstate(invalid="ignore"):
+            kernel = np.where((cos_i > 0) & (cos_j > 0), cos_i * cos_j / (np.pi * r2 * r2), 0.0)
+        f_ij = np.clip(kernel * area[None, lo:], 0.0, 1.0)
+        f_ji = np.clip(kernel * area[lo:hi, None], 0.0, 1.0)
+        bi, bj = np.nonzero((f_ij > min_view_factor) | (f_ji > min_view_factor))
+        out_i.append(bi + lo)
+        out_j.append(bj + lo)
+        out_f.append(f_ij[bi, bj])
+
+    if not out_i:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0)
+    return np.concatenate(out_i), np.concatenate(out_j), np.concatenate(out_f)
+
+
+def geometry_hash(centroids_m, normals, areas_m2, **params) -> str:
+    """Stable SHA-256 over geometry arrays and keyword parameters."""
+
+    digest = hashlib.sha256()
+    for arr in (centroids_m, normals, areas_m2):
+        a = np.ascontiguousarray(arr, dtype=np.float64)
+        digest.update(str(a.shape).encode())
+        digest.update(a.tobytes())
+    for key in sorted(params):
+        digest.update(f"{key}={params[key]!r};".encode())
+    return digest.hexdigest()
+
+
+def cached_view_factors(
+    centroids_m: np.ndarray,
+    normals: np.ndarray,
+    areas_m2: np.ndarray,
+    *,
+    cache_dir: Union[str, Path, None] = None,
+    min_view_factor: float = 1e-6,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """view_factors() with an on-disk cache keyed by geometry hash."""
+
+    root = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    key = geometry_hash(centroids_m, normals, areas_m2, min_view_factor=min_view_factor, pairs="i<j")
+    path = root / f"{key}.npz"
+    if path.exists():
+        with np.load(path) as data:
+            return data["i"], data["j"], data["f"]
+
+    i, j, f = view_factors(centroids_m, normals, areas_m2, min_view_factor=min_view_factor)
+    root.mkdir(parents=True, exist_ok=True)
+    # Write-then-rename so concurrent runs never see a half-written cache file.
+    fd, tmp = tempfile.mkstemp(dir=root, suffix=".npz.tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            np.savez(handle, i=i, j=j, f=f)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return i, j, f
+
+
+# ---------------------------------------------------------------------------
+# Newton steady-state solver
+# ---------------------------------------------------------------------------
+@dataclass
+class SteadyResult:
+    temperatures_c: np.ndarray
+    iterations: int
+    max_residual_kw: float
+    converged: bool
+
+
+class _JacobianPattern:
+    """Free-node CSR pattern of G + radiative Jacobian, refillable in place."""
+
+    def __init__(self, network: ThermalNetwork) -> None:
+        _require_scipy()
+        n = network.n_nodes
+        fixed = network.fixed_mask()
+        self.free = np.flatnonzero(~fixed)
+        local = np.full(n, -1, dtype=np.int64)
+        local[self.free] = np.arange(self.free.size)
+        self.local = local
+        self.revision = network.revision
+
+        src, dst, g = network.edge_arrays()
+        rs, rd, coeff = network.radiative_arrays()
+        self.G = network.conductance_matrix()
+        self.rad_src, self.rad_dst, self.rad_coeff = rs, rd, coeff
+
+        # Contribution list: conduction (constant) then radiation (per-iteration).
+        rows = np.concatenate([src, dst, src, dst, rs, rd, rs, rd])
+        cols = np.concatenate([src, dst, dst, src, rs, rd, rd, rs])
+        keep = (local[rows] >= 0) & (local[cols] >= 0)
+        self._keep = keep
+        lr, lc = local[rows[keep]], local[cols[keep]]
+
+        m = self.free.size
+        pattern = sparse.coo_matrix((np.ones(lr.size), (lr, lc)), shape=(m, m)).tocsr()
+        pattern.sum_duplicates()
+        pattern.sort_indices()
+        row_of = np.repeat(np.arange(m), np.diff(pattern.indptr))
+        keys = row_of * m + pattern.indices
+        self._pos = np.searchsorted(keys, lr * m + lc)
+        self._pattern = pattern
+        self._cond_values = np.concatenate([g, g, -g, -g])
+
+    def matrix(self, T_k: np.ndarray):
+        """Return the Newton matrix G + ∂R/∂T restricted to free nodes."""
+
+        rs, rd, c = self.rad_src, self.rad_dst, self.rad_coeff
+        d_src = 4.0 * c * T_k[rs] ** 3
+        d_dst = 4.0 * c * T_k[rd] ** 3
+        rad_values = np.concatenate([d_src, d_dst, -d_dst, -d_src])
+        values = np.concatenate([self._cond_values, rad_values])[self._keep]
+        data = np.bincount(self._pos, weights=values, minlength=self._pattern.nnz)
+        mat = self._pattern.copy()
+        mat.data = data
+        return mat.tocsc()
+
+    def residual(self, T_k: np.ndarray, Q_kw: np.ndarray) -> np.ndarray:
+        """Net heat into every node [kW] (only free entries are meaningful)."""
+
+        r = Q_kw - self.G @ T_k
+        rs, rd, c = self.rad_src, self.rad_dst, self.rad_coeff
+        flux = c * (T_k[rs] ** 4 - T_k[rd] ** 4)
+        np.subtract.at(r, rs, flux)
+        np.add.at(r, rd, flux)
+        return r
+
+
+def solve_steady(
+    network: ThermalNetwork,
+    *,
+    tol_kw: float = 1e-6,
+    tol_k: float = 1e-9,
+    max_iter: int = 30,
+    write_back: bool = True,
+) -> SteadyResult:
+    """
+    Newton solve for steady temperatures with conduction, radiation and loads.
+
+    Fixed nodes keep their prescribed temperature. Starts from the current
+    node temperatures; conduction-only networks converge in one iteration.
+    Stops when the worst nodal imbalance is below ``tol_kw`` or the Newton
+    update is below ``tol_k``.
+    """
+
+    jac = _JacobianPattern(network)
+    T_k = C_to_K(network.temperature_vector())
+    Q = network.load_vector()
+    free = jac.free
+
+    converged = False
+    max_res = float("inf")
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        r = jac.residual(T_k, Q)[free]
+        delta = splu(jac.matrix(T_k)).solve(r)
+        # Damp steps that would push any node through absolute zero.
+        step = 1.0
+        while np.any(T_k[free] + step * delta <= 0.0) and step > 1e-4:
+            step *= 0.5
+        T_k[free] += step * delta
+        max_res = float(np.max(np.abs(jac.residual(T_k, Q)[free]), initial=0.0))
+        if max_res <= tol_kw or float(np.max(np.abs(step * delta), initial=0.0)) <= tol_k:
+            converged = True
+            break
+
+    T_c = K_to_C(T_k)
+    if write_back:
+        network.set_temperatures(T_c)
+    return SteadyResult(
+        temperatures_c=T_c, iterations=iterations, max_residual_kw=max_res, converged=converged
+    )
@@ -0,0 +1,304 @@
+"""
+reduction.py
+-------------
+Projection-based model order reduction for thermal networks.
+
+Both methods build a basis V (free nodes × r) and project the network
+congruently:
+
+    C_r = Vᵀ C V,   G_r = Vᵀ G V,   B_r = Vᵀ G_FB,   q_r = Vᵀ Q
+
+Congruence keeps C_r and G_r symmetric positive (semi)definite, so the
+reduced model is stable for any step size the full model tolerated.
+
+Methods
+    • "krylov" — block moment matching at s = 0 (PRIMA-style):
+      V = orth[G⁻¹R, (G⁻¹C)G⁻¹R, ...] with R = [boundary couplings, loads,
+      output selectors, C·T₀], plus T₀ itself. Steady state is reproduced
+      exactly; each extra Arnoldi block matches further transient moments.
+      A network without fixed nodes has a singular G (its mean temperature
+      floats), so it is expanded about s₀ = 1/dt_s instead, with
+      G + C/dt_s in place of G.
+    • "kron" — keep the output nodes, eliminate the rest statically
+      (V = [I; -G_ii⁻¹G_ik]). Exact at steady state; interior thermal mass is
+      lumped onto kept nodes through V, so fast transients are smoothed.
+
+``reduce_network`` validates the candidate against a full implicit run of
+the original network and, for "krylov", grows the basis until the worst
+output deviation is within ``tol_k``. The achieved error and whether it met
+``tol_k`` (``converged``) are stored on the returned model; a Krylov basis
+that stops at ``max_order`` (or runs out of new directions) above the
+tolerance also emits a RuntimeWarning.
+"""
+
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from thermal.network import ThermalNetwork, _require_scipy
+from thermal.transient import ImplicitStepper, TransientChunk
+
+try:
+    from scipy import sparse  # type: ignore
+    from scipy.sparse.linalg import splu  # type: ignore
+except ImportError:  # pragma: no cover - defensive guard
+    sparse = None  # type: ignore
+    splu = None  # type: ignore
+
+
+@dataclass
+class ReducedModel:
+    """Small dense surrogate of a ThermalNetwork, observed at ``output_ids``."""
+
+    method: str
+    output_ids: List[str]
+    basis: np.ndarray  # (n_free, r)
+    C_r: np.ndarray
+    G_r: np.ndarray
+    B_r: np.ndarray  # (r, n_fixed) coupling to boundary temperatures
+    q_r: np.ndarray  # projected static loads
+    boundary_c: np.ndarray  # boundary temperatures at reduction time
+    output_rows: np.ndarray  # (n_out, r) rows of V at the output nodes
+    x0: np.ndarray  # reduced initial state
+    error_k: float = float("nan")  # worst validated output deviation
+    converged: bool = False  # error_k <= tol_k of the reduction
+    _free: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64), repr=False)
+
+    @property
+    def order(self) -> int:
+        return int(self.basis.shape[1])
+
+    def project_loads(self, heat_loads_kw: np.ndarray) -> np.ndarray:
+        """Project a full-network load vector (index order) into reduced space."""
+
+        return self.basis.T @ np.asarray(heat_loads_kw, dtype=float)[self._free]
+
+    def run(
+        self,
+        n_steps: int,
+        dt_s: float,
+        *,
+        theta: float = 1.0,
+        chunk_steps: int = 4096,
+        loads: Optional[Callable[[float], np.ndarray]] = None,
+        boundary_c: Optional[np.ndarray] = None,
+    ) -> Iterator[TransientChunk]:
+        """
+        θ-method stepping of the reduced model; yields output-node chunks.
+
+        ``loads(t_s)`` must return *reduced* loads (use ``project_loads`` once
+        per profile, not per step, to keep steps O(r²)); like the full
+        stepper, each step uses θ·loads(tⁿ⁺¹) + (1-θ)·loads(tⁿ).
+        """
+
+        lhs = self.C_r / dt_s + theta * self.G_r
+        rhs = self.C_r / dt_s - (1.0 - theta) * self.G_r
+        step_matrix = np.linalg.solve(lhs, rhs)
+        inv_lhs = np.linalg.inv(lhs)
+        t_b = self.boundary_c if boundary_c is None else np.asarray(boundary_c, dtype=float)
+        forcing = -self.B_r @ t_b
+        constant = inv_lhs @ (self.q_r + forcing)
+
+        x = self.x0.copy()
+        t = 0.0
+        q_prev = loads(t) if loads is not None and theta < 1.0 else None
+        done = 0
+        while done < n_steps:
+            size = min(chunk_steps, n_steps - done)
+            times = np.empty(size)
+            states = np.empty((size, x.size))
+            for k in range(size):
+                t += dt_s
+                if loads is None:
+                    x = step_matrix @ x + constant
+                else:
+                    q = loads(t)
+                    q_mix = q if q_prev is None else theta * q + (1.0 - theta) * q_prev
+                    x = step_matrix @ x + inv_lhs @ (q_mix + forcing)
+                    if q_prev is not None:
+                        q_prev = q
+                times[k] = t
+                states[k] = x
+            done += size
+            yield TransientChunk(
+                times_s=times, temperatures_c=states @ self.output_rows.T, node_ids=self.output_ids
+            )
+
+
+def _orthonormalize(block: np.ndarray, basis: Optional[np.ndarray]) -> np.ndarray:
+    """Block Gram–Schmidt (twice) against ``basis``; drops dependent columns."""
+
+    for _ in range(2):
+        if basis is not None and basis.size:
+            block = block - basis @ (basis.T @ block)
+    q, r = np.linalg.qr(block)
+    keep = np.abs(np.diag(r)) > 1e-10 * max(1.0, np.abs(r).max(initial=0.0))
+    return q[:, keep]
+
+
+def _project(
+    network: ThermalNetwork, V: np.ndarray, method: str, outputs: np.ndarray, free: np.ndarray
+) -> ReducedModel:
+    fixed = np.flatnonzero(network.fixed_mask())
+    G = network.conductance_matrix()
+    G_ff = G[free][:, free]
+    C = network.capacity_vector()[free]
+    T0 = network.temperature_vector()
+
+    C_r = V.T @ (C[:, None] * V)
+    G_r = V.T @ (G_ff @ V)
+    B_r = V.T @ G[free][:, fixed].toarray() if fixed.size else np.zeros((V.shape[1], 0))
+    q_r = V.T @ network.load_vector()[free]
+
+    # C-weighted projection of the initial state; fall back to plain least
+    # squares when the kept subspace carries no thermal mass.
+    rhs = V.T @ (C * T0[free])
+    try:
+        x0 = np.linalg.solve(C_r, rhs)
+    except np.linalg.LinAlgError:
+        x0 = np.linalg.lstsq(V, T0[free], rcond=None)[0]
+
+    local = np.full(network.n_nodes, -1, dtype=np.int64)
+    local[free] = np.arange(free.size)
+    ids = network.node_ids()
+    return ReducedModel(
+        method=method,
+        output_ids=[ids[i] for i in outputs],
+        basis=V,
+        C_r=C_r,
+        G_r=G_r,
+        B_r=B_r,
+        q_r=q_r,
+        boundary_c=T0[fixed],
+        output_rows=V[local[outputs]],
+        x0=x0,
+        _free=free,
+    )
+
+
+def _factor(matrix, what: str):
+    try:
+        return splu(matrix)
+    except RuntimeError as exc:
+        raise ValueError(
+            f"Cannot reduce: the {what} is singular (a group of nodes with no "
+            "thermal mass and no path to a fixed node)."
+        ) from exc
+
+
+def _reference_outputs(
+    network: ThermalNetwork, outputs: np.ndarray, dt_s: float, n_steps: int
+) -> np.ndarray:
+    stepper = ImplicitStepper(network, dt_s)
+    T, q = network.temperature_vector(), network.load_vector()
+    out = np.empty((n_steps, outputs.size))
+    for k in range(n_steps):
+        T = stepper.step(T, q)
+        out[k] = T[outputs]
+    return out
+
+
+def _validate(model: ReducedModel, reference: np.ndarray, dt_s: float) -> float:
+    approx = np.concatenate(
+        [c.temperatures_c for c in model.run(reference.shape[0], dt_s)], axis=0
+    )
+    return float(np.max(np.abs(approx - reference), initial=0.0))
+
+
+def reduce_network(
+    network: ThermalNetwork,
+    outputs: Sequence[str],
+    *,
+    method: str = "krylov",
+    inputs: Sequence[str] = (),
+    tol_k: float = 0.1,
+    dt_s: float = 3600.0,
+    validate_steps: int = 240,
+    max_order: int = 200,
+) -> ReducedModel:
+    """
+    Reduce ``network`` to a model observed at ``outputs``.
+
+    Parameters
+    ----------
+    inputs : extra nodes whose loads will be driven at run time (their unit
+             load responses are added to the Krylov start block).
+    tol_k  : target worst-case output error over the validation run [K];
+             check ``converged`` on the result.
+    dt_s, validate_steps : validation horizon (default: 10 days hourly).
+    """
+
+    _require_scipy()
+    fixed_mask = network.fixed_mask()
+    free = np.flatnonzero(~fixed_mask)
+    local = np.full(network.n_nodes, -1, dtype=np.int64)
+    local[free] = np.arange(free.size)
+    out_idx = np.array([network.index_of(o) for o in outputs], dtype=np.int64)
+    if np.any(fixed_mask[out_idx]):
+        raise ValueError("Output nodes must be free (fixed nodes are already known).")
+
+    G = network.conductance_matrix()
+    G_ff = G[free][:, free].tocsc()
+
+    if method == "kron":
+        keep = np.unique(np.concatenate([out_idx, [network.index_of(i) for i in inputs]]).astype(np.int64))
+        keep_local = local[keep]
+        drop_local = np.setdiff1d(np.arange(free.size), keep_local)
+        V = np.zeros((free.size, keep_local.size))
+        V[keep_local, np.arange(keep_local.size)] = 1.0
+        if drop_local.size:
+            G_ii = G_ff[drop_local][:, drop_local].tocsc()
+            G_ik = G_ff[drop_local][:, keep_local].toarray()
+            V[drop_local] = -_factor(G_ii, "eliminated nodes").solve(G_ik)
+        model = _project(network, V, "kron", out_idx, free)
+        reference = _reference_outputs(network, out_idx, dt_s, validate_steps)
+        model.error_k = _validate(model, reference, dt_s)
+        model.converged = model.error_k <= tol_k
+        return model
+
+    if method != "krylov":
+        raise ValueError(f"Unknown reduction method '{method}'. Use 'krylov' or 'kron'.")
+
+    C = network.capacity_vector()[free]
+    T0 = network.temperature_vector()
+    fixed = np.flatnonzero(fixed_mask)
+    shift = 0.0 if fixed.size else 1.0 / dt_s
+    lu = _factor((G_ff + sparse.diags(C * shift)).tocsc(), "expansion matrix")
+    reference = _reference_outputs(network, out_idx, dt_s, validate_steps)
+    start: List[np.ndarray] = []
+    if fixed.size:
+        start.append(G[free][:, fixed].toarray())
+    start.append(network.load_vector()[free][:, None])
+    start.append(C[:, None] * T0[free][:, None])
+    selectors = np.zeros((free.size, out_idx.size + len(inputs)))
+    sel_idx = np.concatenate([local[out_idx], [local[network.index_of(i)] for i in inputs]]).astype(np.int64)
+    selectors[sel_idx, np.arange(sel_idx.size)] = 1.0
+    start.append(selectors)
+
+    # T₀ itself joins the basis so the initial state is represented exactly.
+    V = _orthonormalize(np.column_stack([T0[free], lu.solve(np.column_stack(start))]), None)
+    block = V
+    model = _project(network, V, "krylov", out_idx, free)
+    model.error_k = _validate(model, reference, dt_s)
+    while model.error_k > tol_k and V.shape[1] < max_order:
+        # Block Arnoldi: continue from the newest orthonormal columns only.
+        block = _orthonormalize(lu.solve(C[:, None] * block), V)
+        if block.shape[1] == 0:
+            break
+        block = block[:, : max_order - V.shape[1]]
+        V = np.hstack([V, block])
+        model = _project(network, V, "krylov", out_idx, free)
+        model.error_k = _validate(model, reference, dt_s)
+    model.converged = model.error_k <= tol_k
+    if not model.converged:
+        warnings.warn(
+            f"Krylov reduction stopped at order {model.order} with output error "
+            f"{model.error_k:.3g} K > tol_k={tol_k:g} K; raise max_order or tol_k.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+    return model
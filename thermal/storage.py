@@ -0,0 +1,228 @@
+"""
+storage.py
+-----------
+Binary snapshots of ThermalNetwork for fast reloads.
+
+Layout (a directory):
+    network.json        manifest: format version, counts, revision, stored LUs
+    <column>.npy        one file per node / edge / CSR array
+    ids.npy             node IDs as UTF-8 bytes joined by newlines
+    lu<k>_*.npy         optional stored factorizations (see below)
+
+Loading opens every array with ``np.load(mmap_mode="c")``: pages are read
+on first touch and writes go to private copy-on-write memory, so a
+million-node network opens in milliseconds and the files are never
+modified. Node IDs are decoded only when something asks for them.
+
+Stored factorizations
+    SuperLU objects cannot be pickled, so the L/U factors and permutations
+    of every cached single-LU factorization (thermal.transient) for the
+    current revision are written out and re-registered on load. Solves use
+    two sparse triangular sweeps, which are slower per step than SuperLU
+    but skip the (often dominant) factorization on startup.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from thermal.network import ThermalNetwork, _Column, _require_scipy
+
+try:
+    from scipy import sparse  # type: ignore
+    from scipy.sparse.linalg import spsolve_triangular  # type: ignore
+except ImportError:  # pragma: no cover - defensive guard
+    sparse = None  # type: ignore
+    spsolve_triangular = None  # type: ignore
+
+
+FORMAT_VERSION = 1
+MANIFEST = "network.json"
+
+# file stem -> ThermalNetwork column attribute
+_COLUMNS: Dict[str, str] = {
+    "capacity": "_capacity",
+    "temperature": "_temperature",
+    "load": "_load",
+    "fixed": "_fixed",
+    "edge_src": "_edge_src",
+    "edge_dst": "_edge_dst",
+    "edge_g": "_edge_g",
+    "rad_src": "_rad_src",
+    "rad_dst": "_rad_dst",
+    "rad_coeff": "_rad_coeff",
+}
+_CSR = {"indptr": "_indptr", "adj_nodes": "_adj_nodes", "adj_edges": "_adj_edges"}
+
+
+class StoredLU:
+    """
+    ``.solve(b)`` from saved SuperLU factors: Pr·A·Pc = L·U.
+    """
+
+    def __init__(self, L, U, perm_r: np.ndarray, perm_c: np.ndarray) -> None:
+        self.L = L
+        self.U = U
+        self.perm_r = perm_r
+        self.perm_c = perm_c
+        self.shape = L.shape
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        z = np.empty_like(b, dtype=float)
+        z[self.perm_r] = b
+        y = spsolve_triangular(self.L, z, lower=True, unit_diagonal=True)
+        return spsolve_triangular(self.U, y, lower=False)[self.perm_c]
+
+
+def _save_csr(directory: Path, prefix: str, matrix) -> None:
+    matrix = sparse.csr_matrix(matrix)
+    np.save(directory / f"{prefix}_data.npy", matrix.data)
+    np.save(directory / f"{prefix}_indices.npy", matrix.indices)
+    np.save(directory / f"{prefix}_indptr.npy", matrix.indptr)
+
+
+def _load_csr(directory: Path, prefix: str, shape, mmap_mode: Optional[str]):
+    parts = [
+        np.load(directory / f"{prefix}_{name}.npy", mmap_mode=mmap_mode)
+        for name in ("data", "indices", "indptr")
+    ]
+    return sparse.csr_matrix(tuple(parts), shape=tuple(shape), copy=False)
+
+
+def _save_factorizations(network: ThermalNetwork, directory: Path) -> list:
+    from thermal.transient import _FACTOR_CACHE
+
+    entries = []
+    for (dt_s, theta, digest, _workers), fac in _FACTOR_CACHE.get(network, {}).items():
+        lu = fac.lu
+        if digest is not None or fac.revision != network.revision or not hasattr(lu, "perm_r"):
+            continue  # Schur solvers live in worker processes; not storable.
+        prefix = f"lu{len(entries)}"
+        n = lu.shape[0]
+        _save_csr(directory, f"{prefix}_L", lu.L)
+        _save_csr(directory, f"{prefix}_U", lu.U)
+        _save_csr(directory, f"{prefix}_explicit", fac.explicit_ff)
+        _save_csr(directory, f"{prefix}_coupling", fac.coupling_fb)
+        np.save(directory / f"{prefix}_perm_r.npy", lu.perm_r)
+        np.save(directory / f"{prefix}_perm_c.npy", lu.perm_c)
+        np.save(directory / f"{prefix}_free.npy", fac.free)
+        np.save(directory / f"{prefix}_fixed.npy", fac.fixed)
+        entries.append(
+            {"prefix": prefix, "dt_s": dt_s, "theta": theta, "n_free": n, "n_fixed": int(fac.fixed.size)}
+        )
+    return entries
+
+
+def save_network(
+    network: ThermalNetwork, path: Union[str, Path], *, factorizations: bool = False
+) -> Path:
+    """
+    Write ``network`` to directory ``path``.
+
+    The snapshot is written to a sibling directory and renamed into place;
+    an existing snapshot is renamed aside first and deleted only once the
+    new one is in, so ``path`` never holds a partially written snapshot.
+
+    ``factorizations=True`` also stores the cached single-LU factorizations
+    of the current revision; call ``network.transient(dt).factorization``
+    first for each step size you want persisted.
+    """
+
+    path = Path(path)
+    network._sync_adjacency()
+    ids = network.node_ids()
+    joined = "\n".join(ids)
+    if joined.count("\n") != max(len(ids) - 1, 0):
+        raise ValueError("Node IDs containing newlines cannot be saved.")
+
+    tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+
+    for stem, attr in _COLUMNS.items():
+        np.save(tmp / f"{stem}.npy", getattr(network, attr).view)
+    for stem, attr in _CSR.items():
+        np.save(tmp / f"{stem}.npy", getattr(network, attr))
+    np.save(tmp / "ids.npy", np.frombuffer(joined.encode("utf-8"), dtype=np.uint8))
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "n_nodes": network.n_nodes,
+        "n_edges": network.n_edges,
+        "n_radiative_edges": network.n_radiative_edges,
+        "revision": network.revision,
+        "factorizations": _save_factorizations(network, tmp) if factorizations else [],
+    }
+    (tmp / MANIFEST).write_text(json.dumps(manifest, indent=2))
+
+    if not path.exists():
+        os.replace(tmp, path)
+        return path
+    old = path.with_name(f"{path.name}.old-{os.getpid()}")
+    if old.exists():
+        shutil.rmtree(old)
+    os.replace(path, old)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        os.replace(old, path)
+        raise
+    shutil.rmtree(old)
+    return path
+
+
+def load_network(path: Union[str, Path], *, mmap: bool = True) -> ThermalNetwork:
+    """Open a snapshot written by ``save_network``."""
+
+    path = Path(path)
+    manifest = json.loads((path / MANIFEST).read_text())
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported network snapshot format {manifest.get('format')!r} in {path}."
+        )
+    mmap_mode = "c" if mmap else None
+
+    network = ThermalNetwork()
+    for stem, attr in _COLUMNS.items():
+        setattr(network, attr, _Column.wrap(np.load(path / f"{stem}.npy", mmap_mode=mmap_mode)))
+    for stem, attr in _CSR.items():
+        setattr(network, attr, np.load(path / f"{stem}.npy", mmap_mode=mmap_mode))
+    network._csr_edges = network.n_edges
+    network._id_blob = np.load(path / "ids.npy", mmap_mode=mmap_mode)
+    network.revision = int(manifest["revision"])
+    if network.n_nodes != manifest["n_nodes"] or network.n_edges != manifest["n_edges"]:
+        raise ValueError(f"Network snapshot {path} is inconsistent with its manifest.")
+
+    if manifest["factorizations"]:
+        _register_factorizations(network, path, manifest["factorizations"], mmap_mode)
+    return network
+
+
+def _register_factorizations(network, path: Path, entries, mmap_mode) -> None:
+    from thermal.transient import _FACTOR_CACHE, _Factorization
+
+    _require_scipy()
+    per_network = _FACTOR_CACHE.setdefault(network, {})
+    for entry in entries:
+        prefix, n, n_b = entry["prefix"], entry["n_free"], entry["n_fixed"]
+        lu = StoredLU(
+            _load_csr(path, f"{prefix}_L", (n, n), mmap_mode),
+            _load_csr(path, f"{prefix}_U", (n, n), mmap_mode),
+            np.load(path / f"{prefix}_perm_r.npy", mmap_mode=mmap_mode),
+            np.load(path / f"{prefix}_perm_c.npy", mmap_mode=mmap_mode),
+        )
+        per_network[(float(entry["dt_s"]), float(entry["theta"]), None, 0)] = _Factorization(
+            revision=network.revision,
+            free=np.load(path / f"{prefix}_free.npy", mmap_mode=mmap_mode),
+            fixed=np.load(path / f"{prefix}_fixed.npy", mmap_mode=mmap_mode),
+            lu=lu,
+            explicit_ff=_load_csr(path, f"{prefix}_explicit", (n, n), mmap_mode),
+            coupling_fb=_load_csr(path, f"{prefix}_coupling", (n, n_b), mmap_mode),
+        )
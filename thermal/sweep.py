@@ -0,0 +1,224 @@
+"""
+sweep.py
+---------
+Parametric design sweeps with a process pool and an on-disk result cache.
+
+Designs
+    • ``axis(low, high, step)`` — grid values snapped to multiples of
+      ``step``, so widening a range reproduces the old points exactly.
+    • ``cartesian({name: values})`` — full factorial design.
+    • ``latin_hypercube({name: (low, high)}, n, seed)`` — space-filling
+      sample; reproducible for the same (ranges, n, seed).
+
+Cache
+    One JSONL file per evaluator (``<module.function>-<version>.jsonl``)
+    under ``.cache/sweeps``; each line is {"key", "params", "result"}. The key
+    is a SHA-256 of the evaluator ID and canonicalized parameters, so only
+    points never seen before are evaluated. Results are appended as chunks
+    finish, so an interrupted sweep keeps its progress. Bump ``version``
+    when the evaluator's physics changes.
+
+Evaluators are top-level functions ``f(**params) -> dict`` (picklable, JSON
+results).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from thermal.heat_recovery import DHWPreheatSpec, dhw_preheat_from_condenser
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "sweeps"
+
+Params = Dict[str, float]
+
+
+# ---------------------------------------------------------------------------
+# Designs
+# ---------------------------------------------------------------------------
+def axis(low: float, high: float, step: float) -> np.ndarray:
+    """Values k·step within [low, high] (step-aligned, so ranges nest)."""
+
+    if step <= 0:
+        raise ValueError("step must be positive.")
+    k = np.arange(np.ceil(low / step - 1e-9), np.floor(high / step + 1e-9) + 1)
+    return np.round(k * step, 12)
+
+
+def cartesian(axes: Mapping[str, Sequence[float]]) -> List[Params]:
+    names = list(axes)
+    return [
+        dict(zip(names, map(float, combo)))
+        for combo in itertools.product(*(np.asarray(axes[n], dtype=float) for n in names))
+    ]
+
+
+def latin_hypercube(
+    ranges: Mapping[str, Tuple[float, float]], n: int, *, seed: int = 0
+) -> List[Params]:
+    """One sample per stratum in every dimension, strata shuffled independently."""
+
+    rng = np.random.default_rng(seed)
+    names = list(ranges)
+    strata = rng.permuted(np.tile(np.arange(n), (len(names), 1)), axis=1).T
+    u = (strata + rng.random((n, len(names)))) / n
+    lo = np.array([ranges[k][0] for k in names], dtype=float)
+    hi = np.array([ranges[k][1] for k in names], dtype=float)
+    values = lo + u * (hi - lo)
+    return [dict(zip(names, map(float, row))) for row in values]
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+def evaluator_id(func: Callable, version: str = "1") -> str:
+    return f"{func.__module__}.{func.__qualname__}-{version}"
+
+
+def point_key(func_id: str, params: Mapping[str, float]) -> str:
+    canonical = {k: float(f"{float(v):.12g}") for k, v in sorted(params.items())}
+    payload = json.dumps([func_id, canonical], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SweepCache:
+    """Append-only JSONL store of ``key -> result`` for one evaluator."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._results: Dict[str, Any] = {}
+        if path.exists():
+            with path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from an interrupted run
+                    self._results[record["key"]] = record["result"]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._results
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, key: str) -> Any:
+        return self._results[key]
+
+    def extend(self, records: Iterable[Tuple[str, Params, Any]]) -> None:
+        lines = []
+        for key, params, result in records:
+            self._results[key] = result
+            lines.append(json.dumps({"key": key, "params": params, "result": result}))
+        if lines:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write("\n".join(lines) + "\n")
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+def _evaluate_chunk(func: Callable, chunk: List[Params]) -> List[Any]:
+    return [func(**params) for params in chunk]
+
+
+@dataclass
+class SweepResult:
+    points: List[Params]
+    results: List[Any]
+    evaluated: int
+    cached: int
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Parameters and numeric result fields as equal-length arrays."""
+
+        out: Dict[str, np.ndarray] = {}
+        for name in self.points[0] if self.points else []:
+            out[name] = np.array([p[name] for p in self.points], dtype=float)
+        first = self.results[0] if self.results else {}
+        if isinstance(first, Mapping):
+            for name, value in first.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    out[name] = np.array([r[name] for r in self.results], dtype=float)
+        return out
+
+
+def run_sweep(
+    func: Callable[..., Any],
+    points: Sequence[Params],
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+    cache_dir: Optional[Union[str, Path]] = None,
+    version: str = "1",
+) -> SweepResult:
+    """
+    Evaluate ``func`` over ``points``, reusing cached results.
+
+    ``workers=0`` evaluates in-process; ``None`` uses ``os.cpu_count()``.
+    """
+
+    func_id = evaluator_id(func, version)
+    root = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    cache = SweepCache(root / f"{func_id}.jsonl")
+
+    keys = [point_key(func_id, p) for p in points]
+    todo: Dict[str, Params] = {}
+    for key, params in zip(keys, points):
+        if key not in cache and key not in todo:
+            todo[key] = dict(params)
+    pending = list(todo.items())
+    chunks = [pending[i : i + chunk_size] for i in range(0, len(pending), chunk_size)]
+
+    n_workers = (os.cpu_count() or 1) if workers is None else workers
+    if n_workers <= 0 or len(chunks) <= 1:
+        for chunk in chunks:
+            results = _evaluate_chunk(func, [p for _, p in chunk])
+            cache.extend((k, p, r) for (k, p), r in zip(chunk, results))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(_evaluate_chunk, func, [p for _, p in chunk]) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                results = future.result()
+                cache.extend((k, p, r) for (k, p), r in zip(chunk, results))
+
+    return SweepResult(
+        points=[dict(p) for p in points],
+        results=[cache.get(k) for k in keys],
+        evaluated=len(pending),
+        cached=len(points) - len(pending),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Ready-made evaluators
+# ---------------------------------------------------------------------------
+def dhw_preheat_point(
+    Q_reject_W: float,
+    m_dot_water_kg_per_s: float,
+    T_in_C: float = 10.0,
+    T_set_C: float = 55.0,
+    allowed_approach_K: float = 5.0,
+    T_hot_C: Optional[float] = None,
+) -> Dict[str, float]:
+    """Flat-parameter wrapper of ``dhw_preheat_from_condenser`` for sweeps."""
+
+    spec = DHWPreheatSpec(
+        m_dot_water_kg_per_s=m_dot_water_kg_per_s,
+        T_in_C=T_in_C,
+        T_set_C=T_set_C,
+        allowed_approach_K=allowed_approach_K,
+    )
+    out = dhw_preheat_from_condenser(Q_reject_W, spec, T_hot_C=T_hot_C)
+    return {k: float(v) for k, v in out.items() if k != "notes"}
@@ -0,0 +1,301 @@
+"""
+transient.py
+-------------
+Implicit (θ-method) time integration for thermal networks.
+
+Model
+    C·dT/dt = -G·T + Q
+
+    discretized with the θ-method:
+
+    (C/dt + θG)·Tⁿ⁺¹ = (C/dt - (1-θ)G)·Tⁿ + θQⁿ⁺¹ + (1-θ)Qⁿ
+
+    (loads are weighted like the conductance term, so Crank–Nicolson stays
+    second order under time-varying loads)
+
+    θ = 1.0 → backward Euler (L-stable, default; safe for massless nodes)
+    θ = 0.5 → Crank–Nicolson (2nd order; may ring on stiff/massless nodes)
+
+Performance notes
+    • The left-hand matrix depends only on (dt, θ) and the network topology,
+      so it is LU-factorized once and reused for every step. Factorizations
+      are cached per network and keyed by (dt, θ); they are rebuilt only when
+      ``ThermalNetwork.revision`` changes (edges added, conductances updated).
+    • ``ImplicitStepper.run`` is a generator yielding fixed-size chunks so
+      decade-long runs never hold the full history in memory.
+    • Passing ``parts`` (see thermal.partition) swaps the single LU for a
+      Schur-complement solver whose subdomains live in worker processes
+      (see thermal.parallel).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from thermal.network import ThermalNetwork, _require_scipy
+from thermal.parallel import make_solver
+
+try:
+    from scipy import sparse  # type: ignore
+except ImportError:  # pragma: no cover - defensive guard
+    sparse = None  # type: ignore
+
+
+# network -> {(dt_s, theta, partition digest, workers): _Factorization}
+_FACTOR_CACHE: "weakref.WeakKeyDictionary[ThermalNetwork, Dict[Tuple, _Factorization]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@dataclass
+class _Factorization:
+    """Everything needed to advance one step, valid for a single revision."""
+
+    revision: int
+    free: np.ndarray  # indices of integrated nodes
+    fixed: np.ndarray  # indices of boundary nodes
+    lu: object  # SuperLU (or SchurComplementSolver) of (C/dt + θG)_FF
+    explicit_ff: object  # (C/dt - (1-θ)G)_FF
+    coupling_fb: object  # G_FB (free rows, boundary columns)
+
+
+@dataclass
+class TransientChunk:
+    """One block of streamed output."""
+
+    times_s: np.ndarray  # shape (n_steps,)
+    temperatures_c: np.ndarray  # shape (n_steps, n_recorded)
+    node_ids: Sequence[str]
+
+
+def _build_factorization(
+    network: ThermalNetwork,
+    dt_s: float,
+    theta: float,
+    parts: Optional[np.ndarray] = None,
+    workers: int = 0,
+) -> _Factorization:
+    _require_scipy()
+    if network.n_radiative_edges:
+        raise ValueError(
+            "Radiative edges are nonlinear; use ThermalNetwork.solve_steady or "
+            "linearize them into conductive edges before transient stepping."
+        )
+    G = network.conductance_matrix().tocsr()
+    C = network.capacity_vector()
+    fixed_mask = network.fixed_mask()
+    free = np.flatnonzero(~fixed_mask)
+    fixed = np.flatnonzero(fixed_mask)
+
+    G_ff = G[free][:, free]
+    C_ff = sparse.diags(C[free] / dt_s)
+    lhs = (C_ff + theta * G_ff).tocsc()
+    if lhs.shape[0] == 0:
+        raise ValueError("Thermal network has no free (non-fixed) nodes to integrate.")
+
+    return _Factorization(
+        revision=network.revision,
+        free=free,
+        fixed=fixed,
+        lu=make_solver(lhs, None if parts is None else parts[free], workers=workers),
+        explicit_ff=(C_ff - (1.0 - theta) * G_ff).tocsr(),
+        coupling_fb=G[free][:, fixed].tocsr(),
+    )
+
+
+def _release(factorizations) -> None:
+    for fac in factorizations:
+        close = getattr(fac.lu, "close", None)
+        if close is not None:
+            close()
+
+
+def partition_digest(parts: Optional[np.ndarray]) -> Optional[str]:
+    """Process-independent key for a partition vector (``None`` → ``None``)."""
+
+    if parts is None:
+        return None
+    return hashlib.blake2b(np.asarray(parts, dtype=np.int64).tobytes(), digest_size=16).hexdigest()
+
+
+def get_factorization(
+    network: ThermalNetwork,
+    dt_s: float,
+    theta: float = 1.0,
+    *,
+    parts: Optional[np.ndarray] = None,
+    workers: int = 0,
+    digest: Optional[str] = None,
+) -> _Factorization:
+    """
+    Return a cached factorization for (dt, θ[, partition]), rebuilding it only if stale.
+
+    ``digest`` is ``partition_digest(parts)`` when the caller already has it,
+    so per-step lookups skip rehashing the partition.
+    """
+
+    per_network = _FACTOR_CACHE.setdefault(network, {})
+    if digest is None:
+        digest = partition_digest(parts)
+    key = (float(dt_s), float(theta), digest, int(workers))
+    cached = per_network.get(key)
+    if cached is None or cached.revision != network.revision:
+        # A revision change invalidates every step size for this network.
+        if cached is not None:
+            _release(per_network.values())
+            per_network.clear()
+        cached = _build_factorization(network, dt_s, theta, parts, workers)
+        per_network[key] = cached
+    return cached
+
+
+def clear_factorizations(network: Optional[ThermalNetwork] = None) -> None:
+    """Drop cached factorizations (and their worker processes) for one or all networks."""
+
+    if network is None:
+        for per_network in list(_FACTOR_CACHE.values()):
+            _release(per_network.values())
+        _FACTOR_CACHE.clear()
+    else:
+        _release(_FACTOR_CACHE.pop(network, {}).values())
+
+
+class ImplicitStepper:
+    """
+    Fixed-step implicit integrator bound to a ThermalNetwork.
+
+    Example:
+        stepper = network.transient(dt_s=600.0)
+        for chunk in stepper.run(n_steps=52_560, chunk_steps=1_000):
+            writer.append(chunk.times_s, chunk.temperatures_c)
+    """
+
+    def __init__(
+        self,
+        network: ThermalNetwork,
+        dt_s: float,
+        *,
+        theta: float = 1.0,
+        parts: Optional[np.ndarray] = None,
+        workers: int = 0,
+    ) -> None:
+        if dt_s <= 0:
+            raise ValueError("dt_s must be positive.")
+        if not 0.5 <= theta <= 1.0:
+            raise ValueError("theta must lie in [0.5, 1.0] for unconditional stability.")
+        self.network = network
+        self.dt_s = float(dt_s)
+        self.theta = float(theta)
+        self.parts = parts
+        self.workers = workers
+        self.time_s = 0.0
+
+    @property
+    def parts(self) -> Optional[np.ndarray]:
+        return self._parts
+
+    @parts.setter
+    def parts(self, parts: Optional[np.ndarray]) -> None:
+        self._parts = parts
+        self._parts_digest = partition_digest(parts)
+
+    @property
+    def factorization(self) -> _Factorization:
+        return get_factorization(
+            self.network,
+            self.dt_s,
+            self.theta,
+            parts=self._parts,
+            workers=self.workers,
+            digest=self._parts_digest,
+        )
+
+    def step(
+        self,
+        temperatures_c: np.ndarray,
+        loads_kw: np.ndarray,
+        previous_loads_kw: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Advance a full temperature vector by one step and return the new vector.
+
+        ``loads_kw`` are the loads at the end of the step and
+        ``previous_loads_kw`` those at its start (default: the same); they
+        enter as θ·Qⁿ⁺¹ + (1-θ)·Qⁿ. Boundary (fixed) entries are passed
+        through unchanged.
+        """
+
+        fac = self.factorization
+        T = np.array(temperatures_c, dtype=float, copy=True)
+        T_b = T[fac.fixed]
+        q = np.asarray(loads_kw, dtype=float)[fac.free]
+        if previous_loads_kw is not None and self.theta < 1.0:
+            q = self.theta * q + (1.0 - self.theta) * np.asarray(previous_loads_kw, dtype=float)[fac.free]
+        rhs = fac.explicit_ff @ T[fac.free] + q
+        if fac.fixed.size:
+            rhs -= fac.coupling_fb @ T_b
+        T[fac.free] = fac.lu.solve(rhs)
+        return T
+
+    def run(
+        self,
+        n_steps: int,
+        *,
+        chunk_steps: int = 1024,
+        record: Optional[Sequence[str]] = None,
+        loads: Optional[Callable[[float], np.ndarray]] = None,
+        write_back: bool = True,
+    ) -> Iterator[TransientChunk]:
+        """
+        Integrate ``n_steps`` steps, yielding output in chunks.
+
+        Parameters
+        ----------
+        record : sequence of node IDs to store (default: every node).
+        loads  : optional callable ``loads(t_s) -> kW vector``; each step uses
+                 θ·loads(tⁿ⁺¹) + (1-θ)·loads(tⁿ) (one call per step, the
+                 start value is carried over). Defaults to the nodes'
+                 ``heat_load_kw``.
+        write_back : store the final temperatures on the network nodes.
+        """
+
+        if chunk_steps <= 0:
+            raise ValueError("chunk_steps must be positive.")
+
+        node_ids = self.network.node_ids()
+        if record is None:
+            record_idx = np.arange(len(node_ids))
+            record_ids: Sequence[str] = node_ids
+        else:
+            lookup = {node_id: i for i, node_id in enumerate(node_ids)}
+            record_idx = np.array([lookup[node_id] for node_id in record], dtype=np.int64)
+            record_ids = list(record)
+
+        T = self.network.temperature_vector()
+        static_loads = self.network.load_vector()
+        q_prev = None
+        if loads is not None and self.theta < 1.0:
+            q_prev = np.asarray(loads(self.time_s), dtype=float)
+
+        done = 0
+        while done < n_steps:
+            size = min(chunk_steps, n_steps - done)
+            times = np.empty(size)
+            history = np.empty((size, record_idx.size))
+            for k in range(size):
+                self.time_s += self.dt_s
+                q = static_loads if loads is None else np.asarray(loads(self.time_s), dtype=float)
+                T = self.step(T, q, q_prev)
+                if q_prev is not None:
+                    q_prev = q
+                times[k] = self.time_s
+                history[k] = T[record_idx]
+            done += size
+            if write_back:
+                self.network.set_temperatures(T)
+            yield TransientChunk(times_s=times, temperatures_c=history, node_ids=record_ids)